@@ -1,12 +1,22 @@
 """ Package-scope definitions """
 
 from ._att_map_like import AttMapLike
+from ._compare import register_comparison
+from ._diff import MapDiff, apply_diff, diff
+from ._tracking import disable_render_cache, enable_render_cache
 from ._version import __version__
 from .attmap import AttMap
 from .attmap_echo import *
+from .attmap_table import AttMapRow, AttMapTable
+from .compact_attmap import CompactAttMap
+from .concurrent_attmap import ConcurrentAttMap
+from .eager_pathex_attmap import EagerPathExAttMap
+from .frozen_attmap import *
 from .helpers import *
+from .instrumentation import *
 from .ordattmap import OrdAttMap
-from .pathex_attmap import PathExAttMap
+from .pathex_attmap import ExpansionCache, PathExAttMap, expansion_cache
+from .persistent_attmap import PersistentAttMap
 
 AttributeDict = AttMap
 AttributeDictEcho = AttMapEcho
@@ -15,12 +25,37 @@ __all__ = [
     "AttMapLike",
     "AttMap",
     "AttMapEcho",
+    "AttMapRow",
+    "AttMapTable",
     "AttributeDict",
     "AttributeDictEcho",
+    "CompactAttMap",
+    "ConcurrentAttMap",
+    "EagerPathExAttMap",
     "EchoAttMap",
+    "ExpansionCache",
+    "FrozenAttMap",
+    "FrozenEchoAttMap",
+    "FrozenOrdAttMap",
+    "FrozenPathExAttMap",
+    "MapDiff",
     "OrdAttMap",
     "PathExAttMap",
+    "PersistentAttMap",
+    "expansion_cache",
+    "apply_diff",
+    "diff",
+    "disable_render_cache",
+    "disable_stats",
+    "enable_render_cache",
+    "enable_stats",
+    "freeze",
     "get_data_lines",
+    "iter_data_lines",
+    "register_comparison",
+    "reset_stats",
+    "stats",
+    "track_stats",
 ]
 __aliases__ = {
     "AttMap": ["AttributeDict"],
@@ -1,14 +1,20 @@
 """ The trait defining a multi-access data object """
 
 import abc
+import itertools
+import json
 import sys
+from contextlib import contextmanager
 
 if sys.version_info < (3, 3):
     from collections import Mapping, MutableMapping
 else:
     from collections.abc import Mapping, MutableMapping
 
-from .helpers import get_data_lines, get_logger, is_custom_map
+from ._fingerprint import fingerprint
+from ._merge import OVERRIDE, merge
+from ._tracking import cached, caching_renders, derived
+from .helpers import get_logger, is_custom_map, iter_data_lines
 
 __author__ = "Vince Reuter"
 __email__ = "vreuter@virginia.edu"
@@ -19,10 +25,206 @@ __all__ = ["AttMapLike"]
 _LOGGER = get_logger(__name__)
 
 
+def _custom_repr(obj, prefix=""):
+    """
+    Calls the ordinary repr on every object but list, which is
+    converted to a block style string instead.
+
+    :param object obj: object to convert to string representation
+    :param str prefix: string to prepend to each list line in block
+    :return str: custom object representation
+    """
+    if isinstance(obj, list) and len(obj) > 0:
+        return f"\n{prefix} - " + f"\n{prefix} - ".join([str(i) for i in obj])
+    return obj.strip("'") if hasattr(obj, "strip") else str(obj)
+
+
+# Types of values that can't change in place, so may be rendered once
+_IMMUTABLE = (str, bytes, int, float, complex, type(None))
+
+
+def _is_immutable(v):
+    """Determine whether a value (or tuple of values) can't change in place."""
+    if isinstance(v, tuple):
+        return all(_is_immutable(x) for x in v)
+    return isinstance(v, _IMMUTABLE)
+
+
+def _as_entries(entries):
+    """
+    Get the key-value pairs to merge, from any form add_entries permits.
+
+    :param Iterable[(object, object)] | Mapping | pandas.Series | function()
+        entries: mapping-like, iterable or generator of pairs, or a function
+        that gives one
+    :return Mapping | Iterable[(object, object)]: the key-value pairs
+    """
+    if callable(entries):
+        return entries()
+    if any("pandas.core" in str(t) for t in type(entries).__bases__):
+        return entries.to_dict()
+    return entries
+
+
+def _as_types(classes):
+    """
+    Get a tuple of types, e.g. to key a cache and check instances against.
+
+    :param type | Iterable[type] | NoneType classes: a type, or collection of
+        types, or null for none
+    :return tuple[type]: the types
+    """
+    if not classes:
+        return ()
+    return (classes,) if isinstance(classes, type) else tuple(classes)
+
+
+def _simplified_entries(m, build, excluded, name, leaf=None):
+    """
+    Get a map's own simplified entries, and its nested maps to simplify.
+
+    If rendered fragments are cached (see enable_render_cache), the result
+    for an AttMapLike is cached until a key of the map is set or deleted,
+    unless its values are transformed.
+    The entries hold a placeholder for each nested mapping, so that its key
+    keeps its position.
+
+    :param Mapping m: map to simplify
+    :param callable build: how to build an empty collection
+    :param tuple[type] excluded: types of values to leave out
+    :param tuple name: name under which to cache the result
+    :param function(Mapping, hashable, object) -> object leaf: how to
+        transform each value other than a mapping, given the mapping that
+        holds it and its key
+    :return (Mapping, list[(hashable, Mapping)]): entries, and nested
+        mappings by key
+    """
+    if leaf is None:
+        res = cached(m, name)
+        if res is not None:
+            return res
+    entries, nested = build(), []
+    for k, v in getattr(m, "_stored_items", m.items)():
+        if excluded and isinstance(v, excluded):
+            continue
+        if isinstance(v, Mapping):
+            entries[k] = None
+            nested.append((k, v))
+        else:
+            entries[k] = v if leaf is None else leaf(m, k, v)
+    res = entries, nested
+    if leaf is None and isinstance(m, AttMapLike) and caching_renders():
+        derived(m, name, res)
+    return res
+
+
+def _yaml_fragment(pairs, lev, space_per_level, excluded, empty_nested, unstable):
+    """
+    Generate a map's own YAML lines, with a reference to each nested map.
+
+    :param Iterable[(hashable, object)] pairs: the map's key-value pairs
+    :param int lev: level of nesting of the map's keys
+    :param int space_per_level: number of spaces per level of nesting
+    :param tuple[type] excluded: types of values to leave out
+    :param str empty_nested: text of an empty nested map
+    :param list unstable: collection to which to add each value that may
+        change in place, so whose lines may not hold until the map changes
+    :return Iterable[str | (Mapping, str, str)]: each line, or for a nested
+        custom map, the map with its section header and its line if it's
+        empty
+    """
+    space = " " * lev * space_per_level
+    for k, v in pairs:
+        if isinstance(v, excluded):
+            continue
+        if is_custom_map(v):
+            empty = "null" if lev == 0 else empty_nested
+            yield (
+                v,
+                _yaml_line(lev, k, space_per_level),
+                _yaml_line(lev, k, space_per_level, empty),
+            )
+            continue
+        if lev == 0 and isinstance(v, Mapping) and 0 == len(v):
+            v = None
+        if isinstance(v, Mapping) and 0 != len(v):
+            unstable.append(v)
+            yield _yaml_line(lev, k, space_per_level)
+            for line in _plain_yaml_lines(v, lev + 1, space_per_level):
+                yield line
+            continue
+        if not _is_immutable(v):
+            unstable.append(v)
+        text = "null" if v is None else _custom_repr(v, space)
+        yield _yaml_line(lev, k, space_per_level, text)
+
+
+def _plain_yaml_lines(m, lev, space_per_level):
+    """Generate the YAML lines of a plain, nonempty mapping, as is."""
+    stack = [(iter(m.items()), lev)]
+    while stack:
+        pairs, lev = stack[-1]
+        for k, v in pairs:
+            if isinstance(v, Mapping) and 0 != len(v):
+                yield _yaml_line(lev, k, space_per_level)
+                stack.append((iter(v.items()), lev + 1))
+                break
+            space = " " * lev * space_per_level
+            text = "null" if v is None else _custom_repr(v, space)
+            yield _yaml_line(lev, k, space_per_level, text)
+        else:
+            stack.pop()
+
+
+def _yaml_line(lev, key, space_per_level, text=None):
+    """Render a YAML line for a key, with its value's text if given."""
+    line = " " * lev * space_per_level + _custom_repr(key) + ":"
+    return line if text is None else line + " " + text
+
+
+def _builder(cls):
+    """
+    Get a function to build a map from parsed key-value pairs.
+
+    As when data are stored, mappings within lists are left plain, so any
+    built as maps (parsers build inner values first) are turned back.
+
+    :param type cls: type of map to build
+    :return function(Iterable[(hashable, object)]) -> AttMapLike: builder
+    """
+
+    def plain(v):
+        if type(v) is not list:
+            return v
+        return [x.to_dict() if isinstance(x, cls) else plain(x) for x in v]
+
+    # As with a dict, the last of any duplicate keys wins.
+    return lambda pairs: cls._from_parsed(
+        {k: plain(v) if type(v) is list else v for k, v in pairs}
+    )
+
+
+@contextmanager
+def _reading(source):
+    """
+    Provide a readable stream of text.
+
+    :param str | file source: path to a file, or a stream, which is left open
+    :return Iterable[file]: the stream
+    """
+    if hasattr(source, "read"):
+        yield source
+    else:
+        with open(source, "r") as f:
+            yield f
+
+
 class AttMapLike(MutableMapping):
     """Base class for multi-access-mode data objects."""
 
     __metaclass__ = abc.ABCMeta
+    # No instance dict of its own, so a subclass may store data in slots.
+    __slots__ = ()
 
     def __init__(self, entries=None):
         """
@@ -57,10 +259,11 @@ class AttMapLike(MutableMapping):
         pass
 
     def __iter__(self):
-        return iter([k for k in self.__dict__.keys()])
+        # Lazy, like dict: mutation during iteration raises RuntimeError.
+        return iter(self.__dict__)
 
     def __len__(self):
-        return sum(1 for _ in iter(self))
+        return len(self.__dict__)
 
     def __repr__(self):
         return self._render(
@@ -68,19 +271,6 @@ class AttMapLike(MutableMapping):
         )
 
     def _render(self, data, exclude_class_list=[]):
-        def _custom_repr(obj, prefix=""):
-            """
-            Calls the ordinary repr on every object but list, which is
-            converted to a block style string instead.
-
-            :param object obj: object to convert to string representation
-            :param str prefix: string to prepend to each list line in block
-            :return str: custom object representation
-            """
-            if isinstance(obj, list) and len(obj) > 0:
-                return f"\n{prefix} - " + f"\n{prefix} - ".join([str(i) for i in obj])
-            return obj.strip("'") if hasattr(obj, "strip") else str(obj)
-
         class_name = self.__class__.__name__
         if class_name in exclude_class_list:
             base = ""
@@ -88,39 +278,157 @@ class AttMapLike(MutableMapping):
             base = class_name + "\n"
 
         if data:
-            return base + "\n".join(get_data_lines(data, _custom_repr))
+            return base + "\n".join(iter_data_lines(data, _custom_repr))
         else:
             return class_name + ": {}"
 
-    def add_entries(self, entries):
+    def add_entries(self, entries, strategy=OVERRIDE):
         """
         Update this instance with provided key-value pairs.
 
+        Nested maps are merged, at any depth, rather than replaced.
+
         :param Iterable[(object, object)] | Mapping | pandas.Series entries:
             collection of pairs of keys and values
+        :param str strategy: how to resolve a key with both an existing and
+            an incoming value, unless both are maps: "override" with the
+            incoming value, "keep_existing", or "list_append" to concatenate
+            a pair of lists and otherwise override
+        :return AttMapLike: this instance, updated
+        :raise ValueError: if the strategy is unknown
         """
         if entries is None:
-            return
-        # Permit mapping-likes and iterables/generators of pairs.
-        if callable(entries):
-            entries = entries()
-        elif any("pandas.core" in str(t) for t in type(entries).__bases__):
-            entries = entries.to_dict()
-        try:
-            entries_iter = entries.items()
-        except AttributeError:
-            entries_iter = entries
-        for k, v in entries_iter:
-            self[k] = (
-                v
-                if (
-                    k not in self
-                    or not isinstance(v, Mapping)
-                    or not isinstance(self[k], Mapping)
-                )
-                else self[k].add_entries(v)
-            )
-        return self
+            return self
+        return merge(self, _as_entries(entries), strategy)
+
+    def fingerprint(self):
+        """
+        Get a fingerprint of this map's content, e.g. to detect change.
+
+        Equal maps have the same fingerprint, so a changed fingerprint means
+        changed content, and the fingerprint can key a cache of what's
+        derived from the content. The fingerprint is cached, along with
+        those of nested maps, until a key is set or deleted in the map or in
+        a map nested in it, so after a change only the path to the changed
+        map is recomputed. Values that aren't maps are fingerprinted by hash,
+        so a value changed in place (rather than replaced) goes unnoticed;
+        unhashable values other than lists, tuples and dicts, and values
+        with a registered comparison (see register_comparison) contribute
+        their identity. Fingerprints derive from hash(), so they're
+        comparable only within a process.
+
+        :return int: fingerprint of this map's content
+        """
+        return fingerprint(self)[0]
+
+    def freeze(self):
+        """
+        Get an immutable, hashable counterpart of this instance.
+
+        The counterpart memoizes its conversions to dict, map, and text.
+
+        :return attmap.AttMapLike: frozen version of this instance
+        """
+        # Deferred import, since the frozen types derive from this one.
+        from .frozen_attmap import freeze
+
+        return freeze(self)
+
+    @classmethod
+    def from_dataframe(cls, df, expand=False):
+        """
+        Create an instance for each row of a table.
+
+        The table is converted column by column rather than row by row, and
+        every record shares the column order as its key order. The row
+        labels aren't included.
+
+        :param pandas.DataFrame df: table with a column for each key
+        :param bool | Iterable[hashable] expand: whether to replace text
+            values with their path expansions when storing them, or the
+            columns in which to do so; each distinct value in a column is
+            expanded once
+        :return list[AttMapLike]: an instance for each row, in order
+        """
+        # Deferred import, since the path-expanding types derive from this one.
+        from .pathex_attmap import expansion_cache
+
+        keys = list(df.columns)
+        if expand is True:
+            expand = keys
+        expand = set(expand or [])
+        columns = []
+        for k in keys:
+            col = df[k]
+            values = col.tolist()
+            if col.dtype == object:
+                values = [cls(v) if isinstance(v, Mapping) else v for v in values]
+            if k in expand:
+                expanded = {}
+                for i, v in enumerate(values):
+                    if isinstance(v, str):
+                        try:
+                            values[i] = expanded[v]
+                        except KeyError:
+                            values[i] = expanded[v] = expansion_cache.expand(v)
+            columns.append(values)
+        return [cls._from_parsed(dict(zip(keys, row))) for row in zip(*columns)]
+
+    @classmethod
+    def from_json(cls, source):
+        """
+        Create an instance from JSON text.
+
+        Each JSON object is built as this type directly by the parser, so
+        the data aren't walked again to convert nested mappings, which are
+        of this type as well.
+
+        :param str | file source: path to a JSON file, or stream of JSON text
+        :return AttMapLike: new instance with the parsed data
+        :raise TypeError: if the JSON value isn't an object
+        """
+        with _reading(source) as stream:
+            data = json.load(stream, object_pairs_hook=_builder(cls))
+        return cls._check_loaded(data, source)
+
+    @classmethod
+    def from_yaml(cls, source):
+        """
+        Create an instance from YAML text.
+
+        Each YAML mapping is built as this type directly by the parser, so
+        the data aren't walked again to convert nested mappings, which are
+        of this type as well. PyYAML's C-based loader is used if available.
+
+        :param str | file source: path to a YAML file, or stream of YAML text
+        :return AttMapLike: new instance with the parsed data; empty if the
+            text holds no document
+        :raise TypeError: if the YAML document isn't a mapping
+        """
+        import yaml
+
+        base = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+        build = _builder(cls)
+
+        def construct(loader, node):
+            loader.flatten_mapping(node)
+            return build(loader.construct_pairs(node, deep=True))
+
+        def construct_object(loader, node, deep=False):
+            # Build a new map for each alias of an anchored mapping, so that
+            # maps are independent, as when parsed data are wrapped.
+            if isinstance(node, yaml.MappingNode):
+                loader.constructed_objects.pop(node, None)
+            return base.construct_object(loader, node, deep)
+
+        loader = type("AttMapLoader", (base,), {"construct_object": construct_object})
+        loader.add_constructor(
+            yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, construct
+        )
+        with _reading(source) as stream:
+            data = yaml.load(stream, Loader=loader)
+        return cls() if data is None else cls._check_loaded(data, source)
 
     def get_yaml_lines(
         self,
@@ -139,7 +447,10 @@ class AttMapLike(MutableMapping):
         data = self._simplify_keyvalue(
             self._data_for_repr(), self._new_empty_basic_map, conversions=conversions
         )
-        return self._render(data).split("\n")[1:]
+        # A rendered value may span lines (e.g., a block-style list).
+        return [
+            l for text in iter_data_lines(data, _custom_repr) for l in text.split("\n")
+        ]
 
     def is_null(self, item):
         """
@@ -165,7 +476,7 @@ class AttMapLike(MutableMapping):
 
         :return dict[str, object]: this map's data, in a simpler container
         """
-        return self._simplify_keyvalue(self.items(), self._new_empty_basic_map)
+        return self._simplify_keyvalue(self._stored_items(), self._new_empty_basic_map)
 
     def to_dict(self):
         """
@@ -173,16 +484,44 @@ class AttMapLike(MutableMapping):
 
         :return dict: builtin dict representation of this instance
         """
-        return self._simplify_keyvalue(self.items(), dict)
+        return self._simplify_keyvalue(self._stored_items(), dict)
 
-    def to_yaml(self, trailing_newline=True):
+    def iter_yaml(self, trailing_newline=True):
+        """
+        Generate the YAML representation of this instance chunk by chunk.
+
+        The map is walked once, and no chunk holds more than one entry, so
+        the full text is never held in memory. Joining the chunks gives
+        exactly the text of to_yaml.
+
+        :param bool trailing_newline: whether to add trailing newline
+        :return Iterable[str]: chunks of YAML text
+        """
+        if 0 == len(self):
+            yield "{}" + ("\n" if trailing_newline else "")
+            return
+        sep = ""
+        for line in self._yaml_lines():
+            yield sep + line
+            sep = "\n"
+        if trailing_newline:
+            yield "\n"
+
+    def to_yaml(self, trailing_newline=True, stream=None):
         """
         Get text for YAML representation.
 
         :param bool trailing_newline: whether to add trailing newline
-        :return str: YAML text representation of this instance.
+        :param stream: file-like object to which to write the text
+            incrementally; if given, nothing is returned
+        :return str | NoneType: YAML text representation of this instance,
+            or null if it was written to a stream
         """
-        return "\n".join(self.get_yaml_lines()) + ("\n" if trailing_newline else "")
+        chunks = self.iter_yaml(trailing_newline)
+        if stream is None:
+            return "".join(chunks)
+        for chunk in chunks:
+            stream.write(chunk)
 
     def _data_for_repr(self):
         """
@@ -192,9 +531,88 @@ class AttMapLike(MutableMapping):
             to include in object's text representation
         """
         return filter(
-            lambda kv: not self._excl_from_repr(kv[0], self.__class__), self.items()
+            lambda kv: not self._excl_from_repr(kv[0], self.__class__),
+            self._stored_items(),
         )
 
+    @classmethod
+    def _check_loaded(cls, data, source):
+        """
+        Ensure that parsed data are an instance of this type.
+
+        :param object data: parsed data
+        :param str | file source: where the data came from
+        :return AttMapLike: the data
+        :raise TypeError: if the data aren't an instance of this type
+        """
+        if not isinstance(data, cls):
+            raise TypeError(
+                "Data from {} isn't a mapping: {}".format(
+                    getattr(source, "name", source), type(data).__name__
+                )
+            )
+        return data
+
+    @classmethod
+    def _from_parsed(cls, data):
+        """
+        Hook for building an instance from parsed data.
+
+        :param dict data: parsed key-value pairs, with any mapping value
+            already an instance of this type
+        :return AttMapLike: new instance with the given data
+        """
+        return cls(data)
+
+    def _get_stored(self, key):
+        """
+        Hook for fetching a value as stored, without any transformation.
+
+        :param hashable key: key for which to fetch value
+        :return object: value stored for the key
+        :raise KeyError: if the key is unmapped
+        """
+        return self[key]
+
+    def _get_for_eq(self, key):
+        """
+        Hook for fetching a value for comparison, without copy-on-write.
+
+        :param hashable key: key for which to fetch value
+        :return object: value stored for the key
+        :raise KeyError: if the key is unmapped
+        """
+        return self._get_stored(key)
+
+    def _store_new(self, entries):
+        """
+        Hook for storing the pairs of a mapping in this instance, while empty.
+
+        :param Mapping entries: key-value pairs to store
+        """
+        for k, v in entries.items():
+            self[k] = v
+
+    def _stored_items(self):
+        """
+        Hook for iterating over key-value pairs as stored, for conversions.
+
+        :return Iterable[(hashable, object)]: stored key-value pairs
+        """
+        return self.items()
+
+    def _eq_exclusion(self):
+        """
+        Get the exclusion test for comparison, or null if nothing's excluded.
+
+        :return function(hashable) -> bool | NoneType: whether a key should
+            be omitted from comparison, or null if _excl_from_eq isn't
+            overridden, so that comparison needn't consult it for each key
+        """
+        if type(self)._excl_from_eq is AttMapLike._excl_from_eq:
+            return None
+        return self._excl_from_eq
+
     def _excl_from_eq(self, k):
         """
         Hook for exclusion of particular value from a representation
@@ -231,34 +649,143 @@ class AttMapLike(MutableMapping):
         """Return the empty collection builder for Mapping type simplification."""
         pass
 
+    def _yaml_lines(self, space_per_level=2):
+        """
+        Generate the lines of YAML text for this instance's data.
+
+        This fuses the simplification and rendering steps used by
+        get_yaml_lines into a single walk of the data, following the same
+        rules: classes excluded from dict conversion are skipped, nested
+        custom maps are simplified, and top-level empty maps become null.
+        A section header is given only if the section has at least one line.
+
+        If rendered fragments are cached (see enable_render_cache), each
+        map's own lines, with a reference to each nested map in place of its
+        section, are cached until a key of the map is set or deleted, so
+        after a change only the changed maps are rendered again and the rest
+        is spliced in. Lines of a map with a value that may change in place,
+        such as a list, are rendered every time.
+
+        :param int space_per_level: number of spaces per level of nesting
+        :return Iterable[str]: lines of YAML text, without newlines
+        """
+        excluded = _as_types(self._excl_classes_from_todict())
+        empty_nested = _custom_repr(self._new_empty_basic_map())
+        name = ("yaml", space_per_level, excluded, empty_nested)
+        cache = caching_renders()
+
+        def lines(m, lev):
+            if lev == 0:
+                pairs = m._data_for_repr()
+            else:
+                pairs = getattr(m, "_stored_items", m.items)()
+            if not (cache and isinstance(m, AttMapLike)):
+                # Generated as consumed, so a map's lines aren't held at once.
+                return _yaml_fragment(
+                    pairs, lev, space_per_level, excluded, empty_nested, []
+                )
+            res = cached(m, name + (lev,))
+            if res is None:
+                unstable = []
+                res = list(
+                    _yaml_fragment(
+                        pairs, lev, space_per_level, excluded, empty_nested, unstable
+                    )
+                )
+                if not unstable:
+                    derived(m, name + (lev,), res)
+            return iter(res)
+
+        # Each frame: (lines and nested maps to consume, level)
+        stack = [(lines(self, 0), 0)]
+        while stack:
+            items, lev = stack[-1]
+            for item in items:
+                if isinstance(item, str):
+                    yield item
+                    continue
+                m, header, empty_line = item
+                sub = lines(m, lev + 1)
+                first = next(sub, None)
+                if first is None:
+                    # The section has no lines, so it's an empty value.
+                    yield empty_line
+                    continue
+                yield header
+                stack.append((itertools.chain([first], sub), lev + 1))
+                break
+            else:
+                stack.pop()
+
     def _simplify_keyvalue(
         self,
         kvs,
         build,
         acc=None,
         conversions=None,
+        leaf=None,
     ):
         """
         Simplify a collection of key-value pairs, "reducing" to simpler types.
 
+        The tree is walked with an explicit stack rather than by recursion,
+        so neither the number of keys nor the depth of nesting is limited
+        by the interpreter's recursion limit. Conversions apply only to the
+        values stored directly in the top-level accumulator.
+
+        If rendered fragments are cached (see enable_render_cache), each
+        nested map's own simplified entries are cached until a key of the
+        map is set or deleted, and copied into a new collection for each
+        call, so after a change only the changed maps are walked again.
+        Plain mappings (such as those a lazy map hasn't converted) are
+        copied into new collections too, so the result shares none of the
+        map's containers.
+
         :param Iterable[(object, object)] kvs: collection of key-value pairs
         :param callable build: how to build an empty collection
         :param Iterable acc: accumulating collection of simplified data
+        :param Iterable[(function(object) -> bool, object)] conversions:
+            collection of pairs in which first component is predicate function
+            and second is what to replace a top-level value with if it
+            satisfies the predicate
+        :param function(Mapping, hashable, object) -> object leaf: how to
+            transform each value other than a mapping, at any depth, given
+            the map that holds it (this one, for the given pairs) and its
+            key; nothing is cached if given
         :return Iterable: collection of simplified data
         """
-        acc = acc or build()
-        kvs = iter(kvs)
-        try:
-            k, v = next(kvs)
-        except StopIteration:
-            return acc
-        if not isinstance(v, self._excl_classes_from_todict() or tuple()):
-            if is_custom_map(v):
-                v = self._simplify_keyvalue(v.items(), build, build())
+        excluded = _as_types(self._excl_classes_from_todict())
+        conversions = conversions or []
+
+        def convert(v):
             if isinstance(v, Mapping):
-                for pred, proxy in conversions or []:
+                for pred, proxy in conversions:
                     if pred(v):
-                        v = proxy
-                        break
-            acc[k] = v
-        return self._simplify_keyvalue(kvs, build, acc, conversions)
+                        return proxy
+            return v
+
+        root = acc or build()
+        name = ("simplified", type(root), excluded)
+        # Each frame: (pairs to consume, accumulator, parent accumulator, key)
+        stack = [(iter(kvs), root, None, None)]
+        while stack:
+            pairs, curr, parent, key = stack[-1]
+            for k, v in pairs:
+                # Below the top level, the pairs are just the nested maps.
+                if curr is root:
+                    if isinstance(v, excluded):
+                        continue
+                    if not isinstance(v, Mapping):
+                        curr[k] = convert(v if leaf is None else leaf(self, k, v))
+                        continue
+                # Descend; this frame resumes once the submap is done.
+                entries, nested = _simplified_entries(v, build, excluded, name, leaf)
+                sub = build()
+                sub.update(entries)
+                stack.append((iter(nested), sub, curr, k))
+                break
+            else:
+                stack.pop()
+                if parent is not None:
+                    parent[key] = convert(curr) if parent is root else curr
+        return root
@@ -0,0 +1,120 @@
+""" Comparison of values in determination of map equality """
+
+import sys
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+__all__ = ["comparison_for", "register_comparison", "values_equal"]
+
+
+# Comparison function for each registered value type
+_COMPARISONS = {}
+# Comparison function, or null for ordinary equality, by each type seen
+_RESOLVED = {}
+# Names of modules whose types have default comparisons, once registered
+_DEFAULTS_REGISTERED = set()
+
+
+def comparison_for(cls):
+    """
+    Get the comparison registered for a type, or for its nearest base.
+
+    :param type cls: type of a value
+    :return function(object, object) -> bool | NoneType: the comparison, or
+        null if values of the type use ordinary equality
+    """
+    try:
+        return _RESOLVED[cls]
+    except KeyError:
+        return _resolve(cls)
+
+
+def register_comparison(cls, compare):
+    """
+    Register how to compare values of a type when comparing maps.
+
+    The comparison applies to instances of the type and its subtypes, when
+    both values of a pair are such instances. By default, numpy arrays are
+    compared with numpy.array_equal, and pandas Series and DataFrames with
+    their equals method; registering a comparison for one of those types
+    replaces the default.
+
+    :param type cls: type of values to which the comparison applies
+    :param function(object, object) -> bool compare: whether a pair of
+        values of the type is equal
+    """
+    _register_defaults()
+    _COMPARISONS[cls] = compare
+    _RESOLVED.clear()
+
+
+def values_equal(a, b):
+    """
+    Determine whether a pair of map values is equal.
+
+    Identical objects are equal, as for the values of a dict. Otherwise, a
+    comparison registered for both values' types decides, and if there's
+    none, ordinary equality. A comparison that can't reach a single answer
+    (raising ValueError, as for differently labeled Series) means unequal.
+
+    :param object a: one value
+    :param object b: other value
+    :return bool: whether the values are equal
+    """
+    if a is b:
+        return True
+    try:
+        compare = _RESOLVED[type(a)]
+    except KeyError:
+        compare = _resolve(type(a))
+    try:
+        if compare is not None:
+            try:
+                other = _RESOLVED[type(b)]
+            except KeyError:
+                other = _resolve(type(b))
+            if other is compare:
+                return bool(compare(a, b))
+        return bool(a == b)
+    except ValueError:
+        return False
+
+
+def _register_defaults():
+    """Register comparisons for numpy and pandas types, once loaded."""
+    for name in ["numpy", "pandas"]:
+        if name in _DEFAULTS_REGISTERED or name not in sys.modules:
+            continue
+        _DEFAULTS_REGISTERED.add(name)
+        if name == "numpy":
+            import numpy
+
+            _COMPARISONS.setdefault(numpy.ndarray, numpy.array_equal)
+        else:
+            import pandas
+
+            for cls in [pandas.Series, pandas.DataFrame]:
+                _COMPARISONS.setdefault(cls, cls.equals)
+        _RESOLVED.clear()
+
+
+def _resolve(cls):
+    """
+    Find the comparison for a type, from it or its nearest registered base.
+
+    :param type cls: type of a value
+    :return function(object, object) -> bool | NoneType: the comparison, or
+        null if values of the type use ordinary equality
+    """
+    _register_defaults()
+    for base in cls.__mro__:
+        try:
+            compare = _COMPARISONS[base]
+            break
+        except KeyError:
+            continue
+    else:
+        compare = None
+    _RESOLVED[cls] = compare
+    return compare
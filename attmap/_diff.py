@@ -0,0 +1,140 @@
+""" Structural difference between maps, and its application to a map """
+
+import sys
+from collections import namedtuple
+
+if sys.version_info < (3, 3):
+    from collections import Mapping
+else:
+    from collections.abc import Mapping
+
+from ._compare import values_equal
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+__all__ = ["MapDiff", "apply_diff", "diff"]
+
+
+MapDiff = namedtuple("MapDiff", ["added", "removed", "changed"])
+MapDiff.__doc__ = """
+Difference between a pair of maps, by path: a tuple of keys from the root.
+
+:param dict[tuple, object] added: new value at each path that only the
+    second map has
+:param dict[tuple, object] removed: old value at each path that only the
+    first map has
+:param dict[tuple, (object, object)] changed: old and new value at each
+    path that both maps have, with unequal values
+"""
+
+
+def diff(a, b):
+    """
+    Find the paths at which a pair of maps differs.
+
+    Both maps are walked once, together, with an explicit stack. Where both
+    values for a key are mappings, they're compared key by key, so a path
+    never leads through a difference; otherwise, the values are compared
+    as for map equality (see register_comparison). Values are fetched as
+    stored, so text isn't expanded and nothing is copied on write, and a
+    value or subtree that both maps share is passed over without a walk.
+    Keys excluded from a map's equality comparison are left out. The types
+    of the maps, and the order of their keys, aren't compared.
+
+    The reported values are the maps' own objects, not copies. The
+    difference is empty, i.e. not any(difference), if the maps have the
+    same content.
+
+    :param Mapping a: map from which to find the difference
+    :param Mapping b: map to which to find the difference
+    :return attmap.MapDiff: paths added, removed and changed, from a to b
+    """
+    added, removed, changed = {}, {}, {}
+    stack = [(a, b, ())]
+    while stack:
+        old, new, path = stack.pop()
+        get_old, get_new = _getter(old), _getter(new)
+        excl_old, excl_new = _exclusion(old), _exclusion(new)
+        for k in old:
+            if excl_old and excl_old(k):
+                continue
+            v_old = get_old(k)
+            if k not in new or (excl_new and excl_new(k)):
+                removed[path + (k,)] = v_old
+                continue
+            v_new = get_new(k)
+            if v_old is v_new:
+                continue
+            if isinstance(v_old, Mapping) and isinstance(v_new, Mapping):
+                stack.append((v_old, v_new, path + (k,)))
+            elif not values_equal(v_old, v_new):
+                changed[path + (k,)] = (v_old, v_new)
+        for k in new:
+            if k not in old and not (excl_new and excl_new(k)):
+                added[path + (k,)] = get_new(k)
+    return MapDiff(added, removed, changed)
+
+
+def apply_diff(m, difference):
+    """
+    Patch a map in place with a difference between maps.
+
+    Applying diff(a, b) to a map equal to a makes it equal to b. Removals
+    are applied first, then changes and additions. Nested maps on each path
+    are fetched from the map before they're modified, so a map shared with
+    a copy is copied first, and a map value being set is stored as a copy,
+    so the patched map doesn't share it with the diff's source.
+
+    :param attmap.AttMapLike m: mutable map to patch
+    :param attmap.MapDiff difference: paths to add, remove and change
+    :return attmap.AttMapLike: the patched map
+    :raise KeyError: if a path leads through a key the map doesn't have
+    :raise TypeError: if a path leads through a value that isn't a map, or
+        the map is immutable
+    """
+    for path in difference.removed:
+        del _parent(m, path)[path[-1]]
+    for path, (_, v) in difference.changed.items():
+        _parent(m, path)[path[-1]] = _own(v)
+    for path, v in difference.added.items():
+        _parent(m, path)[path[-1]] = _own(v)
+    return m
+
+
+def _exclusion(m):
+    """Get a map's exclusion test for comparison, if it has one."""
+    try:
+        return m._eq_exclusion()
+    except AttributeError:
+        return None
+
+
+def _getter(m):
+    """Get the function that fetches a map's values for comparison."""
+    try:
+        return m._get_for_eq
+    except AttributeError:
+        return m.__getitem__
+
+
+def _own(v):
+    """Copy a map value, so that the map it's stored in doesn't share it."""
+    return v.copy() if isinstance(v, Mapping) and hasattr(v, "copy") else v
+
+
+def _parent(m, path):
+    """
+    Get the map that holds the last key of a path.
+
+    :param attmap.AttMapLike m: map from which the path starts
+    :param tuple path: keys from the map to a value
+    :return Mapping: the map that holds the path's last key
+    :raise KeyError: if the path leads through an unmapped key
+    :raise TypeError: if the path leads through a value that isn't a map
+    """
+    for k in path[:-1]:
+        m = m._get_stored(k) if hasattr(m, "_get_stored") else m[k]
+        if not isinstance(m, Mapping):
+            raise TypeError("Value at {} isn't a map: {}".format(k, type(m).__name__))
+    return m
@@ -0,0 +1,123 @@
+""" Structural fingerprints of maps' content """
+
+import sys
+from collections import OrderedDict
+
+if sys.version_info < (3, 3):
+    from collections import Mapping
+else:
+    from collections.abc import Mapping
+
+from ._compare import comparison_for
+from ._tracking import cached, derived, link
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+__all__ = ["fingerprint", "known_unequal"]
+
+
+# Name under which a map's fingerprint is cached
+_NAME = "fingerprint"
+# Marker for a value that contributes to a fingerprint by identity
+_BY_IDENTITY = object()
+
+
+def fingerprint(m):
+    """
+    Get a map's fingerprint, computing it if it's not cached.
+
+    The fingerprint combines the map's type with its keys (in order, for
+    an ordered map) and the fingerprints of its values, so a nested map's
+    fingerprint is reused while it's cached. Each map's fingerprint is
+    cached, and linked to the maps in which it's nested, until the map or
+    a map nested in it changes. Keys excluded from comparison are left out.
+
+    A value that's hashable contributes its hash, and a list, tuple or
+    plain mapping contributes its elements. Any other value, or one with a
+    registered comparison, contributes its identity, so equal maps with
+    such values may differ in fingerprint; the fingerprint is then inexact.
+    A list or plain mapping may change in place, unnoticed, so it also
+    makes the fingerprint inexact.
+
+    :param attmap.AttMapLike m: map for which to get the fingerprint
+    :return (int, bool): the fingerprint, and whether it's exact, i.e. the
+        maps equal to this one have the same fingerprint
+    """
+    res = cached(m, _NAME)
+    if res is not None:
+        return res
+    # Each frame: (map, pairs to consume, fingerprinted pairs, key in parent)
+    stack = [(m, _pairs(m), [], None)]
+    while True:
+        node, pairs, parts, key = stack[-1]
+        for k, v in pairs:
+            if not hasattr(v, "_get_for_eq"):
+                parts.append((k, _leaf(v)))
+                continue
+            sub = cached(v, _NAME)
+            if sub is None:
+                # Descend; this frame resumes once the submap is done.
+                stack.append((v, _pairs(v), [], k))
+                break
+            link(v, node)
+            parts.append((k, sub))
+        else:
+            stack.pop()
+            res = derived(node, _NAME, _combine(node, parts))
+            if not stack:
+                return res
+            link(node, stack[-1][0])
+            stack[-1][2].append((key, res))
+
+
+def known_unequal(a, b):
+    """
+    Determine from cached fingerprints whether a pair of maps is unequal.
+
+    :param attmap.AttMapLike a: one map
+    :param attmap.AttMapLike b: other map
+    :return bool: whether both maps have cached, exact fingerprints that
+        differ; if not, the maps may or may not be equal
+    """
+    fa, fb = cached(a, _NAME), cached(b, _NAME)
+    return bool(fa and fb and fa[1] and fb[1] and fa[0] != fb[0])
+
+
+def _combine(m, parts):
+    """Combine the fingerprints of a map's values with its type and keys."""
+    pairs = [(k, fp) for k, (fp, _) in parts]
+    content = tuple(pairs) if isinstance(m, OrderedDict) else frozenset(pairs)
+    return hash((type(m), content)), all(exact for _, (_, exact) in parts)
+
+
+def _leaf(v):
+    """
+    Get the fingerprint of a value that's not a map.
+
+    :param object v: the value
+    :return (int, bool): the fingerprint, and whether it's exact
+    """
+    if comparison_for(type(v)) is None:
+        try:
+            return hash(v), True
+        except TypeError:
+            pass
+        if isinstance(v, (list, tuple)):
+            kind = list if isinstance(v, list) else tuple
+            parts = [_leaf(x) for x in v]
+            return (
+                hash((kind, tuple(fp for fp, _ in parts))),
+                kind is tuple and all(exact for _, exact in parts),
+            )
+        if isinstance(v, Mapping):
+            parts = [(k, _leaf(x)) for k, x in v.items()]
+            return hash((Mapping, frozenset((k, fp) for k, (fp, _) in parts))), False
+    return hash((_BY_IDENTITY, id(v))), False
+
+
+def _pairs(m):
+    """Iterate over a map's keys and values, as compared for equality."""
+    excluded = m._eq_exclusion()
+    get = m._get_for_eq
+    return iter([(k, get(k)) for k in list(m) if not (excluded and excluded(k))])
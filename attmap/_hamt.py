@@ -0,0 +1,181 @@
+""" Persistent hash array mapped trie, the storage behind PersistentAttMap
+
+A trie is a tree of immutable nodes, each with up to 32 slots indexed by 5
+bits of a key's hash. A slot holds either an entry, a tuple of
+(key, hash, sequence number, value), or a child node. Updates copy only the
+nodes on the path to the affected entry and share the rest of the trie, so
+they take time and space logarithmic in the number of entries. Null is the
+empty trie.
+"""
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+__all__ = ["assoc", "dissoc", "iter_entries", "khash", "lookup"]
+
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+# Depth at which all of a hash's bits are used, so keys collide outright
+_HASH_BITS = 64
+
+
+class _Node(object):
+    """Trie node, with a bitmap of the occupied slots among its 32"""
+
+    __slots__ = ("bitmap", "slots")
+
+    def __init__(self, bitmap, slots):
+        self.bitmap = bitmap
+        self.slots = slots
+
+
+class _Collision(object):
+    """Node holding entries for distinct keys with the same full hash"""
+
+    __slots__ = ("entries",)
+
+    def __init__(self, entries):
+        self.entries = entries
+
+
+def khash(key):
+    """
+    Hash a key to a non-negative integer of at most 64 bits.
+
+    :param hashable key: key to hash
+    :return int: the key's hash
+    """
+    return hash(key) & ((1 << _HASH_BITS) - 1)
+
+
+def _position(bitmap, bit):
+    """Index among a node's slots of the slot for the given bit."""
+    return bin(bitmap & (bit - 1)).count("1")
+
+
+def lookup(root, key, h):
+    """
+    Find the entry for a key.
+
+    :param _Node root: root of the trie to search
+    :param hashable key: key to find
+    :param int h: hash of the key
+    :return tuple: the key's entry
+    :raise KeyError: if the key isn't in the trie
+    """
+    node, shift = root, 0
+    while node is not None:
+        if type(node) is _Collision:
+            for e in node.entries:
+                if e[0] == key:
+                    return e
+            break
+        bit = 1 << ((h >> shift) & _MASK)
+        if not node.bitmap & bit:
+            break
+        slot = node.slots[_position(node.bitmap, bit)]
+        if type(slot) is tuple:
+            if slot[1] == h and (slot[0] is key or slot[0] == key):
+                return slot
+            break
+        node, shift = slot, shift + _BITS
+    raise KeyError(key)
+
+
+def assoc(root, entry, shift=0):
+    """
+    Get a trie with the given entry added, replacing any for the same key.
+
+    :param _Node root: root of the trie to which to add the entry
+    :param tuple entry: key, hash, sequence number, and value
+    :param int shift: bit offset into the hash for this level of the trie
+    :return _Node: root of the new trie
+    """
+    if root is None:
+        return _Node(1 << ((entry[1] >> shift) & _MASK), (entry,))
+    if type(root) is _Collision:
+        others = tuple(e for e in root.entries if e[0] != entry[0])
+        return _Collision(others + (entry,))
+    bit = 1 << ((entry[1] >> shift) & _MASK)
+    i = _position(root.bitmap, bit)
+    slots = root.slots
+    if not root.bitmap & bit:
+        return _Node(root.bitmap | bit, slots[:i] + (entry,) + slots[i:])
+    slot = slots[i]
+    if type(slot) is not tuple:
+        new = assoc(slot, entry, shift + _BITS)
+    elif slot[1] == entry[1] and (slot[0] is entry[0] or slot[0] == entry[0]):
+        new = entry
+    else:
+        new = _split(slot, entry, shift + _BITS)
+    return _Node(root.bitmap, slots[:i] + (new,) + slots[i + 1 :])
+
+
+def _split(e1, e2, shift):
+    """Make the node that separates two entries whose hashes share a prefix."""
+    if shift >= _HASH_BITS:
+        return _Collision((e1, e2))
+    i1, i2 = (e1[1] >> shift) & _MASK, (e2[1] >> shift) & _MASK
+    if i1 == i2:
+        return _Node(1 << i1, (_split(e1, e2, shift + _BITS),))
+    return _Node((1 << i1) | (1 << i2), (e1, e2) if i1 < i2 else (e2, e1))
+
+
+def dissoc(root, key, h):
+    """
+    Get a trie with a key's entry removed.
+
+    :param _Node root: root of the trie that contains the key
+    :param hashable key: key to remove, which must be in the trie
+    :param int h: hash of the key
+    :return _Node: root of the new trie, null if it's empty
+    """
+    res = _dissoc(root, key, h, 0)
+    if type(res) is tuple:
+        # Lone remaining entry, pulled up from a subtrie
+        return assoc(None, res)
+    return res
+
+
+def _dissoc(node, key, h, shift):
+    """
+    Remove a key's entry from a subtrie.
+
+    A subtrie left with a single entry is replaced by the entry itself, so
+    that the parent can hold it directly.
+    """
+    if type(node) is _Collision:
+        entries = tuple(e for e in node.entries if e[0] != key)
+        return entries[0] if 1 == len(entries) else _Collision(entries)
+    bit = 1 << ((h >> shift) & _MASK)
+    i = _position(node.bitmap, bit)
+    slot = node.slots[i]
+    new = None if type(slot) is tuple else _dissoc(slot, key, h, shift + _BITS)
+    if new is None:
+        if node.bitmap == bit:
+            return None
+        slots = node.slots[:i] + node.slots[i + 1 :]
+        if 1 == len(slots) and type(slots[0]) is tuple:
+            return slots[0]
+        return _Node(node.bitmap & ~bit, slots)
+    if type(new) is tuple and 1 == len(node.slots):
+        return new
+    return _Node(node.bitmap, node.slots[:i] + (new,) + node.slots[i + 1 :])
+
+
+def iter_entries(root):
+    """
+    Generate a trie's entries, in the order of the trie's structure.
+
+    :param _Node root: root of the trie
+    :return Iterable[tuple]: the trie's entries
+    """
+    stack = [] if root is None else [root]
+    while stack:
+        node = stack.pop()
+        for slot in node.entries if type(node) is _Collision else node.slots:
+            if type(slot) is tuple:
+                yield slot
+            else:
+                stack.append(slot)
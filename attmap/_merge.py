@@ -0,0 +1,97 @@
+""" Deep merge of key-value pairs into a map """
+
+import sys
+
+if sys.version_info < (3, 3):
+    from collections import Mapping
+else:
+    from collections.abc import Mapping
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+__all__ = ["KEEP_EXISTING", "LIST_APPEND", "MERGE_STRATEGIES", "OVERRIDE", "merge"]
+
+
+# Incoming value replaces existing one
+OVERRIDE = "override"
+# Existing value is kept
+KEEP_EXISTING = "keep_existing"
+# Incoming list is appended to existing list; otherwise, as for override
+LIST_APPEND = "list_append"
+MERGE_STRATEGIES = (OVERRIDE, KEEP_EXISTING, LIST_APPEND)
+
+
+def merge(target, entries, strategy=OVERRIDE):
+    """
+    Merge key-value pairs into a map, combining nested maps.
+
+    Where both the existing and the incoming value for a key are maps, the
+    incoming map is merged into the existing one in place, at any depth.
+    Otherwise, the strategy decides between the values. Each key is looked
+    up once, and the nesting is walked with an explicit stack, so the work
+    is linear in the size of the incoming data. Existing values are fetched
+    as stored (see _get_stored), so nothing is transformed for the lookup.
+
+    :param attmap.AttMapLike target: map into which to merge
+    :param Mapping | Iterable[(hashable, object)] entries: pairs to merge
+    :param str strategy: how to resolve a key with both an existing and an
+        incoming value, other than a pair of maps: "override" with the
+        incoming value, "keep_existing", or "list_append" to concatenate a
+        pair of lists (a new list, leaving the existing one alone) and
+        otherwise override
+    :return attmap.AttMapLike: the target
+    :raise ValueError: if the strategy is unknown
+    """
+    if strategy not in MERGE_STRATEGIES:
+        raise ValueError(
+            "Unknown merge strategy: {}; choose from {}".format(
+                strategy, ", ".join(MERGE_STRATEGIES)
+            )
+        )
+    if 0 == len(target):
+        if not isinstance(entries, Mapping):
+            entries = list(_iter_pairs(entries))
+            unique = dict(entries)
+            if len(unique) == len(entries):
+                entries = unique
+        if isinstance(entries, Mapping):
+            # Nothing to merge with, and the keys are unique.
+            target._store_new(entries)
+            return target
+    stack = [(target, _iter_pairs(entries))]
+    while stack:
+        curr, pairs = stack[-1]
+        for k, v in pairs:
+            try:
+                existing = curr._get_stored(k)
+            except KeyError:
+                curr[k] = v
+                continue
+            if isinstance(v, Mapping) and isinstance(existing, Mapping):
+                if hasattr(existing, "_get_stored"):
+                    # Descend; this level resumes once the submap is merged.
+                    stack.append((existing, _iter_pairs(v)))
+                    break
+                curr[k] = v
+            elif strategy == KEEP_EXISTING:
+                continue
+            elif (
+                strategy == LIST_APPEND
+                and isinstance(existing, list)
+                and isinstance(v, list)
+            ):
+                curr[k] = existing + v
+            else:
+                curr[k] = v
+        else:
+            stack.pop()
+    return target
+
+
+def _iter_pairs(entries):
+    """Iterate over a mapping's items or an iterable of pairs."""
+    try:
+        return iter(entries.items())
+    except AttributeError:
+        return iter(entries)
@@ -0,0 +1,171 @@
+""" Caches of what's derived from maps' content, invalidated on change """
+
+import weakref
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+__all__ = [
+    "cached",
+    "caching_renders",
+    "changed",
+    "derived",
+    "disable_render_cache",
+    "discard",
+    "enable_render_cache",
+    "link",
+]
+
+
+# Values derived from each tracked map's content, by the map's id and then
+# by name; a map's mutators call changed() while this is nonempty.
+_DERIVED = {}
+# Ids of the maps in which each tracked map is nested, by the map's id
+_PARENTS = {}
+# Weak reference to each tracked map, by the map's id, to learn of its end
+_REFS = {}
+# Whether rendered fragments of maps are cached (see enable_render_cache)
+_RENDERS = [False]
+# Kinds of derived value that are rendered fragments, by first name part
+_RENDERED = ("simplified", "yaml")
+
+
+def caching_renders():
+    """
+    Determine whether rendered fragments of maps are cached.
+
+    :return bool: whether rendered fragments of maps are cached
+    """
+    return _RENDERS[0]
+
+
+def enable_render_cache():
+    """
+    Start caching what's rendered for each map, until the map changes.
+
+    While enabled, to_yaml, iter_yaml, to_dict, to_map and repr keep what
+    they render for each map (its own lines or entries, with a reference
+    to each nested map), until a key of that map is set or deleted, so
+    after a small change to a large map only the changed maps are rendered
+    again. Cached fragments live as long as their maps, and while any are
+    cached, each set or deletion of a key discards those of the maps along
+    its path, so this suits large maps rendered often between changes.
+    """
+    _RENDERS[0] = True
+
+
+def disable_render_cache():
+    """Stop caching what's rendered for maps, and discard what's cached."""
+    _RENDERS[0] = False
+    discard(_RENDERED)
+
+
+def cached(m, name, default=None):
+    """
+    Get a value derived from a map, if it's cached.
+
+    :param attmap.AttMapLike m: map from which the value is derived
+    :param str name: name of the derived value
+    :param object default: what to return if the value isn't cached
+    :return object: the cached value, or the default if there's none
+    """
+    values = _DERIVED.get(id(m))
+    return default if values is None else values.get(name, default)
+
+
+def changed(m):
+    """
+    Discard what's derived from a map and from each map in which it's nested.
+
+    :param attmap.AttMapLike m: map whose content has changed
+    """
+    stack = [id(m)]
+    seen = set()
+    while stack:
+        i = stack.pop()
+        if i in seen:
+            continue
+        seen.add(i)
+        try:
+            _DERIVED[i].clear()
+        except KeyError:
+            pass
+        # Links are made again when a parent's values are next derived.
+        stack.extend(_PARENTS.pop(i, ()))
+
+
+def derived(m, name, value):
+    """
+    Cache a value derived from a map's content, until the content changes.
+
+    A map that doesn't support weak references can't be tracked, so nothing
+    is cached for it.
+
+    :param attmap.AttMapLike m: map from which the value is derived
+    :param str name: name of the derived value
+    :param object value: the derived value
+    :return object: the derived value
+    """
+    try:
+        _track(m)[name] = value
+    except TypeError:
+        pass
+    return value
+
+
+def discard(kinds):
+    """
+    Discard derived values of some kinds, from every map.
+
+    Once nothing's cached for any map, tracking stops altogether, so that
+    mutators no longer pay to discard anything.
+
+    :param Iterable[str] kinds: first parts of the names of derived values
+        to discard
+    """
+    kinds = set(kinds)
+    # Discarding a value may free a map it holds, which stops its tracking.
+    for values in list(_DERIVED.values()):
+        for name in [n for n in values if isinstance(n, tuple) and n[0] in kinds]:
+            del values[name]
+    if not any(_DERIVED.values()):
+        _DERIVED.clear()
+        _PARENTS.clear()
+        _REFS.clear()
+
+
+def link(child, parent):
+    """
+    Record that a map is nested in another, so a change in it reaches both.
+
+    :param attmap.AttMapLike child: the nested map
+    :param attmap.AttMapLike parent: map in which the child is nested
+    """
+    try:
+        _track(child)
+    except TypeError:
+        return
+    _PARENTS.setdefault(id(child), set()).add(id(parent))
+
+
+def _track(m):
+    """
+    Get the cache of a map's derived values, tracking the map if needed.
+
+    :param attmap.AttMapLike m: map to track
+    :return dict[str, object]: the map's derived values, by name
+    :raise TypeError: if the map doesn't support weak references
+    """
+    i = id(m)
+    cache = _DERIVED.get(i)
+    if cache is None:
+        # Forget the map once it's gone, before its id can be reused.
+        _REFS[i] = weakref.ref(m, lambda _, i=i: _forget(i))
+        cache = _DERIVED[i] = {}
+    return cache
+
+
+def _forget(i):
+    _DERIVED.pop(i, None)
+    _PARENTS.pop(i, None)
+    _REFS.pop(i, None)
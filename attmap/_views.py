@@ -0,0 +1,92 @@
+""" Live views of the keys, values, and items of a map """
+
+import sys
+
+if sys.version_info < (3, 3):
+    from collections import ItemsView, KeysView, ValuesView
+else:
+    from collections.abc import ItemsView, KeysView, ValuesView
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+__all__ = ["AttMapItemsView", "AttMapKeysView", "AttMapValuesView"]
+
+
+class AttMapKeysView(KeysView):
+    """Set-like, live view of a map's keys"""
+
+    __slots__ = ()
+
+    def __iter__(self):
+        return iter(self._mapping)
+
+    def __reversed__(self):
+        return reversed(self._mapping)
+
+
+class AttMapValuesView(ValuesView):
+    """Live view of a map's values, each fetched only when consumed"""
+
+    __slots__ = ("_fetch",)
+
+    def __init__(self, mapping, fetch=None):
+        """
+        Create the view.
+
+        :param Mapping mapping: the map to view
+        :param function(hashable) -> object fetch: how to get the value for a
+            key; by default, the map's own item access
+        """
+        super(AttMapValuesView, self).__init__(mapping)
+        self._fetch = fetch or mapping.__getitem__
+
+    def __contains__(self, value):
+        for v in self:
+            if v is value or v == value:
+                return True
+        return False
+
+    def __iter__(self):
+        fetch = self._fetch
+        for k in self._mapping:
+            yield fetch(k)
+
+    def __reversed__(self):
+        fetch = self._fetch
+        for k in reversed(self._mapping):
+            yield fetch(k)
+
+
+class AttMapItemsView(ItemsView):
+    """Set-like, live view of a map's key-value pairs, fetched as consumed"""
+
+    __slots__ = ("_fetch",)
+
+    def __init__(self, mapping, fetch=None):
+        """
+        Create the view.
+
+        :param Mapping mapping: the map to view
+        :param function(hashable) -> object fetch: how to get the value for a
+            key; by default, the map's own item access
+        """
+        super(AttMapItemsView, self).__init__(mapping)
+        self._fetch = fetch or mapping.__getitem__
+
+    def __contains__(self, item):
+        key, value = item
+        if key not in self._mapping:
+            return False
+        v = self._fetch(key)
+        return v is value or v == value
+
+    def __iter__(self):
+        fetch = self._fetch
+        for k in self._mapping:
+            yield k, fetch(k)
+
+    def __reversed__(self):
+        fetch = self._fetch
+        for k in reversed(self._mapping):
+            yield k, fetch(k)
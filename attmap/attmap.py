@@ -1,6 +1,7 @@
 """ Dot notation support for Mappings. """
 
 import sys
+from copy import deepcopy
 
 if sys.version_info < (3, 3):
     from collections import Mapping
@@ -8,12 +9,14 @@ else:
     from collections.abc import Mapping
 
 from ._att_map_like import AttMapLike
-from .helpers import copy, get_logger, safedel_message
+from ._compare import values_equal
+from ._fingerprint import known_unequal
+from ._tracking import _DERIVED, changed
+from .helpers import get_logger, is_custom_map, safedel_message
 
 _LOGGER = get_logger(__name__)
 
 
-@copy
 class AttMap(AttMapLike):
     """
     A class to convert a nested mapping(s) into an object(s) with key-values
@@ -22,11 +25,24 @@ class AttMap(AttMapLike):
     facilitating attribute traversal (e.g., attmap.attr.attr).
     """
 
+    def __delattr__(self, name):
+        super(AttMap, self).__delattr__(name)
+        if _DERIVED:
+            changed(self)
+
     def __delitem__(self, key):
         try:
             del self.__dict__[key]
         except KeyError:
             _LOGGER.debug(safedel_message(key))
+        else:
+            if _DERIVED:
+                changed(self)
+
+    def __copy__(self):
+        dup = self.__class__.__new__(self.__class__)
+        dup.__dict__.update(self.__dict__)
+        return dup
 
     def __getitem__(self, item):
         return self.__dict__[item]
@@ -42,44 +58,88 @@ class AttMap(AttMapLike):
         # TODO: consider enforcement of type constraint, that value of different
         # type may not overwrite existing.
         self.__dict__[key] = self._final_for_store(key, value)
+        if _DERIVED:
+            changed(self)
+
+    def __setattr__(self, name, value):
+        super(AttMap, self).__setattr__(name, value)
+        if _DERIVED:
+            changed(self)
 
     def __eq__(self, other):
+        """
+        Determine whether another map has the same type and stored data.
+
+        Values are compared as stored, so text isn't expanded for the
+        comparison, and with _cmp, which passes over identical values (so
+        a subtree shared by both maps isn't walked). Maps with cached,
+        exact fingerprints that differ are unequal without a walk.
+
+        :param object other: object to compare with this map
+        :return bool: whether the other object is an equal map
+        """
         # TODO: check for equality across classes?
+        if self is other:
+            return True
         if (type(self) != type(other)) or (len(self) != len(other)):
             return False
-        for k, v in self.items():
-            if self._excl_from_eq(k):
+        if _DERIVED and known_unequal(self, other):
+            return False
+        excluded = self._eq_exclusion()
+        get_this, get_that, cmp = self._get_for_eq, other._get_for_eq, self._cmp
+        for k in self:
+            if excluded and excluded(k):
                 _LOGGER.debug("Excluding from comparison: {}".format(k))
                 continue
-            if not self._cmp(v, other[k]):
+            try:
+                if not cmp(get_this(k), get_that(k)):
+                    return False
+            except KeyError:
                 return False
         return True
 
     def __ne__(self, other):
         return not self == other
 
-    @staticmethod
-    def _cmp(a, b):
-        """Hook to tailor value comparison in determination of map equality."""
+    # Hook to tailor value comparison in determination of map equality
+    _cmp = staticmethod(values_equal)
 
-        def same_type(obj1, obj2, typenames=None):
-            t1, t2 = str(obj1.__class__), str(obj2.__class__)
-            return (t1 in typenames and t2 in typenames) if typenames else t1 == t2
+    def copy(self):
+        """
+        Copy self to a new object.
 
-        if same_type(
-            a, b, ["<type 'numpy.ndarray'>", "<class 'numpy.ndarray'>"]
-        ) or same_type(a, b, ["<class 'pandas.core.series.Series'>"]):
-            check = lambda x, y: (x == y).all()
-        elif same_type(a, b, ["<class 'pandas.core.frame.DataFrame'>"]):
-            check = lambda x, y: (x == y).all().all()
-        else:
-            check = lambda x, y: x == y
-        try:
-            return check(a, b)
-        except ValueError:
-            # ValueError arises if, e.g., the pair of Series have
-            # have nonidentical labels.
-            return False
+        :return AttMap: deep copy of this instance
+        """
+        return deepcopy(self)
+
+    def copy_on_write(self):
+        """
+        Copy self to a new object, sharing values other than nested maps.
+
+        Nested maps are copied too, but other values are shared, as in a
+        dict copy. Attributes are read straight from the instance dict, so
+        nested maps can't be shared until one is fetched, as they are by
+        the ordered maps.
+
+        :return AttMap: copy of this instance
+        """
+        dup = self.__copy__()
+        for k, v in self.__dict__.items():
+            if is_custom_map(v):
+                dup.__dict__[k] = v.copy_on_write()
+        return dup
+
+    @classmethod
+    def _from_parsed(cls, data):
+        if (
+            cls.__setitem__ is not AttMap.__setitem__
+            or cls._final_for_store is not AttMap._final_for_store
+        ):
+            return super(AttMap, cls)._from_parsed(data)
+        # Every value is final already, so bypass finalization.
+        m = cls()
+        m.__dict__.update(data)
+        return m
 
     def _final_for_store(self, k, v):
         """
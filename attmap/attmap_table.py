@@ -0,0 +1,337 @@
+""" Columnar storage of many records with the same keys """
+
+import sys
+from collections import OrderedDict
+
+if sys.version_info < (3, 3):
+    from collections import Mapping
+else:
+    from collections.abc import Mapping
+
+from ._att_map_like import AttMapLike
+from ._views import AttMapItemsView, AttMapValuesView
+from .attmap import AttMap
+from .pathex_attmap import (
+    PathExAttMap,
+    _expanded_value,
+    _safely_expand,
+    expansion_cache,
+)
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+__all__ = ["AttMapRow", "AttMapTable"]
+
+
+class AttMapTable(object):
+    """
+    Collection of records with the same keys, stored as a list per key.
+
+    Records are handed out as lightweight AttMapRow views rather than as a
+    map apiece, and filtering, projection, and path expansion run over the
+    columns. A key absent from a record has a null value in that record.
+    """
+
+    def __init__(self, records=None):
+        """
+        Create a table, optionally with initial records.
+
+        :param Iterable[Mapping] records: records for the table's rows
+        """
+        self._columns = OrderedDict()
+        self._size = 0
+        for r in records or []:
+            self.append(r)
+
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        Create a table from its columns.
+
+        :param Mapping[hashable, Sequence] columns: values for each key, all
+            of the same length
+        :return AttMapTable: table with the given columns
+        :raise ValueError: if the columns' lengths differ
+        """
+        t = cls()
+        sizes = set()
+        for k, col in columns.items():
+            t._columns[k] = [_final(v) for v in col]
+            sizes.add(len(t._columns[k]))
+        if len(sizes) > 1:
+            raise ValueError("Columns differ in length: {}".format(sorted(sizes)))
+        t._size = sizes.pop() if sizes else 0
+        return t
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """
+        Create a table from a pandas DataFrame, without its row labels.
+
+        :param pandas.DataFrame df: table with a column for each key
+        :return AttMapTable: table with the data frame's columns
+        """
+        return cls.from_columns(OrderedDict((k, df[k].tolist()) for k in df.columns))
+
+    def __getitem__(self, i):
+        """
+        Get a view of a record.
+
+        :param int i: position of the record
+        :return AttMapRow: live view of the record
+        :raise IndexError: if there's no record at the position
+        """
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("Record index out of range: {}".format(i))
+        return AttMapRow(self, i)
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield AttMapRow(self, i)
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return "{}: {} records of {}".format(
+            self.__class__.__name__, self._size, list(self._columns)
+        )
+
+    def append(self, record):
+        """
+        Add a record to the table.
+
+        :param Mapping record: the record's data; a new key adds a column
+        """
+        for k in record:
+            if k not in self._columns:
+                self._columns[k] = [None] * self._size
+        for k, col in self._columns.items():
+            col.append(_final(record[k]) if k in record else None)
+        self._size += 1
+
+    def column(self, key, expand=False):
+        """
+        Get the values of a key, one per record.
+
+        :param hashable key: key for which to get values
+        :param bool expand: whether to expand text values as paths; each
+            distinct value is expanded once
+        :return list: values for the key, in record order
+        :raise KeyError: if the key isn't in the table
+        """
+        col = self._columns[key]
+        return _expand_all(col) if expand else list(col)
+
+    def expand(self, *keys):
+        """
+        Get a table with text values replaced by their path expansions.
+
+        :param hashable keys: keys for which to expand values; all if none
+        :return AttMapTable: new table, with expanded values
+        """
+        keys = set(keys or self._columns)
+        return self.from_columns(
+            OrderedDict(
+                (k, _expand_all(col) if k in keys else col)
+                for k, col in self._columns.items()
+            )
+        )
+
+    def filter(self, fun, *keys):
+        """
+        Get a table of the records that satisfy a predicate.
+
+        :param function fun: predicate, given the values of the named keys
+            for each record, or if no key is named, each record's view
+        :param hashable keys: keys whose values the predicate takes
+        :return AttMapTable: new table, with the selected records
+        """
+        if keys:
+            rows = zip(*[self._columns[k] for k in keys])
+            selected = [i for i, vals in enumerate(rows) if fun(*vals)]
+        else:
+            selected = [i for i, row in enumerate(self) if fun(row)]
+        return self.from_columns(
+            OrderedDict(
+                (k, [col[i] for i in selected]) for k, col in self._columns.items()
+            )
+        )
+
+    def keys(self):
+        """
+        Get the keys of the table's records.
+
+        :return list[hashable]: the keys, in order
+        """
+        return list(self._columns)
+
+    def project(self, *keys):
+        """
+        Get a table with only some of the keys.
+
+        :param hashable keys: keys to keep
+        :return AttMapTable: new table, with the given keys' columns
+        :raise KeyError: if a key isn't in the table
+        """
+        return self.from_columns(OrderedDict((k, self._columns[k]) for k in keys))
+
+    def to_dicts(self, expand=False):
+        """
+        Get a dict for each record.
+
+        :param bool expand: whether to expand paths
+        :return list[dict]: a dict per record, in order
+        """
+        return [r.to_dict(expand) for r in self]
+
+    def _set(self, i, key, value):
+        """Store a record's value for a key, adding a column if needed."""
+        try:
+            col = self._columns[key]
+        except KeyError:
+            col = self._columns[key] = [None] * self._size
+        col[i] = _final(value)
+
+
+class AttMapRow(AttMapLike):
+    """
+    Live view of a record in an AttMapTable.
+
+    Access is as for a PathExAttMap: by key or attribute, with text values
+    expanded as paths when fetched. Setting a value writes through to the
+    table, and setting a new key adds a column to the table.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table, index):
+        """
+        Create the view.
+
+        :param AttMapTable table: table that holds the record
+        :param int index: position of the record in the table
+        """
+        object.__setattr__(self, "_table", table)
+        object.__setattr__(self, "_index", index)
+
+    def __contains__(self, key):
+        return key in self._table._columns
+
+    def __delitem__(self, key):
+        raise TypeError(
+            "Can't remove a key from one record of a {}".format(
+                self._table.__class__.__name__
+            )
+        )
+
+    def __getitem__(self, item, expand=True, to_dict=False):
+        """
+        Fetch the value of given key.
+
+        :param hashable item: key for which to fetch value
+        :param bool expand: whether to expand string value as path
+        :param bool to_dict: whether to convert expanded mapping value to dict
+        :return object: value mapped to given key, if available
+        :raise KeyError: if the requested key is unmapped.
+        """
+        v = self._table._columns[item][self._index]
+        return _safely_expand(v, to_dict) if expand else v
+
+    def __iter__(self):
+        return iter(self._table._columns)
+
+    def __len__(self):
+        return len(self._table._columns)
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+    def __setitem__(self, key, value):
+        self._table._set(self._index, key, value)
+
+    def items(self, expand=False, to_dict=False):
+        """
+        Produce live view of key-value pairs, optionally expanding paths.
+
+        :param bool expand: whether to expand paths
+        :param bool to_dict: whether to convert expanded mapping values to dict
+        :return ItemsView: stored key-value pairs, optionally expanded
+        """
+        getitem = self.__getitem__
+        return AttMapItemsView(self, lambda k: getitem(k, expand, to_dict))
+
+    def values(self, expand=False):
+        """
+        Produce live view of values, optionally expanding paths.
+
+        :param bool expand: whether to expand paths
+        :return ValuesView: stored values, optionally expanded
+        """
+        getitem = self.__getitem__
+        return AttMapValuesView(self, lambda k: getitem(k, expand))
+
+    def to_dict(self, expand=False):
+        """
+        Return a builtin dict representation of this record.
+
+        :param bool expand: whether to expand paths
+        :return dict: builtin dict representation of this record
+        """
+        return self._simplify_keyvalue(
+            self.items(), dict, leaf=_expanded_value if expand else None
+        )
+
+    def to_map(self, expand=False):
+        """
+        Convert this record to a dict.
+
+        :param bool expand: whether to expand paths
+        :return dict[str, object]: this record's data, in a simpler container
+        """
+        return self._simplify_keyvalue(self.items(expand), self._new_empty_basic_map)
+
+    __eq__ = AttMap.__eq__
+    __ne__ = AttMap.__ne__
+    _cmp = staticmethod(AttMap._cmp)
+    _repr_pretty_ = AttMap._repr_pretty_
+
+    def _get_stored(self, key):
+        return self.__getitem__(key, expand=False)
+
+    def _new_empty_basic_map(self):
+        """For ordered maps, OrderedDict is the basic building block."""
+        return OrderedDict()
+
+    @property
+    def _lower_type_bound(self):
+        return PathExAttMap
+
+
+def _expand_all(values):
+    """
+    Expand text values as paths, each distinct value once.
+
+    :param Sequence values: values to expand
+    :return list: values, with text expanded
+    """
+    expanded = {}
+    res = []
+    for v in values:
+        if isinstance(v, str):
+            try:
+                v = expanded[v]
+            except KeyError:
+                v = expanded[v] = expansion_cache.expand(v)
+        res.append(v)
+    return res
+
+
+def _final(v):
+    """Convert a mapping value, as a record's map would store it."""
+    if isinstance(v, Mapping) and not isinstance(v, PathExAttMap):
+        return PathExAttMap(v)
+    return v
@@ -0,0 +1,232 @@
+""" Memory-compact map for many small records with the same keys """
+
+import weakref
+
+from ._att_map_like import AttMapLike
+from ._tracking import _DERIVED, changed, link
+from .attmap import AttMap
+from .helpers import (
+    _SHARED_KEYS,
+    _SHARERS,
+    claim_shared,
+    copy,
+    get_logger,
+    held,
+    is_custom_map,
+    safedel_message,
+    unshare,
+)
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+__all__ = ["CompactAttMap"]
+
+
+_LOGGER = get_logger(__name__)
+
+
+class _KeyTable(object):
+    """
+    Ordered keys, with their positions, shared by maps with the same keys.
+
+    Tables are interned while in use: there's at most one table for a given
+    sequence of keys, so maps with the same keys in the same order share a
+    single table, and a table is dropped once no map uses it.
+    """
+
+    __slots__ = ("keys", "index", "__weakref__")
+
+    def __init__(self, keys, index=None):
+        """
+        Create the table.
+
+        :param tuple keys: the keys, in order
+        :param dict index: position of each key, if already known
+        """
+        self.keys = keys
+        self.index = dict(zip(keys, range(len(keys)))) if index is None else index
+
+    def adding(self, key):
+        """
+        Get the table with a key appended to this one's keys.
+
+        :param hashable key: the key to append
+        :return _KeyTable: the (shared) table with the additional key
+        """
+        keys = self.keys + (key,)
+        table = _TABLES.get(keys)
+        if table is None:
+            index = dict(self.index)
+            index[key] = len(self.keys)
+            table = _TABLES[keys] = _KeyTable(keys, index)
+        return table
+
+    def removing(self, key):
+        """
+        Get the table with a key removed from this one's keys.
+
+        :param hashable key: the key to remove
+        :return _KeyTable: the (shared) table without the given key
+        """
+        return _table_for(tuple(k for k in self.keys if k != key))
+
+
+# Table in use for each sequence of keys
+_TABLES = weakref.WeakValueDictionary()
+
+
+def _table_for(keys):
+    """
+    Get the shared table for a sequence of keys.
+
+    :param tuple keys: the keys, in order, without duplicates
+    :return _KeyTable: the table of the keys
+    """
+    table = _TABLES.get(keys)
+    if table is None:
+        table = _TABLES[keys] = _KeyTable(keys)
+    return table
+
+
+_EMPTY_TABLE = _table_for(())
+
+
+@copy
+class CompactAttMap(AttMapLike):
+    """
+    Insertion-ordered map that stores its entries compactly.
+
+    Each instance holds just a reference to a table of keys and a list of
+    values, in slots rather than an instance dict. Instances with the same
+    keys (added in the same order) share the table, so a collection of many
+    small, similar records costs little more than its values. The initial
+    keys, given as a mapping or as pairs, make a single table; adding or
+    removing a key later switches the instance to another shared table, in
+    time proportional to the number of keys, so building a large map a key
+    at a time takes time quadratic in its number of keys.
+    """
+
+    __slots__ = ("_table", "_values", "__weakref__")
+
+    def __init__(self, entries=None):
+        object.__setattr__(self, "_table", _EMPTY_TABLE)
+        object.__setattr__(self, "_values", [])
+        super(CompactAttMap, self).__init__(entries)
+        # Drop the list's spare capacity from growth during population.
+        object.__setattr__(self, "_values", self._values[:])
+
+    def __contains__(self, key):
+        return key in self._table.index
+
+    def __copy__(self):
+        dup = self.__class__.__new__(self.__class__)
+        object.__setattr__(dup, "_table", self._table)
+        object.__setattr__(dup, "_values", self._values[:])
+        return dup
+
+    def __delattr__(self, name):
+        del self[name]
+
+    def __delitem__(self, key):
+        if _SHARERS:
+            unshare(self)
+        table = self._table
+        try:
+            i = table.index[key]
+        except KeyError:
+            _LOGGER.debug(safedel_message(key))
+        else:
+            del self._values[i]
+            object.__setattr__(self, "_table", table.removing(key))
+            if _DERIVED:
+                changed(self)
+
+    def __getitem__(self, item):
+        i = self._table.index[item]
+        v = self._values[i]
+        if _SHARED_KEYS and is_custom_map(v) and claim_shared(self, item):
+            # The original's, so take a private one before handing it out.
+            v = self._values[i] = v.copy_on_write()
+            held(v, self, item)
+            if _DERIVED:
+                # What's derived from this map refers to the original's.
+                changed(self)
+                link(v, self)
+        return v
+
+    def __iter__(self):
+        table = self._table
+        for k in table.keys:
+            if self._table is not table:
+                raise RuntimeError(
+                    "{} changed size during iteration".format(self.__class__.__name__)
+                )
+            yield k
+
+    def __len__(self):
+        return len(self._table.keys)
+
+    def __reduce__(self):
+        return self.__class__, (dict(zip(self._table.keys, self._values)),)
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+    def __setitem__(self, key, value):
+        if _SHARERS:
+            unshare(self)
+        value = self._final_for_store(key, value)
+        if _SHARED_KEYS:
+            claim_shared(self, key)
+        table = self._table
+        try:
+            self._values[table.index[key]] = value
+        except KeyError:
+            object.__setattr__(self, "_table", table.adding(key))
+            self._values.append(value)
+        if is_custom_map(value):
+            held(value, self, key)
+        if _DERIVED:
+            changed(self)
+
+    __eq__ = AttMap.__eq__
+    __ne__ = AttMap.__ne__
+    _cmp = staticmethod(AttMap._cmp)
+    _final_for_store = AttMap._final_for_store
+    _metamorph_maplike = AttMap._metamorph_maplike
+    _new_empty_basic_map = AttMap._new_empty_basic_map
+    _repr_pretty_ = AttMap._repr_pretty_
+
+    def _get_for_eq(self, key):
+        return self._values[self._table.index[key]]
+
+    def _raw(self, key):
+        i = self._table.index.get(key)
+        return None if i is None else self._values[i]
+
+    def _replace_raw(self, key, value):
+        self._values[self._table.index[key]] = value
+
+    def _stored_items(self):
+        return zip(self._table.keys, self._values[:])
+
+    def _store_new(self, entries):
+        if _SHARERS:
+            unshare(self)
+        # Make the table once, rather than a table per key added.
+        keys, values = [], []
+        for k, v in entries.items():
+            keys.append(k)
+            v = self._final_for_store(k, v)
+            values.append(v)
+            if is_custom_map(v):
+                held(v, self, k)
+        object.__setattr__(self, "_table", _table_for(tuple(keys)))
+        object.__setattr__(self, "_values", values)
+        if _DERIVED:
+            changed(self)
+
+    @property
+    def _lower_type_bound(self):
+        return CompactAttMap
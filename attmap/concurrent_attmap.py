@@ -0,0 +1,492 @@
+""" Map for sharing among threads, with a reader-writer lock per map """
+
+import sys
+import threading
+from contextlib import contextmanager
+from copy import deepcopy
+
+if sys.version_info < (3, 3):
+    from collections import Mapping
+else:
+    from collections.abc import Mapping
+
+from ._att_map_like import AttMapLike, _as_entries
+from ._merge import OVERRIDE, _iter_pairs
+from .attmap import AttMap
+from .helpers import get_logger, is_custom_map, safedel_message
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+__all__ = ["ConcurrentAttMap"]
+
+
+_LOGGER = get_logger(__name__)
+
+# Write locks held by the current thread's add_entries, if it's in one
+_MERGE = threading.local()
+# Guards the creation of a tree's lock for reading() and writing() blocks
+_NEW_BLOCK_LOCK = threading.Lock()
+
+
+class _ReadWriteLock(object):
+    """
+    Lock that any number of readers, or else a single writer, may hold.
+
+    A waiting writer keeps new readers out, so writers aren't starved. The
+    lock is reentrant: a thread that holds it may acquire it again, to read
+    or (if it holds it to write) to write. A reader can't become a writer.
+    """
+
+    __slots__ = ("_cond", "_readers", "_writer", "_writes", "_waiting")
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = {}  # Number of read holds, by thread id
+        self._writer = None  # Id of the thread that holds the lock to write
+        self._writes = 0  # Number of write holds by the writer
+        self._waiting = 0  # Number of threads waiting to write
+
+    def acquire_read(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer != me and me not in self._readers:
+                while self._writer is not None or self._waiting:
+                    self._cond.wait()
+            self._readers[me] = self._readers.get(me, 0) + 1
+
+    def release_read(self):
+        me = threading.get_ident()
+        with self._cond:
+            n = self._readers.pop(me) - 1
+            if n:
+                self._readers[me] = n
+            elif not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self, blocking=True):
+        """
+        Acquire the lock to write, once no other thread holds it.
+
+        :param bool blocking: whether to wait for the lock if another thread
+            holds it, rather than give up
+        :return bool: whether the lock was acquired
+        :raise RuntimeError: if the calling thread holds the lock to read
+        """
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writes += 1
+                return True
+            if me in self._readers:
+                raise RuntimeError("Can't write while holding a read lock")
+            if not blocking and (self._writer is not None or self._readers):
+                return False
+            self._waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting -= 1
+            self._writer, self._writes = me, 1
+            return True
+
+    def release_write(self):
+        with self._cond:
+            self._writes -= 1
+            if not self._writes:
+                self._writer = None
+                self._cond.notify_all()
+
+
+class ConcurrentAttMap(AttMapLike):
+    """
+    Insertion-ordered map that threads can share, read and write at once.
+
+    Each instance, including each nested map, has its own reader-writer
+    lock: reads of a map don't block each other, and a write locks just
+    the map written to, so writes to different subtrees don't contend.
+    Single reads and writes, pop, setdefault, update and clear are atomic,
+    and so is add_entries, which locks each map it merges into until the
+    merge is done. Iteration, views, conversions, comparison and copies
+    work from a snapshot of each map, taken under its lock, so they never
+    see a map mid-update (though a nested map may change between the
+    snapshots of its parent and itself). For a compound update, such as an
+    increment, hold the map's lock with writing(); for a consistent set of
+    reads, with reading().
+
+    Locks are taken from the outside in, and no thread waits for a lock
+    while it holds another, except in a reading() or writing() block, which
+    holds the maps in which its map is nested too. Blocks on maps of one
+    tree take turns, by the lock of the tree's outermost map, so a thread
+    in a block waits only for threads that hold no other lock, and threads
+    can't deadlock on the locks of a single tree. A nested map knows the
+    map it was last stored in; one stored in several maps is locked as
+    nested in that one. Blocks on maps of different trees don't take
+    turns, so a block shouldn't wait for a block on another tree.
+
+    Instances aren't tracked for change, so fingerprints and rendered
+    output aren't cached for them.
+    """
+
+    __slots__ = ("_block_lock", "_data", "_lock", "_parent")
+
+    def __init__(self, entries=None):
+        object.__setattr__(self, "_block_lock", None)
+        object.__setattr__(self, "_data", {})
+        object.__setattr__(self, "_lock", _ReadWriteLock())
+        object.__setattr__(self, "_parent", None)
+        super(ConcurrentAttMap, self).__init__(entries)
+
+    def __contains__(self, key):
+        lock = self._lock
+        lock.acquire_read()
+        try:
+            return key in self._data
+        finally:
+            lock.release_read()
+
+    def __copy__(self):
+        dup = self.__class__.__new__(self.__class__)
+        object.__setattr__(dup, "_block_lock", None)
+        object.__setattr__(dup, "_data", self._snapshot())
+        object.__setattr__(dup, "_lock", _ReadWriteLock())
+        object.__setattr__(dup, "_parent", None)
+        return dup
+
+    def __delattr__(self, name):
+        del self[name]
+
+    def __delitem__(self, key):
+        self._hold()
+        lock = self._lock
+        lock.acquire_write()
+        try:
+            self._detach(self._data.pop(key))
+        except KeyError:
+            _LOGGER.debug(safedel_message(key))
+        finally:
+            lock.release_write()
+
+    def __getitem__(self, item):
+        lock = self._lock
+        lock.acquire_read()
+        try:
+            return self._data[item]
+        finally:
+            lock.release_read()
+
+    def __iter__(self):
+        return iter(list(self._snapshot()))
+
+    def __len__(self):
+        return len(self._data)
+
+    def __reduce__(self):
+        return self.__class__, (self._stored_items(),)
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+    def __setitem__(self, key, value):
+        value = self._final_for_store(key, value)
+        if isinstance(value, ConcurrentAttMap):
+            object.__setattr__(value, "_parent", self)
+        self._hold()
+        lock = self._lock
+        lock.acquire_write()
+        try:
+            old = self._data.get(key)
+            self._data[key] = value
+            if old is not value:
+                self._detach(old)
+        finally:
+            lock.release_write()
+
+    __eq__ = AttMap.__eq__
+    __ne__ = AttMap.__ne__
+    _cmp = staticmethod(AttMap._cmp)
+    _final_for_store = AttMap._final_for_store
+    _metamorph_maplike = AttMap._metamorph_maplike
+    _new_empty_basic_map = AttMap._new_empty_basic_map
+    _repr_pretty_ = AttMap._repr_pretty_
+
+    def add_entries(self, entries, strategy=OVERRIDE):
+        """
+        Update this instance with provided key-value pairs, atomically.
+
+        Each map the merge reaches is locked, to write, before anything is
+        merged, and every such lock is held until the merge is done, so no
+        other thread sees the merge partly done.
+
+        :param Iterable[(object, object)] | Mapping | pandas.Series entries:
+            collection of pairs of keys and values
+        :param str strategy: how to resolve a key with both an existing and
+            an incoming value, other than a pair of maps: "override" with
+            the incoming value, "keep_existing", or "list_append" to
+            concatenate a pair of lists
+        :return ConcurrentAttMap: this instance
+        """
+        if getattr(_MERGE, "held", None) is not None:
+            # Part of an enclosing merge, which holds and releases the locks.
+            return super(ConcurrentAttMap, self).add_entries(entries, strategy)
+        if entries is None:
+            return self
+        entries = _as_entries(entries)
+        if not isinstance(entries, Mapping):
+            # Read twice: to find the maps to lock, and to merge.
+            entries = list(entries)
+        _MERGE.held = held = {}
+        try:
+            self._hold_all(entries, held)
+            return super(ConcurrentAttMap, self).add_entries(entries, strategy)
+        finally:
+            _MERGE.held = None
+            for lock in reversed(list(held.values())):
+                lock.release_write()
+
+    def clear(self):
+        with self._locked():
+            values = list(self._data.values())
+            self._data.clear()
+            for v in values:
+                self._detach(v)
+
+    def copy(self):
+        """
+        Copy self to a new object.
+
+        Each map is copied from a snapshot taken under its own lock.
+
+        :return ConcurrentAttMap: deep copy of this instance
+        """
+        return deepcopy(self)
+
+    def copy_on_write(self):
+        """
+        Copy self to a new object, sharing values other than nested maps.
+
+        Nested maps are copied too, each from a snapshot taken under its
+        own lock, but other values are shared, as in a dict copy.
+
+        :return ConcurrentAttMap: copy of this instance
+        """
+        dup = self.__copy__()
+        for k, v in dup._data.items():
+            if is_custom_map(v):
+                v = dup._data[k] = v.copy_on_write()
+                if isinstance(v, ConcurrentAttMap):
+                    object.__setattr__(v, "_parent", dup)
+        return dup
+
+    def items(self):
+        return self._snapshot().items()
+
+    def keys(self):
+        return self._snapshot().keys()
+
+    def values(self):
+        return self._snapshot().values()
+
+    __marker = object()
+
+    def pop(self, key, default=__marker):
+        with self._locked():
+            if default is self.__marker:
+                v = self._data.pop(key)
+            else:
+                v = self._data.pop(key, default)
+            self._detach(v)
+            return v
+
+    def popitem(self):
+        with self._locked():
+            item = self._data.popitem()
+            self._detach(item[1])
+            return item
+
+    def setdefault(self, key, default=None):
+        with self._locked():
+            try:
+                return self._data[key]
+            except KeyError:
+                self[key] = default
+                return self._data[key]
+
+    def update(self, *args, **kwargs):
+        with self._locked():
+            super(ConcurrentAttMap, self).update(*args, **kwargs)
+
+    @contextmanager
+    def reading(self):
+        """
+        Hold this map's lock to read, e.g. for a consistent set of reads.
+
+        Other threads may read, but not write, this map until the block
+        ends. The maps in which it's nested are held to read as well, from
+        the outermost in, so that reading through them in the block can't
+        deadlock. Writing, in the block, to this map or to one in which it's
+        nested raises RuntimeError. The block waits for any other thread's
+        block on a map of the same tree to end.
+        """
+        maps = self._ancestors() + [self]
+        held = []
+        with maps[0]._blocks():
+            try:
+                for m in maps:
+                    m._lock.acquire_read()
+                    held.append(m._lock)
+                yield self
+            finally:
+                for lock in reversed(held):
+                    lock.release_read()
+
+    @contextmanager
+    def writing(self):
+        """
+        Hold this map's lock to write, e.g. for a read-modify-write update.
+
+        No other thread may read or write this map until the block ends.
+        The maps in which it's nested are held to read, from the outermost
+        in, as for reading(), so writing to one of them in the block raises
+        RuntimeError. Maps nested in this one aren't locked. As for
+        reading(), the block takes its turn with other threads' blocks on
+        maps of the same tree.
+        """
+        ancestors = self._ancestors()
+        held = []
+        with (ancestors[0] if ancestors else self)._blocks():
+            try:
+                for m in ancestors:
+                    m._lock.acquire_read()
+                    held.append(m._lock)
+                with self._locked():
+                    yield self
+            finally:
+                for lock in reversed(held):
+                    lock.release_read()
+
+    def _ancestors(self):
+        """
+        Get the maps in which this one is nested.
+
+        :return list[ConcurrentAttMap]: the maps in which this one is
+            nested, outermost first
+        """
+        res, seen, m = [], {id(self)}, self._parent
+        while m is not None and id(m) not in seen:
+            res.append(m)
+            seen.add(id(m))
+            m = m._parent
+        return res[::-1]
+
+    def _blocks(self):
+        """
+        Get the lock by which blocks on maps of this tree take turns.
+
+        :return threading.RLock: lock of the tree of which this is the
+            outermost map
+        """
+        lock = self._block_lock
+        if lock is None:
+            with _NEW_BLOCK_LOCK:
+                lock = self._block_lock
+                if lock is None:
+                    lock = threading.RLock()
+                    object.__setattr__(self, "_block_lock", lock)
+        return lock
+
+    def _detach(self, v):
+        """Stop regarding a value removed from this map as nested in it."""
+        if isinstance(v, ConcurrentAttMap) and v._parent is self:
+            object.__setattr__(v, "_parent", None)
+
+    def _get_stored(self, key):
+        # A merge reads a map before it writes to it, so lock it for both.
+        self._hold()
+        return self[key]
+
+    def _hold(self):
+        """In add_entries, lock this map to write until the merge is done."""
+        held = getattr(_MERGE, "held", None)
+        if held is not None and id(self) not in held:
+            self._lock.acquire_write()
+            held[id(self)] = self._lock
+
+    def _hold_all(self, entries, held):
+        """
+        Lock, to write, each map that merging entries into this one reaches.
+
+        No lock is waited for while others are held: if a map's lock is
+        taken, the locks held are released, and once the map is free, the
+        maps to lock are found again. So the merge can't deadlock with a
+        thread that holds a nested map's lock and waits for its parent's.
+
+        :param Mapping | list[(object, object)] entries: key-value pairs to
+            merge
+        :param dict held: collection to which to add each lock acquired, by
+            the id of its map
+        """
+        while True:
+            missing = [m for m in self._merge_targets(entries) if id(m) not in held]
+            if not missing:
+                # Each target's parent is held, so the targets are final.
+                return
+            for m in missing:
+                if m._lock.acquire_write(blocking=False):
+                    held[id(m)] = m._lock
+                    continue
+                for lock in reversed(list(held.values())):
+                    lock.release_write()
+                held.clear()
+                m._lock.acquire_write()
+                m._lock.release_write()
+                break
+
+    @contextmanager
+    def _locked(self):
+        """Hold this map's lock to write, alone, for an atomic operation."""
+        self._hold()
+        self._lock.acquire_write()
+        try:
+            yield self
+        finally:
+            self._lock.release_write()
+
+    def _merge_targets(self, entries):
+        """
+        Find the maps that merging entries into this one would reach.
+
+        :param Mapping | list[(object, object)] entries: key-value pairs to
+            merge
+        :return list[ConcurrentAttMap]: this map, and each nested map into
+            which a mapping would be merged, each after its parent
+        """
+        targets, stack = [self], [(self, entries)]
+        while stack:
+            m, pairs = stack.pop()
+            for k, v in _iter_pairs(pairs):
+                existing = m._data.get(k) if isinstance(v, Mapping) else None
+                if isinstance(existing, ConcurrentAttMap):
+                    targets.append(existing)
+                    stack.append((existing, v))
+        return targets
+
+    def _snapshot(self):
+        """
+        Copy the stored key-value pairs, under this map's lock.
+
+        :return dict: the stored key-value pairs, at one moment
+        """
+        self._lock.acquire_read()
+        try:
+            return dict(self._data)
+        finally:
+            self._lock.release_read()
+
+    def _stored_items(self):
+        return list(self._snapshot().items())
+
+    @property
+    def _lower_type_bound(self):
+        return ConcurrentAttMap
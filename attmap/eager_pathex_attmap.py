@@ -0,0 +1,90 @@
+""" PathExAttMap that expands paths once, when values are stored """
+
+from collections import OrderedDict
+
+from ._tracking import _DERIVED, changed
+from .helpers import _SHARERS, get_logger, safedel_message, unshare
+from .pathex_attmap import PathExAttMap, _safely_expand
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+__all__ = ["EagerPathExAttMap"]
+
+
+_LOGGER = get_logger(__name__)
+
+
+class EagerPathExAttMap(PathExAttMap):
+    """
+    PathExAttMap that expands each text value as it's stored.
+
+    Both the raw and the expanded form of each text value are kept, so reads
+    with expansion are plain lookups, while the raw values still back the
+    unexpanded views and conversions (items(), to_dict(expand=False), YAML).
+    The expansion reflects the environment at the time the value was stored,
+    so this suits processes in which the environment doesn't change.
+    """
+
+    _INTERNAL = PathExAttMap._INTERNAL + ("_expansions",)
+
+    def __init__(self, entries=None, lazy=False):
+        # Not map data, so bypass the storage of attributes as entries.
+        object.__setattr__(self, "_expansions", {})
+        super(EagerPathExAttMap, self).__init__(entries, lazy)
+
+    def __copy__(self):
+        dup = super(EagerPathExAttMap, self).__copy__()
+        object.__setattr__(dup, "_expansions", dict(self._expansions))
+        return dup
+
+    def __getitem__(self, item, expand=True, to_dict=False):
+        """
+        Fetch the value of given key.
+
+        :param hashable item: key for which to fetch value
+        :param bool expand: whether to get the expanded form of a text value
+        :param bool to_dict: whether to convert expanded mapping value to dict
+        :return object: value mapped to given key, if available
+        :raise KeyError: if the requested key is unmapped.
+        """
+        if not expand:
+            return super(EagerPathExAttMap, self).__getitem__(item, False)
+        try:
+            return self._expansions[item]
+        except KeyError:
+            pass
+        v = super(EagerPathExAttMap, self).__getitem__(item, False)
+        if to_dict and isinstance(v, EagerPathExAttMap):
+            return v.to_dict(expand=True)
+        return _safely_expand(v, to_dict)
+
+    def __setitem__(self, key, value, finalize=True):
+        """Store the value, and the expanded form of a text value."""
+        super(EagerPathExAttMap, self).__setitem__(key, value, finalize)
+        value = OrderedDict.__getitem__(self, key)
+        if isinstance(value, str):
+            self._expansions[key] = _safely_expand(value)
+        else:
+            self._expansions.pop(key, None)
+
+    def __delitem__(self, key):
+        """Make unmapped key deletion unexceptional."""
+        if _SHARERS:
+            unshare(self)
+        try:
+            OrderedDict.__delitem__(self, key)
+        except KeyError:
+            _LOGGER.debug(safedel_message(key))
+        else:
+            if _DERIVED:
+                changed(self)
+        self._expansions.pop(key, None)
+
+    def pop(self, key, *args):
+        self._expansions.pop(key, None)
+        return super(EagerPathExAttMap, self).pop(key, *args)
+
+    @property
+    def _lower_type_bound(self):
+        return EagerPathExAttMap
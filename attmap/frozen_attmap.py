@@ -0,0 +1,353 @@
+""" Immutable, hashable maps that memoize their conversions """
+
+import sys
+from collections import OrderedDict
+
+if sys.version_info < (3, 3):
+    from collections import Mapping
+else:
+    from collections.abc import Mapping
+
+from .attmap import AttMap
+from .attmap_echo import EchoAttMap
+from .ordattmap import OrdAttMap
+from .pathex_attmap import PathExAttMap
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+__all__ = [
+    "FrozenAttMap",
+    "FrozenEchoAttMap",
+    "FrozenOrdAttMap",
+    "FrozenPathExAttMap",
+    "freeze",
+]
+
+
+class _FrozenMapMixin(object):
+    """
+    Immutability, structural hashing, and memoized conversions for a map.
+
+    Instances are populated at construction and reject mutation afterward.
+    Stored lists, sets and plain mappings are replaced, at any depth, by
+    immutable, hashable counterparts that compare equal to them, so the
+    data can't change in place either. The hash and the results of
+    to_dict, to_map, to_yaml and repr are computed once, on first request;
+    to_dict and to_map give each caller a copy, with plain lists and dicts.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, entries=None):
+        # Null memo means the instance is still being populated.
+        object.__setattr__(self, "_memo", None)
+        super(_FrozenMapMixin, self).__init__(entries)
+        object.__setattr__(self, "_memo", {})
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("{} is immutable".format(self.__class__.__name__))
+
+    def __setitem__(self, key, value, *args, **kwargs):
+        if self._memo is not None:
+            self._immutable()
+        super(_FrozenMapMixin, self).__setitem__(key, value, *args, **kwargs)
+
+    def __delitem__(self, key):
+        if self._memo is not None:
+            self._immutable()
+        super(_FrozenMapMixin, self).__delitem__(key)
+
+    def _final_for_store(self, k, v):
+        return _frozen_value(super(_FrozenMapMixin, self)._final_for_store(k, v))
+
+    __setattr__ = __delattr__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+    move_to_end = __ior__ = _immutable
+
+    def __hash__(self):
+        try:
+            return self._memo["hash"]
+        except KeyError:
+            pairs = (
+                (k, _hash_value(v))
+                for k, v in self.items()
+                if not self._excl_from_eq(k)
+            )
+            # Ordered maps are equal only if keys are in the same order.
+            h = hash(
+                tuple(pairs) if isinstance(self, OrderedDict) else frozenset(pairs)
+            )
+            self._memo["hash"] = h
+            return h
+
+    def __reduce__(self):
+        return self.__class__, (list(self.items()),)
+
+    def __repr__(self):
+        return self._memoized("repr", super(_FrozenMapMixin, self).__repr__)
+
+    def copy(self):
+        """
+        Copy self, which for an immutable map is self.
+
+        :return _FrozenMapMixin: this instance
+        """
+        return self
+
+    __copy__ = copy_on_write = copy
+
+    def freeze(self):
+        """
+        Get immutable version of self, which is self.
+
+        :return _FrozenMapMixin: this instance
+        """
+        return self
+
+    def to_dict(self):
+        """
+        Return a builtin dict representation of this instance, memoized.
+
+        :return dict: builtin dict representation of this instance
+        """
+        return _thawed(self._memoized("to_dict", super(_FrozenMapMixin, self).to_dict))
+
+    def to_map(self):
+        """
+        Convert this instance to a dict, memoized.
+
+        :return dict[str, object]: this map's data, in a simpler container
+        """
+        return _thawed(self._memoized("to_map", super(_FrozenMapMixin, self).to_map))
+
+    def to_yaml(self, trailing_newline=True, stream=None):
+        """
+        Get text for YAML representation, memoized.
+
+        :param bool trailing_newline: whether to add trailing newline
+        :param stream: file-like object to which to write the text; if
+            given, nothing is returned
+        :return str | NoneType: YAML text representation of this instance,
+            or null if it was written to a stream
+        """
+        text = self._memoized(
+            ("to_yaml", trailing_newline),
+            lambda: super(_FrozenMapMixin, self).to_yaml(trailing_newline),
+        )
+        if stream is None:
+            return text
+        stream.write(text)
+
+    def _memoized(self, key, compute):
+        """
+        Get a memoized result, computing and storing it if needed.
+
+        :param hashable key: identifier of the result
+        :param function() -> object compute: how to compute the result
+        :return object: the result
+        """
+        memo = self._memo
+        if memo is None:
+            # Still being populated, so nothing's final.
+            return compute()
+        try:
+            return memo[key]
+        except KeyError:
+            res = memo[key] = compute()
+            return res
+
+
+class _FrozenList(list):
+    """List that rejects changes, and so is hashable"""
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("Frozen list is immutable")
+
+    append = clear = extend = insert = pop = remove = reverse = sort = _immutable
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+
+    def __hash__(self):
+        return hash(tuple(_hash_value(x) for x in self))
+
+    def __reduce__(self):
+        return self.__class__, (list(self),)
+
+
+class _FrozenDict(dict):
+    """Dict that rejects changes, and so is hashable"""
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("Frozen dict is immutable")
+
+    clear = pop = popitem = setdefault = update = _immutable
+    __setitem__ = __delitem__ = __ior__ = _immutable
+
+    def __hash__(self):
+        return hash(frozenset((k, _hash_value(x)) for k, x in self.items()))
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+
+class FrozenAttMap(_FrozenMapMixin, AttMap):
+    """Immutable, hashable AttMap that memoizes its conversions"""
+
+    __slots__ = ("_memo",)
+
+    @property
+    def _lower_type_bound(self):
+        return FrozenAttMap
+
+
+class FrozenOrdAttMap(_FrozenMapMixin, OrdAttMap):
+    """Immutable, hashable OrdAttMap that memoizes its conversions"""
+
+    __slots__ = ("_memo",)
+
+    @property
+    def _lower_type_bound(self):
+        return FrozenOrdAttMap
+
+
+class FrozenPathExAttMap(_FrozenMapMixin, PathExAttMap):
+    """
+    Immutable, hashable PathExAttMap that memoizes its conversions
+
+    Expanded conversions depend on the environment, so only unexpanded
+    conversions are memoized.
+    """
+
+    __slots__ = ("_memo",)
+
+    def to_dict(self, expand=False):
+        """
+        Return a builtin dict representation of this instance.
+
+        :param bool expand: whether to expand paths; if not, the result is
+            memoized
+        :return dict: builtin dict representation of this instance
+        """
+        if expand:
+            return _thawed(PathExAttMap.to_dict(self, expand))
+        return super(FrozenPathExAttMap, self).to_dict()
+
+    def to_map(self, expand=False):
+        """
+        Convert this instance to a dict.
+
+        :param bool expand: whether to expand paths; if not, the result is
+            memoized
+        :return dict[str, object]: this map's data, in a simpler container
+        """
+        if expand:
+            return _thawed(PathExAttMap.to_map(self, expand))
+        return super(FrozenPathExAttMap, self).to_map()
+
+    @property
+    def _lower_type_bound(self):
+        return FrozenPathExAttMap
+
+
+class FrozenEchoAttMap(FrozenPathExAttMap, EchoAttMap):
+    """Immutable, hashable EchoAttMap that memoizes its conversions"""
+
+    __slots__ = ()
+
+    @property
+    def _lower_type_bound(self):
+        return FrozenEchoAttMap
+
+
+# Frozen counterpart of each mutable type, most specific first
+_FROZEN_TYPES = OrderedDict(
+    [
+        (EchoAttMap, FrozenEchoAttMap),
+        (PathExAttMap, FrozenPathExAttMap),
+        (OrdAttMap, FrozenOrdAttMap),
+        (AttMap, FrozenAttMap),
+    ]
+)
+
+
+def freeze(m):
+    """
+    Get an immutable, hashable counterpart of a map.
+
+    :param attmap.AttMapLike m: the map to freeze
+    :return _FrozenMapMixin: frozen version of the given map, or the map
+        itself if it's already frozen
+    :raise TypeError: if there's no frozen counterpart for the map's type
+    """
+    if isinstance(m, _FrozenMapMixin):
+        return m
+    for base, frozen in _FROZEN_TYPES.items():
+        if isinstance(m, base):
+            return frozen(list(m._stored_items()))
+    raise TypeError("No frozen counterpart for {}".format(type(m).__name__))
+
+
+def _frozen_value(v):
+    """
+    Get an immutable counterpart of a value, to store in a frozen map.
+
+    Lists, sets and mappings other than maps (which are frozen as they're
+    stored) are converted, as are the contents of lists, tuples and
+    mappings; other values are kept.
+
+    :param object v: value to store
+    :return object: immutable value, equal to the given one
+    """
+    if isinstance(v, (_FrozenMapMixin, _FrozenList, _FrozenDict, frozenset)):
+        return v
+    if isinstance(v, list):
+        return _FrozenList(_frozen_value(x) for x in v)
+    if type(v) is tuple:
+        return tuple(_frozen_value(x) for x in v)
+    if isinstance(v, set):
+        return frozenset(v)
+    if isinstance(v, Mapping):
+        return _FrozenDict((k, _frozen_value(x)) for k, x in v.items())
+    return v
+
+
+def _thawed(obj):
+    """
+    Copy the containers of a conversion, with plain lists and dicts.
+
+    :param object obj: memoized result of a conversion, or part of one
+    :return object: copy in which no container is shared with the original
+    """
+    if isinstance(obj, dict):
+        cls = dict if isinstance(obj, _FrozenDict) else type(obj)
+        return cls((k, _thawed(v)) for k, v in obj.items())
+    if isinstance(obj, list):
+        return [_thawed(x) for x in obj]
+    if type(obj) is tuple:
+        return tuple(_thawed(x) for x in obj)
+    return obj
+
+
+def _hash_value(v):
+    """
+    Hash a value, by structure for common unhashable containers.
+
+    Unhashable values of other types hash by type, which is consistent with
+    equality though coarse.
+
+    :param object v: value to hash
+    :return int: hash of the value
+    """
+    try:
+        return hash(v)
+    except TypeError:
+        pass
+    if isinstance(v, Mapping):
+        return hash(frozenset((k, _hash_value(x)) for k, x in v.items()))
+    if isinstance(v, (list, tuple)):
+        return hash(tuple(_hash_value(x) for x in v))
+    return hash(type(v))
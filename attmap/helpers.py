@@ -2,6 +2,7 @@
 
 import logging
 import sys
+import weakref
 from copy import deepcopy
 
 if sys.version_info < (3, 3):
@@ -9,27 +10,226 @@ if sys.version_info < (3, 3):
 else:
     from collections.abc import Mapping
 
+from ._tracking import _DERIVED, changed, link
+
 __author__ = "Vince Reuter"
 __email__ = "vreuter@virginia.edu"
 
-__all__ = ["get_data_lines"]
+__all__ = ["get_data_lines", "iter_data_lines"]
+
+
+# Keys of each copy, by the copy's id, whose nested maps belong to the map it
+# was copied from (or, for a copy of a copy, to the first map)
+_SHARED_KEYS = {}
+# Copies that hold each map shared with them, by the map's id: a weak
+# reference to the map, and (weak reference to the copy, key) pairs, by the
+# copy's id and the key
+_SHARERS = {}
+# Maps that have stored each nested map, by its id: a weak reference to the
+# map, and (weak reference to a holder, key) pairs, by the holder's id and key
+_HOLDERS = {}
 
 
 def copy(obj):
+    """
+    Give a class of maps a deep copy, and a copy-on-write copy.
+
+    The class provides _raw(key), which gets a value as stored, or null if
+    the key is missing, and _replace_raw(key, value), which replaces a value
+    as stored; its __getitem__ calls claim_shared, it calls held for each
+    nested map it stores, and each of its mutators calls unshare (while
+    _SHARERS is nonempty) before the change.
+
+    :param type obj: class of maps
+    :return type: the class
+    """
+
     def copy(self):
         """
         Copy self to a new object.
+
+        :return attmap.AttMapLike: deep copy of this instance
         """
         return deepcopy(self)
 
+    def copy_on_write(self):
+        """
+        Copy self to a new object, copy-on-write.
+
+        Nested maps are shared by this instance and the copy. One is copied
+        (the same way) for the copy only when the copy hands it out, or when
+        it, or a map nested in it, is about to change, so only the path to a
+        changed map is duplicated. Nested maps stay with this instance, so
+        a change through one fetched from this instance, before the copy or
+        after, doesn't reach the copy. Conversions and rendering read the
+        shared maps without copying them. Other values are shared, as in a
+        dict copy.
+
+        :return attmap.AttMapLike: copy of this instance
+        """
+        dup = self.__copy__()
+        share_nested(dup)
+        return dup
+
     obj.copy = copy
+    obj.copy_on_write = copy_on_write
     return obj
 
 
+def claim_shared(m, key):
+    """
+    Stop regarding a copy's value for a key as shared with the original.
+
+    :param attmap.AttMapLike m: map that stores the key
+    :param hashable key: key no longer to regard as shared
+    :return bool: whether the value for the key was regarded as shared
+    """
+    keys = _SHARED_KEYS.get(id(m))
+    if not keys or key not in keys:
+        return False
+    keys.remove(key)
+    return True
+
+
+def held(m, holder, key):
+    """
+    Record where a map is stored, so that a change to it can reach copies.
+
+    :param attmap.AttMapLike m: nested map
+    :param attmap.AttMapLike holder: map that stores it
+    :param hashable key: key for which the holder stores it
+    """
+    i = id(m)
+    e = _HOLDERS.get(i)
+    if e is None or e[0]() is not m:
+        try:
+            ref = weakref.ref(m, lambda r, i=i: _drop(_HOLDERS, i, r))
+        except TypeError:
+            # Not weakly referenceable, so not a map that's copied on write
+            return
+        e = _HOLDERS[i] = (ref, {})
+    e[1][(id(holder), key)] = (weakref.ref(holder), key)
+
+
+def share_nested(m):
+    """
+    Regard each of a new copy's nested maps as shared with the original.
+
+    :param attmap.AttMapLike m: the copy
+    """
+    keys = set()
+    ref = weakref.ref(m)
+    for k, v in m._stored_items():
+        if not is_custom_map(v) or getattr(v, "_replace_raw", None) is None:
+            continue
+        keys.add(k)
+        i = id(v)
+        e = _SHARERS.get(i)
+        if e is None or e[0]() is not v:
+            vref = weakref.ref(v, lambda r, i=i: _drop(_SHARERS, i, r))
+            e = _SHARERS[i] = (vref, {})
+        e[1][(id(m), k)] = (ref, k)
+    i = id(m)
+    try:
+        _SHARED_KEYS[i].update(keys)
+    except KeyError:
+        _SHARED_KEYS[i] = keys
+        # Forget the keys once the map's gone, before its id can be reused.
+        weakref.finalize(m, _SHARED_KEYS.pop, i, None)
+
+
+def unshare(m):
+    """
+    Before a map changes, give each copy that shares it its own copy.
+
+    A copy may share the map itself, or a map in which it's nested, so the
+    maps that hold the map are found, outward, from where each was stored,
+    and each that's shared is copied for the copies that share it, from the
+    outermost in. Only the path to the changing map is duplicated for a
+    copy.
+
+    :param attmap.AttMapLike m: map about to change
+    """
+    # Each map follows the maps that hold it, so the outermost come first.
+    order, seen = [], {id(m)}
+    stack = [(m, iter(_holders(m)))]
+    while stack:
+        x, holders = stack[-1]
+        for h in holders:
+            if id(h) not in seen:
+                seen.add(id(h))
+                stack.append((h, iter(_holders(h))))
+                break
+        else:
+            stack.pop()
+            order.append(x)
+    for x in order:
+        e = _SHARERS.get(id(x))
+        if e is None or e[0]() is not x:
+            continue
+        del _SHARERS[id(x)]
+        for ref, k in e[1].values():
+            copy = ref()
+            if copy is None or copy._raw(k) is not x:
+                continue
+            own = x.copy_on_write()
+            copy._replace_raw(k, own)
+            held(own, copy, k)
+            claim_shared(copy, k)
+            if _DERIVED:
+                link(own, copy)
+                changed(copy)
+
+
+def _holders(m):
+    """
+    Get the maps that hold a map, forgetting those that no longer do.
+
+    :param attmap.AttMapLike m: nested map
+    :return list[attmap.AttMapLike]: maps that store the map
+    """
+    e = _HOLDERS.get(id(m))
+    if e is None or e[0]() is not m:
+        return []
+    found = []
+    for j, (ref, key) in list(e[1].items()):
+        h = ref()
+        if h is None or h._raw(key) is not m:
+            del e[1][j]
+        else:
+            found.append(h)
+    return found
+
+
+def _drop(registry, i, ref):
+    """Forget a map that's gone, unless its id is in use again."""
+    e = registry.get(i)
+    if e is not None and e[0] is ref:
+        del registry[i]
+
+
 def get_data_lines(data, fun_key, space_per_level=2, fun_val=None):
     """
     Get text representation lines for a mapping's data.
 
+    :param Mapping data: collection of data for which to get repr lines
+    :param function(object, prefix) -> str fun_key: function to render key
+        as text
+    :param function(object, prefix) -> str fun_val: function to render value
+        as text
+    :param int space_per_level: number of spaces per level of nesting
+    :return list[str]: collection of lines
+    """
+    return list(iter_data_lines(data, fun_key, space_per_level, fun_val))
+
+
+def iter_data_lines(data, fun_key, space_per_level=2, fun_val=None):
+    """
+    Generate text representation lines for a mapping's data, one at a time.
+
+    Nested mappings are walked with an explicit stack of iterators, one per
+    level of nesting, so there's no limit on the size or depth of the data.
+
     :param Mapping data: collection of data for which to get repr lines
     :param function(object, prefix) -> str fun_key: function to render key
         as text
@@ -42,36 +242,21 @@ def get_data_lines(data, fun_key, space_per_level=2, fun_val=None):
     # If no specific value-render function, use key-render function
     fun_val = fun_val or fun_key
 
-    def space(lev):
-        return " " * lev * space_per_level
-
-    # Render a line; pass val=<obj> for a line with a value (i.e., not header)
-    def render(lev, key, **kwargs):
-        ktext = fun_key(key) + ":"
-        try:
-            val = kwargs["val"]
-        except KeyError:
-            return space(lev) + ktext
+    stack = [iter(data.items())]
+    while stack:
+        space = " " * (len(stack) - 1) * space_per_level
+        for k, v in stack[-1]:
+            ktext = space + fun_key(k) + ":"
+            if not isinstance(v, Mapping) or len(v) == 0:
+                # Line representing single key-value or empty mapping
+                yield "{} {}".format(ktext, "null" if v is None else fun_val(v, space))
+            else:
+                # Section header; section data follow at the next level.
+                yield ktext
+                stack.append(iter(v.items()))
+                break
         else:
-            return space(lev) + "{} {}".format(
-                ktext, "null" if val is None else fun_val(val, space(lev))
-            )
-
-    def go(kvs, curr_lev, acc):
-        try:
-            k, v = next(kvs)
-        except StopIteration:
-            return acc
-        if not isinstance(v, Mapping) or len(v) == 0:
-            # Add line representing single key-value or empty mapping
-            acc.append(render(curr_lev, k, val=v))
-        else:
-            # Add section header and section data.
-            acc.append(render(curr_lev, k))
-            acc.append("\n".join(go(iter(v.items()), curr_lev + 1, [])))
-        return go(kvs, curr_lev, acc)
-
-    return go(iter(data.items()), 0, [])
+            stack.pop()
 
 
 def get_logger(name):
@@ -0,0 +1,253 @@
+""" Opt-in counts and timings of attmap's hot code paths """
+
+import sys
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
+if sys.version_info < (3, 3):
+    from collections import Mapping
+else:
+    from collections.abc import Mapping
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+__all__ = ["disable_stats", "enable_stats", "reset_stats", "stats", "track_stats"]
+
+
+# Name of each instrumented method, by the name under which it's reported
+_METHODS = OrderedDict(
+    [
+        ("final_for_store", "_final_for_store"),
+        ("metamorph_maplike", "_metamorph_maplike"),
+        ("getattr", "__getattr__"),
+        ("add_entries", "add_entries"),
+        ("simplify_keyvalue", "_simplify_keyvalue"),
+    ]
+)
+# Name of each instrumented module-level function, by reported name
+_FUNCTIONS = OrderedDict(
+    [("safely_expand", "_safely_expand"), ("expandpath", "expandpath")]
+)
+# Counts beyond calls and seconds, by operation
+_EXTRA = {"getattr": "misses", "simplify_keyvalue": "nodes"}
+
+# Each operation's counts, by name
+_stats = OrderedDict()
+# Each replaced binding, as (owner, attribute name, original value)
+_patches = []
+# Depth of __getattr__ calls in progress, to count only the outermost
+_getattr_depth = [0]
+
+
+def enable_stats():
+    """
+    Start counting and timing attmap's hot operations.
+
+    Until stats are disabled, each of these is counted and timed: value
+    finalization for storage (_final_for_store), mapping conversion
+    (_metamorph_maplike), path expansion attempts (_safely_expand) and
+    actual expansions (expandpath), attribute fetches that fall through to
+    __getattr__, add_entries, and simplification (_simplify_keyvalue, behind
+    to_dict, to_map, repr and YAML). Fetches via __getattr__ of keys that
+    aren't stored, whether raising or echoed, are counted as misses, and
+    simplification counts the entries in each simplified result as nodes.
+    Seconds include time in nested instrumented calls.
+
+    The operations are instrumented by replacing them, in attmap's own
+    modules and classes, with counting wrappers, and disabling stats puts
+    the originals back, so there's no overhead while stats are disabled.
+    Wrappers add stack frames, so storing a map nested nearly as deep as the
+    recursion limit allows may exceed it while stats are enabled. Counts
+    aren't synchronized among threads.
+    """
+    if _patches:
+        return
+    wrappers = {}
+    for module in _attmap_modules():
+        for name, attr in _FUNCTIONS.items():
+            _wrap(module, attr, _timed, name, wrappers)
+        for cls in vars(module).values():
+            if isinstance(cls, type) and cls.__module__ == module.__name__:
+                for name, attr in _METHODS.items():
+                    _wrap(cls, attr, _WRAPPERS.get(name, _timed), name, wrappers)
+
+
+def disable_stats():
+    """Stop counting and timing, restoring the uninstrumented operations."""
+    while _patches:
+        owner, attr, original = _patches.pop()
+        setattr(owner, attr, original)
+
+
+def reset_stats():
+    """Set every count and timing to zero."""
+    _stats.clear()
+
+
+def stats():
+    """
+    Get a snapshot of the counts and timings.
+
+    :return dict[str, dict[str, int | float]]: for each operation, its
+        number of calls and total seconds, along with misses for getattr
+        and nodes for simplify_keyvalue
+    """
+    snapshot = {}
+    for name in list(_METHODS) + list(_FUNCTIONS):
+        counts = {"calls": 0, "seconds": 0.0}
+        if name in _EXTRA:
+            counts[_EXTRA[name]] = 0
+        counts.update(_stats.get(name, {}))
+        snapshot[name] = counts
+    return snapshot
+
+
+@contextmanager
+def track_stats():
+    """
+    Count and time operations within a block.
+
+    Stats are enabled for the block, and left as they were afterward. The
+    dict that's provided is filled, once the block exits, with the counts
+    and timings of the block alone, in the form given by stats().
+
+    :return dict[str, dict[str, int | float]]: counts and timings, filled
+        in when the block exits
+    """
+    was_enabled = bool(_patches)
+    enable_stats()
+    before = stats()
+    scope = {}
+    try:
+        yield scope
+    finally:
+        after = stats()
+        if not was_enabled:
+            disable_stats()
+        for name, counts in after.items():
+            scope[name] = {k: v - before[name][k] for k, v in counts.items()}
+
+
+def _attmap_modules():
+    """Get each loaded module of the attmap package."""
+    return [
+        m
+        for n, m in list(sys.modules.items())
+        if m is not None and (n == "attmap" or n.startswith("attmap."))
+    ]
+
+
+def _count(name, seconds, extra=0):
+    """Record a call, its duration, and any operation-specific count."""
+    try:
+        counts = _stats[name]
+    except KeyError:
+        counts = _stats[name] = {"calls": 0, "seconds": 0.0}
+        if name in _EXTRA:
+            counts[_EXTRA[name]] = 0
+    counts["calls"] += 1
+    counts["seconds"] += seconds
+    if extra:
+        counts[_EXTRA[name]] += extra
+
+
+def _counted_getattr(name, fun):
+    """Wrap a __getattr__ to count and time its outermost calls and misses."""
+
+    @wraps(fun)
+    def counted(self, item, *args, **kwargs):
+        if _getattr_depth[0]:
+            return fun(self, item, *args, **kwargs)
+        _getattr_depth[0] += 1
+        missed = True
+        start = time.perf_counter()
+        try:
+            res = fun(self, item, *args, **kwargs)
+            missed = not _stores(self, item)
+            return res
+        finally:
+            _getattr_depth[0] -= 1
+            _count(name, time.perf_counter() - start, int(missed))
+
+    return counted
+
+
+def _counted_simplify(name, fun):
+    """Wrap _simplify_keyvalue to count and time calls and nodes."""
+
+    @wraps(fun)
+    def counted(*args, **kwargs):
+        start = time.perf_counter()
+        res = fun(*args, **kwargs)
+        seconds = time.perf_counter() - start
+        _count(name, seconds, _size(res))
+        return res
+
+    return counted
+
+
+def _size(data):
+    """Count the entries in nested mappings, iteratively."""
+    total = 0
+    stack = [data]
+    while stack:
+        m = stack.pop()
+        total += len(m)
+        stack.extend(v for v in m.values() if isinstance(v, Mapping))
+    return total
+
+
+def _stores(m, key):
+    """Determine whether a map stores a key, without letting errors escape."""
+    try:
+        return key in m
+    except Exception:
+        return False
+
+
+def _timed(name, fun):
+    """Wrap a function to count and time its calls."""
+
+    @wraps(fun)
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fun(*args, **kwargs)
+        finally:
+            _count(name, time.perf_counter() - start)
+
+    return timed
+
+
+def _wrap(owner, attr, make_wrapper, name, wrappers):
+    """
+    Replace a class's or module's own binding with an instrumented one.
+
+    A function bound in several places gets the same wrapper in each, so
+    identity comparisons among the bindings still hold.
+
+    :param type | module owner: class or module that binds the attribute
+    :param str attr: name of the attribute
+    :param function(str, function) -> function make_wrapper: how to wrap
+    :param str name: name under which to report the function's stats
+    :param dict[function, function] wrappers: wrapper for each function
+        wrapped so far
+    """
+    try:
+        original = vars(owner)[attr]
+    except KeyError:
+        return
+    if not callable(original):
+        return
+    try:
+        wrapper = wrappers[original]
+    except KeyError:
+        wrapper = wrappers[original] = make_wrapper(name, original)
+    setattr(owner, attr, wrapper)
+    _patches.append((owner, attr, original))
+
+
+_WRAPPERS = {"getattr": _counted_getattr, "simplify_keyvalue": _counted_simplify}
@@ -3,8 +3,26 @@
 import sys
 from collections import OrderedDict
 
+if sys.version_info < (3, 3):
+    from collections import Mapping
+else:
+    from collections.abc import Mapping
+
+from ._att_map_like import AttMapLike
+from ._tracking import _DERIVED, changed, link
+from ._views import AttMapItemsView, AttMapKeysView, AttMapValuesView
 from .attmap import AttMap
-from .helpers import get_logger, safedel_message
+from .helpers import (
+    _SHARED_KEYS,
+    _SHARERS,
+    claim_shared,
+    copy,
+    get_logger,
+    held,
+    is_custom_map,
+    safedel_message,
+    unshare,
+)
 
 __author__ = "Vince Reuter"
 __email__ = "vreuter@virginia.edu"
@@ -16,12 +34,41 @@ _LOGGER = get_logger(__name__)
 _SUB_PY3 = sys.version_info.major < 3
 
 
+@copy
 class OrdAttMap(OrderedDict, AttMap):
     """Insertion-ordered mapping with dot notation access"""
 
-    def __init__(self, entries=None):
+    # Whether nested mappings are converted on first access rather than when stored
+    _lazy = False
+    # Instance attributes that hold state rather than data, so aren't keys
+    _INTERNAL = ("_lazy",)
+
+    def __init__(self, entries=None, lazy=False):
+        """
+        Create a new instance, optionally with initial key-value pairs.
+
+        :param Mapping | Iterable[(Hashable, object)] entries: initial
+            KV pairs to store
+        :param bool lazy: whether to store nested mappings as given, and
+            convert each to this type (lazily, too) only when it's first
+            fetched; conversions such as to_dict copy an unconverted
+            mapping into plain collections, without converting it. Until
+            then, the mapping is referenced rather than copied, so it
+            shouldn't be changed.
+        """
+        if lazy:
+            # Not map data, so bypass the storage of attributes as entries.
+            object.__setattr__(self, "_lazy", True)
         super(OrdAttMap, self).__init__(entries or {})
 
+    def __copy__(self):
+        cls = self.__class__
+        dup = cls.__new__(cls)
+        dup.__dict__.update(self.__dict__)
+        for k, v in OrderedDict.items(self):
+            OrderedDict.__setitem__(dup, k, v)
+        return dup
+
     def __setattr__(self, name, value):
         if not (self._is_od_member(name) or name.startswith("__")):
             self[name] = value
@@ -43,22 +90,53 @@ class OrdAttMap(OrderedDict, AttMap):
             according to the instance's finalization of retrieved values
         """
         try:
-            return super(OrdAttMap, self).__getitem__(item)
+            v = super(OrdAttMap, self).__getitem__(item)
         except KeyError:
+            if item in self._INTERNAL:
+                raise
             return AttMap.__getitem__(self, item)
+        if self._lazy and isinstance(v, Mapping) and not isinstance(v, AttMapLike):
+            # Stored unconverted, so convert now and keep the result.
+            v = self._lower_type_bound(v, lazy=True)
+            OrderedDict.__setitem__(self, item, v)
+            held(v, self, item)
+            if _DERIVED:
+                link(v, self)
+        elif _SHARED_KEYS and is_custom_map(v) and claim_shared(self, item):
+            # The original's, so take a private one before handing it out.
+            v = v.copy_on_write()
+            OrderedDict.__setitem__(self, item, v)
+            held(v, self, item)
+            if _DERIVED:
+                # What's derived from this map refers to the original's.
+                changed(self)
+                link(v, self)
+        return v
 
     def __setitem__(self, key, value, finalize=True):
         """Support hook for value transformation before storage."""
-        super(OrdAttMap, self).__setitem__(
-            key, self._final_for_store(key, value) if finalize else value
-        )
+        if _SHARERS:
+            unshare(self)
+        if _SHARED_KEYS:
+            claim_shared(self, key)
+        final = self._final_for_store(key, value) if finalize else value
+        super(OrdAttMap, self).__setitem__(key, final)
+        if is_custom_map(final):
+            held(final, self, key)
+        if _DERIVED:
+            changed(self)
 
     def __delitem__(self, key):
         """Make unmapped key deletion unexceptional."""
+        if _SHARERS:
+            unshare(self)
         try:
             super(OrdAttMap, self).__delitem__(key)
         except KeyError:
             _LOGGER.debug(safedel_message(key))
+        else:
+            if _DERIVED:
+                changed(self)
 
     def __eq__(self, other):
         """Leverage base AttMap eq check, and check key order."""
@@ -72,17 +150,23 @@ class OrdAttMap(OrderedDict, AttMap):
         return AttMap.__repr__(self)
 
     def __reversed__(self):
-        _LOGGER.warning("Reverse iteration as implemented may be inefficient")
-        return iter(reversed(list(self.keys())))
+        return super(OrdAttMap, self).__reversed__()
 
     def keys(self):
-        return [k for k in self]
+        return AttMapKeysView(self)
+
+    def move_to_end(self, key, last=True):
+        if _SHARERS:
+            unshare(self)
+        super(OrdAttMap, self).move_to_end(key, last)
+        if _DERIVED:
+            changed(self)
 
     def values(self):
-        return [self[k] for k in self]
+        return AttMapValuesView(self)
 
     def items(self):
-        return [(k, self[k]) for k in self]
+        return AttMapItemsView(self)
 
     def clear(self):
         raise NotImplementedError(
@@ -92,26 +176,69 @@ class OrdAttMap(OrderedDict, AttMap):
     __marker = object()
 
     def pop(self, key, default=__marker):
+        if _SHARERS:
+            unshare(self)
         try:
-            return super(OrdAttMap, self).pop(key)
+            v = super(OrdAttMap, self).pop(key)
         except KeyError:
             try:
+                if key in self._INTERNAL:
+                    raise
                 return self.__dict__.pop(key)
             except KeyError:
                 if default is self.__marker:
                     raise KeyError(key)
                 return default
+        if _DERIVED:
+            changed(self)
+        if _SHARED_KEYS and is_custom_map(v) and claim_shared(self, key):
+            v = v.copy_on_write()
+        return v
 
     def popitem(self, last=True):
         raise NotImplementedError(
             "popitem isn't supported on a {}".format(self.__class__.__name__)
         )
 
+    def _final_for_store(self, k, v):
+        if self._lazy and isinstance(v, Mapping) and not isinstance(v, AttMapLike):
+            # Converted when first fetched
+            return v
+        return super(OrdAttMap, self)._final_for_store(k, v)
+
+    @classmethod
+    def _from_parsed(cls, data):
+        if (
+            cls.__setitem__ is not OrdAttMap.__setitem__
+            or cls._final_for_store is not OrdAttMap._final_for_store
+        ):
+            return super(OrdAttMap, cls)._from_parsed(data)
+        # Every value is final already, so bypass finalization.
+        m = cls()
+        for k, v in data.items():
+            OrderedDict.__setitem__(m, k, v)
+        return m
+
+    def _get_for_eq(self, key):
+        if self._lazy:
+            # Convert, as for a fetch, to compare with a converted map.
+            return self._get_stored(key)
+        return OrderedDict.__getitem__(self, key)
+
     @staticmethod
     def _is_od_member(name):
         """Assess whether name appears to be a protected OrderedDict member."""
         return name.startswith("_OrderedDict")
 
+    def _raw(self, key):
+        return OrderedDict.get(self, key)
+
+    def _replace_raw(self, key, value):
+        OrderedDict.__setitem__(self, key, value)
+
+    def _stored_items(self):
+        return OrderedDict.items(self)
+
     def _new_empty_basic_map(self):
         """For ordered maps, OrderedDict is the basic building block."""
         return OrderedDict()
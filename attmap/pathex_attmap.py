@@ -1,6 +1,9 @@
 """ Canonical behavior for attmap in pepkit projects """
 
+import os
+import re
 import sys
+from collections import OrderedDict, namedtuple
 
 if sys.version_info < (3, 4):
     from collections import Mapping
@@ -9,21 +12,150 @@ else:
 
 from ubiquerg import expandpath
 
+from ._views import AttMapItemsView, AttMapValuesView
 from .ordattmap import OrdAttMap
 
 __author__ = "Vince Reuter"
 __email__ = "vreuter@virginia.edu"
 
 
-__all__ = ["PathExAttMap"]
+__all__ = ["CacheInfo", "ExpansionCache", "PathExAttMap", "expansion_cache"]
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# Environment variables that may determine the expansion of a leading ~
+_HOME_VARS = ("HOME", "USERPROFILE", "HOMEDRIVE", "HOMEPATH")
+# Names as os.path.expandvars reads them: \w is ASCII-only there.
+_VAR_NAME = re.compile(
+    r"\$(\w+)|\$\{([^}]*)\}" + (r"|%([^%]*)%" if os.name == "nt" else ""),
+    getattr(re, "ASCII", 0),
+)
+
+if os.name == "nt":
+
+    def _may_expand(text):
+        return text[:1] == "~" or "$" in text or "%" in text
+
+else:
+
+    def _may_expand(text):
+        return text[:1] == "~" or "$" in text
+
+
+def _env_getter(env):
+    """
+    Get a fast lookup of environment variable values, and its key encoder.
+
+    os.environ.get decodes and encodes on every call, which would cost more
+    than a cache hit saves, so look up in the environment's raw data when
+    it's available.
+
+    :param Mapping env: the environment, e.g. os.environ
+    :return (function(object) -> object, function(str) -> object): lookup
+        of raw variable value by encoded name, and encoder of variable name
+    """
+    try:
+        return env._data.get, env.encodekey
+    except AttributeError:
+        return env.get, str
+
+
+class ExpansionCache(object):
+    """
+    Bounded, least-recently-used cache of path expansions.
+
+    Each cached expansion records the values of the environment variables
+    on which it depends (those named in the text, and those that define the
+    home directory if the text starts with ~). A cached expansion is used
+    only while those values are unchanged, so changes to the environment
+    invalidate exactly the affected entries. Home directories that come from
+    the password database rather than the environment aren't tracked.
+    """
+
+    def __init__(self, maxsize=4096):
+        """
+        Create an empty cache.
+
+        :param int | NoneType maxsize: maximum number of cached expansions;
+            0 disables caching, and null means no bound
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._env = None
+        self._hits = 0
+        self._misses = 0
+
+    def expand(self, text):
+        """
+        Expand user and environment variables in text, as ubiquerg.expandpath.
+
+        :param str text: text to expand, e.g. a path
+        :return str: expanded text
+        """
+        if not _may_expand(text):
+            return text
+        env = os.environ
+        if env is not self._env:
+            # The environment object itself was replaced.
+            self._entries.clear()
+            self._env = env
+        getenv, encode = _env_getter(env)
+        entries = self._entries
+        try:
+            names, fingerprint, expanded = entries[text]
+        except KeyError:
+            pass
+        else:
+            if tuple(map(getenv, names)) == fingerprint:
+                self._hits += 1
+                try:
+                    entries.move_to_end(text)
+                except KeyError:
+                    pass
+                return expanded
+        self._misses += 1
+        names = [n for groups in _VAR_NAME.findall(text) for n in groups if n]
+        if text[:1] == "~":
+            names.extend(_HOME_VARS)
+        names = tuple(map(encode, names))
+        fingerprint = tuple(map(getenv, names))
+        expanded = expandpath(text)
+        if self.maxsize != 0:
+            entries[text] = (names, fingerprint, expanded)
+            while self.maxsize is not None and len(entries) > self.maxsize:
+                try:
+                    entries.popitem(last=False)
+                except KeyError:
+                    break
+        return expanded
+
+    def cache_info(self):
+        """
+        Report cache statistics.
+
+        :return CacheInfo: numbers of hits and misses, maximum size, and
+            current number of cached expansions
+        """
+        return CacheInfo(self._hits, self._misses, self.maxsize, len(self._entries))
+
+    def cache_clear(self):
+        """Empty the cache and reset its statistics."""
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+
+
+expansion_cache = ExpansionCache()
 
 
 class PathExAttMap(OrdAttMap):
-    """Used in pepkit projects, with Mapping conversion and path expansion"""
+    """
+    Used in pepkit projects, with Mapping conversion and path expansion
 
-    def __getattribute__(self, item, expand=True):
-        res = super(PathExAttMap, self).__getattribute__(item)
-        return _safely_expand(res) if expand else res
+    Expansion applies to stored values, when they're fetched by key or by
+    attribute; ordinary attributes such as methods resolve as usual.
+    """
 
     def __getattr__(self, item, default=None, expand=True):
         """
@@ -67,21 +199,31 @@ class PathExAttMap(OrdAttMap):
 
     def items(self, expand=False, to_dict=False):
         """
-        Produce list of key-value pairs, optionally expanding paths.
+        Produce live view of key-value pairs, optionally expanding paths.
+
+        Expansion happens per pair, as each is consumed from the view.
 
         :param bool expand: whether to expand paths
-        :return Iterable[object]: stored key-value pairs, optionally expanded
+        :param bool to_dict: whether to convert expanded mapping values to dict
+        :return ItemsView: stored key-value pairs, optionally expanded
         """
-        return [(k, self.__getitem__(k, expand, to_dict)) for k in self]
+        getitem = self.__getitem__
+        return AttMapItemsView(self, lambda k: getitem(k, expand, to_dict))
 
     def values(self, expand=False):
         """
-        Produce list of values, optionally expanding paths.
+        Produce live view of values, optionally expanding paths.
+
+        Expansion happens per value, as each is consumed from the view.
 
         :param bool expand: whether to expand paths
-        :return Iterable[object]: stored values, optionally expanded
+        :return ValuesView: stored values, optionally expanded
         """
-        return [self.__getitem__(k, expand) for k in self]
+        getitem = self.__getitem__
+        return AttMapValuesView(self, lambda k: getitem(k, expand))
+
+    def _get_stored(self, key):
+        return self.__getitem__(key, expand=False)
 
     def _data_for_repr(self, expand=False):
         """
@@ -93,7 +235,7 @@ class PathExAttMap(OrdAttMap):
         """
         return filter(
             lambda kv: not self._excl_from_repr(kv[0], self.__class__),
-            self.items(expand),
+            self._expanded_items() if expand else self._stored_items(),
         )
 
     def to_map(self, expand=False):
@@ -102,24 +244,57 @@ class PathExAttMap(OrdAttMap):
 
         :return dict[str, object]: this map's data, in a simpler container
         """
-        return self._simplify_keyvalue(self.items(expand), self._new_empty_basic_map)
+        return self._simplify_keyvalue(
+            self._expanded_items() if expand else self._stored_items(),
+            self._new_empty_basic_map,
+        )
 
     def to_dict(self, expand=False):
         """
         Return a builtin dict representation of this instance.
 
+        :param bool expand: whether to expand paths, at any depth
         :return dict: builtin dict representation of this instance
         """
-        return self._simplify_keyvalue(self.items(expand, to_dict=True), dict)
+        return self._simplify_keyvalue(
+            self._stored_items(), dict, leaf=_expanded_value if expand else None
+        )
+
+    def _expanded_items(self):
+        """
+        Get the stored key-value pairs, with each value expanded as on fetch.
+
+        Nested maps are given as stored, so rendering or converting a copy
+        doesn't take the copy's own nested maps.
+
+        :return Iterable[(hashable, object)]: key-value pairs, with paths
+            expanded
+        """
+        return ((k, _expanded_value(self, k, v)) for k, v in self._stored_items())
 
     @property
     def _lower_type_bound(self):
         return PathExAttMap
 
 
+def _expanded_value(m, k, v):
+    """
+    Expand a stored value as a fetch from the map that holds it would.
+
+    :param Mapping m: map that holds the value
+    :param hashable k: key of the value
+    :param object v: the value, as stored
+    :return object: the expanded value
+    """
+    if isinstance(v, str) and isinstance(m, PathExAttMap):
+        # The map may expand in its own way, e.g. once, when it's stored.
+        return m.__getitem__(k)
+    return _safely_expand(v)
+
+
 def _safely_expand(x, to_dict=False):
     if isinstance(x, str):
-        return expandpath(x)
+        return expansion_cache.expand(x)
     if to_dict and isinstance(x, Mapping):
         return {k: _safely_expand(v, to_dict) for k, v in x.items()}
     return x
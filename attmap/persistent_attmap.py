@@ -0,0 +1,213 @@
+""" Immutable map whose updated versions share structure with the original """
+
+from operator import itemgetter
+
+from ._att_map_like import AttMapLike
+from ._hamt import assoc, dissoc, iter_entries, khash, lookup
+from .attmap import AttMap
+from .frozen_attmap import _frozen_value, _FrozenMapMixin
+from .helpers import get_logger, safedel_message
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+__all__ = ["PersistentAttMap"]
+
+
+_LOGGER = get_logger(__name__)
+_SEQ = itemgetter(2)
+
+
+class PersistentAttMap(_FrozenMapMixin, AttMapLike):
+    """
+    Immutable, hashable map with updates that give new versions.
+
+    The data are held in a hash array mapped trie, so set() and delete()
+    return a new map in time logarithmic in the map's size, sharing all
+    untouched structure, including nested maps, with the original. Keeping
+    every version of a map therefore costs only what changed between
+    versions. Keys iterate in insertion order.
+    """
+
+    __slots__ = ("_memo", "_root", "_size", "_next", "__weakref__")
+
+    def __init__(self, entries=None):
+        object.__setattr__(self, "_root", None)
+        object.__setattr__(self, "_size", 0)
+        object.__setattr__(self, "_next", 0)
+        super(PersistentAttMap, self).__init__(entries)
+
+    def __contains__(self, key):
+        try:
+            lookup(self._root, key, khash(key))
+        except KeyError:
+            return False
+        return True
+
+    def __delitem__(self, key):
+        if self._memo is not None:
+            self._immutable()
+        self._evolve(key, delete=True, into=self)
+
+    def __getitem__(self, item):
+        return lookup(self._root, item, khash(item))[3]
+
+    def __iter__(self):
+        for e in sorted(iter_entries(self._root), key=_SEQ):
+            yield e[0]
+
+    def __len__(self):
+        return self._size
+
+    def __setitem__(self, key, value):
+        if self._memo is not None:
+            self._immutable()
+        self._evolve(key, self._final_for_store(key, value), into=self)
+
+    def delete(self, path):
+        """
+        Get a version of this map without the value at the given path.
+
+        :param str | list | tuple | hashable path: key, dotted path of text
+            keys (e.g., "a.b"), or list or tuple of keys, from this map to
+            the value
+        :return PersistentAttMap: new version of this map, or this map if
+            there's nothing at the path
+        """
+        keys = _split_path(path)
+        maps = self._maps_along(keys[:-1], create=False)
+        if maps is None or keys[-1] not in maps[-1]:
+            _LOGGER.debug(safedel_message(path))
+            return self
+        new = maps[-1]._evolve(keys[-1], delete=True)
+        return self._rebuild(maps, keys, new)
+
+    def set(self, path, value):
+        """
+        Get a version of this map with a value set at the given path.
+
+        Maps along the path are created as needed.
+
+        :param str | list | tuple | hashable path: key, dotted path of text
+            keys (e.g., "a.b"), or list or tuple of keys, from this map to
+            the value
+        :param object value: value to set; a Mapping is converted to this type
+        :return PersistentAttMap: new version of this map
+        :raise TypeError: if a value along the path isn't a map
+        """
+        keys = _split_path(path)
+        maps = self._maps_along(keys[:-1], create=True)
+        last = maps[-1]
+        new = last._evolve(keys[-1], last._final_for_store(keys[-1], value))
+        return self._rebuild(maps, keys, new)
+
+    def _evolve(self, key, value=None, delete=False, into=None):
+        """
+        Make a version of this map with one key's value set or removed.
+
+        :param hashable key: key to set or remove
+        :param object value: value to set, already finalized for storage
+        :param bool delete: whether to remove the key rather than set it
+        :param PersistentAttMap into: instance to update, rather than a new one
+        :return PersistentAttMap: the updated version
+        """
+        h = khash(key)
+        root, size, seq = self._root, self._size, self._next
+        try:
+            old = lookup(root, key, h)
+        except KeyError:
+            if delete:
+                _LOGGER.debug(safedel_message(key))
+                return self
+            root = assoc(root, (key, h, seq, value))
+            size, seq = size + 1, seq + 1
+        else:
+            if delete:
+                root = dissoc(root, key, h)
+                size -= 1
+            else:
+                # Replacement keeps the key's place in the order.
+                root = assoc(root, (key, h, old[2], value))
+        if into is None:
+            into = self.__class__.__new__(self.__class__)
+            object.__setattr__(into, "_memo", {})
+        object.__setattr__(into, "_root", root)
+        object.__setattr__(into, "_size", size)
+        object.__setattr__(into, "_next", seq)
+        return into
+
+    def _maps_along(self, keys, create):
+        """
+        Find the maps along a path, starting from this one.
+
+        :param Sequence[hashable] keys: path of keys from this map
+        :param bool create: whether to use an empty map for a missing key
+        :return list[PersistentAttMap]: this map and the map at each key,
+            or null if a key's missing and not to be created
+        :raise TypeError: if a value along the path isn't a map
+        """
+        maps = [self]
+        for k in keys:
+            try:
+                m = maps[-1][k]
+            except KeyError:
+                if not create:
+                    return None
+                m = self._lower_type_bound()
+            if not isinstance(m, PersistentAttMap):
+                raise TypeError(
+                    "Value at {} isn't a map: {}".format(k, type(m).__name__)
+                )
+            maps.append(m)
+        return maps
+
+    def _final_for_store(self, k, v):
+        # Frozen, as in the other immutable maps, so that versions can't change.
+        return _frozen_value(AttMap._final_for_store(self, k, v))
+
+    @staticmethod
+    def _rebuild(maps, keys, new):
+        """
+        Replace each map along a path with its new version, deepest first.
+
+        :param list[PersistentAttMap] maps: the maps along the path
+        :param Sequence[hashable] keys: the path's keys
+        :param PersistentAttMap new: new version of the deepest map
+        :return PersistentAttMap: new version of the first map
+        """
+        for m, k in zip(reversed(maps[:-1]), reversed(keys[:-1])):
+            new = m._evolve(k, new)
+        return new
+
+    __eq__ = AttMap.__eq__
+    __ne__ = AttMap.__ne__
+    # Defining equality here would otherwise unset the inherited hash.
+    __hash__ = _FrozenMapMixin.__hash__
+    _cmp = staticmethod(AttMap._cmp)
+    _metamorph_maplike = AttMap._metamorph_maplike
+    _new_empty_basic_map = AttMap._new_empty_basic_map
+    _repr_pretty_ = AttMap._repr_pretty_
+
+    @property
+    def _lower_type_bound(self):
+        return PersistentAttMap
+
+
+def _split_path(path):
+    """
+    Get the keys in a path.
+
+    :param str | list | tuple | hashable path: key, dotted path of text
+        keys, or list or tuple of keys
+    :return list[hashable]: the path's keys
+    :raise ValueError: if the path is empty
+    """
+    if isinstance(path, str):
+        keys = path.split(".")
+    elif isinstance(path, (list, tuple)):
+        keys = list(path)
+    else:
+        keys = [path]
+    if not keys:
+        raise ValueError("Empty path")
+    return keys
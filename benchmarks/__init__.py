@@ -0,0 +1 @@
+""" Create benchmarks package, so benchmarks can run as modules from the repository root """
@@ -0,0 +1,66 @@
+""" Memory benchmark of many small records in each map type
+
+Builds a large collection of flat records with the same keys, once per
+container type, and reports the memory allocated per record as measured
+by tracemalloc. The records' values are shared among the collections, so
+the figures reflect the containers' own overhead.
+
+Run from the repository root with: python -m benchmarks.compact_memory
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from attmap import AttMap, CompactAttMap, OrdAttMap
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+CONTAINERS = {
+    "dict": dict,
+    "AttMap": AttMap,
+    "OrdAttMap": OrdAttMap,
+    "CompactAttMap": CompactAttMap,
+}
+
+
+def build_rows(count, width):
+    """Create the key-value pairs for each record, with shared values."""
+    keys = ["field{}".format(i) for i in range(width)]
+    values = list(range(width))
+    return [list(zip(keys, values)) for _ in range(count)]
+
+
+def measure(build, rows):
+    """Get bytes allocated, per record, to build a record from each row."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        records = [build(r) for r in rows]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before) / float(len(records))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--count", type=int, default=100000, help="Records")
+    parser.add_argument("--width", type=int, default=10, help="Keys per record")
+    args = parser.parse_args()
+    rows = build_rows(args.count, args.width)
+    print("{:<16}{:>16}{:>12}".format("container", "bytes/record", "vs. dict"))
+    baseline = None
+    for name, build in CONTAINERS.items():
+        per_record = measure(build, rows)
+        baseline = baseline or per_record
+        print(
+            "{:<16}{:>16.1f}{:>11.2f}x".format(name, per_record, per_record / baseline)
+        )
+
+
+if __name__ == "__main__":
+    main()
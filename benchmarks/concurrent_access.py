@@ -0,0 +1,136 @@
+""" Stress and throughput benchmark of maps shared among threads
+
+Shares a project-style config, with many samples, among a number of worker
+threads. Each operation reads a random sample whole (to_dict) or, at the
+given rate, updates a pair of its attributes with add_entries. Two setups
+are compared: an OrdAttMap behind one lock that serializes every access,
+and a ConcurrentAttMap, whose readers don't block each other and whose
+writers lock just the sample written to. Every read checks that the pair
+of attributes agrees, so a torn (partly applied) update would be counted.
+A ConcurrentAttMap sample is read in a reading() block, through its parent,
+as a caller wanting consistent reads would, so those reads take turns with
+each other, though not with the updates; if the threads deadlock, the run
+stops and reports it.
+
+The threads share one interpreter, so where there's a global interpreter
+lock, throughput can't exceed that of a single thread; the gain from
+finer locking is in not waiting on a lock held by a thread that's
+preempted, and in full parallelism on a free-threaded build.
+
+Run from the repository root with: python -m benchmarks.concurrent_access
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+
+from attmap import ConcurrentAttMap, OrdAttMap
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+def build_data(samples, attributes):
+    """Create a config with the given numbers of samples and attributes."""
+    return {
+        "samples": {
+            "sample{}".format(i): dict(
+                {"attr{}".format(j): j for j in range(attributes)}, a=0, b=0
+            )
+            for i in range(samples)
+        }
+    }
+
+
+def run(m, lock, threads, ops, write_rate, seed=0, timeout=60):
+    """
+    Time a number of threads performing operations on a shared map.
+
+    :param attmap.AttMapLike m: map to share
+    :param lock: context manager to hold for each operation, or null
+    :param int threads: number of worker threads
+    :param int ops: number of operations per thread
+    :param float write_rate: fraction of operations that are updates
+    :param int seed: seed for each thread's random choices
+    :param float timeout: seconds to wait for the threads to finish
+    :return (float, int): operations per second, over all threads, and the
+        number of reads that saw an update partly applied
+    :raise RuntimeError: if the threads don't finish in time
+    """
+    names = list(m["samples"].keys())
+    torn = []
+    start_line = threading.Barrier(threads + 1)
+
+    def work(i):
+        rng = random.Random(seed + i)
+        samples = m["samples"]
+        bad = 0
+        start_line.wait()
+        for n in range(ops):
+            name = rng.choice(names)
+            if rng.random() < write_rate:
+                update = {name: {"a": n, "b": n}}
+                if lock is None:
+                    samples.add_entries(update)
+                else:
+                    with lock:
+                        samples.add_entries(update)
+            else:
+                if lock is None:
+                    with samples[name].reading():
+                        d = samples[name].to_dict()
+                else:
+                    with lock:
+                        d = samples[name].to_dict()
+                bad += d["a"] != d["b"]
+        torn.append(bad)
+
+    workers = [
+        threading.Thread(target=work, args=(i,), daemon=True) for i in range(threads)
+    ]
+    for w in workers:
+        w.start()
+    start_line.wait()
+    start = time.perf_counter()
+    for w in workers:
+        w.join(max(0, start + timeout - time.perf_counter()))
+        if w.is_alive():
+            raise RuntimeError("Threads deadlocked or timed out")
+    return threads * ops / (time.perf_counter() - start), sum(torn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--samples", type=int, default=200, help="Samples")
+    parser.add_argument("--attributes", type=int, default=20, help="Per sample")
+    parser.add_argument(
+        "--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="Thread counts"
+    )
+    parser.add_argument("--ops", type=int, default=5000, help="Per thread")
+    parser.add_argument(
+        "--write-rate", type=float, default=0.05, help="Fraction of updates"
+    )
+    args = parser.parse_args()
+    data = build_data(args.samples, args.attributes)
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("Global interpreter lock: {}".format("enabled" if gil else "disabled"))
+    print("{:<20}{:>9}{:>14}{:>8}".format("setup", "threads", "ops/s", "torn"))
+    setups = [
+        ("global lock", lambda: (OrdAttMap(data), threading.Lock())),
+        ("ConcurrentAttMap", lambda: (ConcurrentAttMap(data), None)),
+    ]
+    for name, setup in setups:
+        for threads in args.threads:
+            m, lock = setup()
+            try:
+                rate, torn = run(m, lock, threads, args.ops, args.write_rate)
+            except RuntimeError as e:
+                print("{:<20}{:>9}  {}".format(name, threads, e))
+                sys.exit(1)
+            print("{:<20}{:>9}{:>14.0f}{:>8}".format(name, threads, rate, torn))
+
+
+if __name__ == "__main__":
+    main()
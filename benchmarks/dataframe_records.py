@@ -0,0 +1,62 @@
+""" Benchmark of building a map per row of a sample table
+
+Compares adding each row (a pandas Series) to a new map, as in
+map.add_entries(row), against building every record at once, column by
+column, with from_dataframe.
+
+Run from the repository root with: python -m benchmarks.dataframe_records
+"""
+
+import argparse
+import timeit
+
+import pandas as pd
+
+from attmap import AttMap, OrdAttMap, PathExAttMap
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+MAP_TYPES = [AttMap, OrdAttMap, PathExAttMap]
+
+
+def build_table(rows):
+    """Create a sample table with text, path and numeric columns."""
+    return pd.DataFrame(
+        {
+            "sample_name": ["sample{}".format(i) for i in range(rows)],
+            "protocol": ["RNA-seq"] * rows,
+            "data_source": ["$HOME/data/{}.fastq".format(i % 10) for i in range(rows)],
+            "read_length": list(range(rows)),
+        }
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=20000, help="Table rows")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of trials")
+    args = parser.parse_args()
+    df = build_table(args.rows)
+    print(
+        "{:<16}{:>14}{:>14}{:>10}".format(
+            "type", "per-row (ms)", "bulk (ms)", "speedup"
+        )
+    )
+    for cls in MAP_TYPES:
+        times = []
+        for build in [
+            lambda: [cls().add_entries(row) for _, row in df.iterrows()],
+            lambda: cls.from_dataframe(df),
+        ]:
+            times.append(1000 * min(timeit.repeat(build, number=1, repeat=args.repeat)))
+        print(
+            "{:<16}{:>14.1f}{:>14.1f}{:>9.2f}x".format(
+                cls.__name__, times[0], times[1], times[0] / times[1]
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
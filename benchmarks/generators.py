@@ -0,0 +1,53 @@
+""" Synthetic data for benchmarks, in shapes that stress different code paths """
+
+from collections import OrderedDict
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+__all__ = ["SHAPES", "deep", "path_heavy", "wide"]
+
+
+def wide(size):
+    """
+    Create flat data with many keys, of mixed value types.
+
+    :param int size: number of keys
+    :return dict: the data
+    """
+    data = {}
+    for i in range(size):
+        k = "key{}".format(i)
+        data[k] = [i, str(i), float(i), None][i % 4]
+    return data
+
+
+def deep(size):
+    """
+    Create narrow data, nested many levels down.
+
+    :param int size: number of levels of nesting
+    :return dict: the data
+    """
+    data = {"leaf": 0, "text": "value"}
+    for i in range(size):
+        data = {"level{}".format(i): data, "n{}".format(i): i}
+    return data
+
+
+def path_heavy(size):
+    """
+    Create data whose values are mostly paths with variables to expand.
+
+    :param int size: number of keys
+    :return dict: the data
+    """
+    data = {"path{}".format(i): "$HOME/data/{}/file.txt".format(i) for i in range(size)}
+    data["outputs"] = {"out{}".format(i): "~/results/{}".format(i) for i in range(size)}
+    return data
+
+
+# Name of each shape, mapped to its generator and default size
+SHAPES = OrderedDict(
+    [("wide", (wide, 500)), ("deep", (deep, 50)), ("path_heavy", (path_heavy, 200))]
+)
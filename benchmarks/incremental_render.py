@@ -0,0 +1,92 @@
+""" Benchmark of re-rendering a large config after a small update
+
+Stores a project-style config, with many samples of many attributes, in a
+map of each ordered and unordered type, and times to_yaml and to_dict after
+one sample's attribute is updated, first without the render cache, and then
+with it enabled (see attmap.enable_render_cache): on a fresh map, again on
+the unchanged map, and after the update, when only that sample's map is
+rendered again.
+
+Run from the repository root with: python -m benchmarks.incremental_render
+"""
+
+import argparse
+import itertools
+import timeit
+
+from attmap import AttMap, PathExAttMap, disable_render_cache, enable_render_cache
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+def build_data(samples, attributes):
+    """Create a config with the given numbers of samples and attributes."""
+    return {
+        "name": "project",
+        "samples": {
+            "sample{}".format(i): {
+                "attr{}".format(j): "$HOME/{}/{}".format(i, j)
+                for j in range(attributes)
+            }
+            for i in range(samples)
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--samples", type=int, default=2000, help="Samples")
+    parser.add_argument("--attributes", type=int, default=20, help="Per sample")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of trials")
+    args = parser.parse_args()
+    data = build_data(args.samples, args.attributes)
+
+    print(
+        "{:<14}{:<10}{:>15}{:>12}{:>16}{:>16}".format(
+            "type",
+            "op",
+            "uncached (ms)",
+            "fresh (ms)",
+            "unchanged (ms)",
+            "updated (ms)",
+        )
+    )
+    for cls, op in itertools.product([AttMap, PathExAttMap], ["to_yaml", "to_dict"]):
+        counter = itertools.count()
+
+        def update(m):
+            m["samples"]["sample0"]["attr0"] = next(counter)
+            getattr(m, op)()
+
+        disable_render_cache()
+        m = cls(data)
+        uncached = min(timeit.repeat(lambda: update(m), number=1, repeat=args.repeat))
+        enable_render_cache()
+        # The time for a fresh map excludes its construction.
+        fresh = min(
+            timeit.repeat(
+                lambda: getattr(cls(data), op)(), number=1, repeat=args.repeat
+            )
+        ) - min(timeit.repeat(lambda: cls(data), number=1, repeat=args.repeat))
+        m = cls(data)
+        convert = getattr(m, op)
+        convert()
+        unchanged = min(timeit.repeat(convert, number=1, repeat=args.repeat))
+        updated = min(timeit.repeat(lambda: update(m), number=1, repeat=args.repeat))
+        del m, convert
+        disable_render_cache()
+        print(
+            "{:<14}{:<10}{:>15.2f}{:>12.2f}{:>16.2f}{:>16.2f}".format(
+                cls.__name__,
+                op,
+                1000 * uncached,
+                1000 * fresh,
+                1000 * unchanged,
+                1000 * updated,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+""" Benchmark of loading a large nested mapping, eagerly and lazily
+
+Stores a wide, nested dict (as parsed from a large YAML config) in a
+PathExAttMap with and without lazy conversion of nested mappings, and times
+construction, access to a single deep value, and conversion back to dict.
+
+Run from the repository root with: python -m benchmarks.lazy_load
+"""
+
+import argparse
+import timeit
+
+from attmap import PathExAttMap
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+def build_data(width, depth):
+    """Create nested data, with the given number of keys at each level."""
+    data = {"v{}".format(i): "$HOME/{}".format(i) for i in range(width)}
+    for _ in range(depth):
+        data = {"k{}".format(i): dict(data) for i in range(width)}
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--width", type=int, default=20, help="Keys per level")
+    parser.add_argument("--depth", type=int, default=3, help="Levels of nesting")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of trials")
+    args = parser.parse_args()
+    data = build_data(args.width, args.depth)
+    path = ["k0"] * args.depth + ["v0"]
+
+    def fetch(m):
+        for k in path:
+            m = m[k]
+        return m
+
+    print(
+        "{:<10}{:>14}{:>14}{:>14}".format(
+            "mode", "build (ms)", "fetch (ms)", "to_dict (ms)"
+        )
+    )
+    for name, lazy in [("eager", False), ("lazy", True)]:
+        times = []
+        for op in [
+            lambda: PathExAttMap(data, lazy=lazy),
+            lambda: fetch(PathExAttMap(data, lazy=lazy)),
+            lambda: PathExAttMap(data, lazy=lazy).to_dict(),
+        ]:
+            times.append(1000 * min(timeit.repeat(op, number=1, repeat=args.repeat)))
+        # Fetch and conversion times include the build.
+        print(
+            "{:<10}{:>14.2f}{:>14.2f}{:>14.2f}".format(
+                name, times[0], times[1] - times[0], times[2] - times[0]
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
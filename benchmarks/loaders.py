@@ -0,0 +1,88 @@
+""" Benchmark of loading maps from JSON and YAML files
+
+Compares building a map directly in the parser (from_json / from_yaml)
+against parsing to plain dicts and then wrapping the result in a map, for a
+generated nested config written to temporary files. Both approaches use the
+same YAML loader, which is PyYAML's C-based one if available.
+
+Run from the repository root with: python -m benchmarks.loaders
+"""
+
+import argparse
+import copy
+import json
+import os
+import shutil
+import tempfile
+import timeit
+
+import yaml
+
+from attmap import AttMap, OrdAttMap, PathExAttMap
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+MAP_TYPES = [AttMap, OrdAttMap, PathExAttMap]
+LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def build_data(width, depth):
+    """Create nested config data, with the given number of keys per level."""
+    data = {"path{}".format(i): "$HOME/data/{}".format(i) for i in range(width)}
+    data["flags"] = [True, False, None]
+    for _ in range(depth):
+        # Distinct copies, so that YAML text has no aliases
+        data = {"section{}".format(i): copy.deepcopy(data) for i in range(width)}
+    return data
+
+
+def load_then_wrap(cls, fmt, path):
+    with open(path, "r") as f:
+        data = json.load(f) if fmt == "json" else yaml.load(f, Loader=LOADER)
+    return cls(data)
+
+
+def load_directly(cls, fmt, path):
+    return cls.from_json(path) if fmt == "json" else cls.from_yaml(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--width", type=int, default=12, help="Keys per level")
+    parser.add_argument("--depth", type=int, default=3, help="Levels of nesting")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of trials")
+    args = parser.parse_args()
+    data = build_data(args.width, args.depth)
+    folder = tempfile.mkdtemp()
+    try:
+        paths = {}
+        for fmt, dump in [("json", json.dump), ("yaml", yaml.safe_dump)]:
+            paths[fmt] = os.path.join(folder, "config." + fmt)
+            with open(paths[fmt], "w") as f:
+                dump(data, f)
+        print(
+            "{:<8}{:<16}{:>16}{:>14}{:>10}".format(
+                "format", "type", "wrap (ms)", "direct (ms)", "speedup"
+            )
+        )
+        for fmt, path in paths.items():
+            for cls in MAP_TYPES:
+                times = []
+                for load in [load_then_wrap, load_directly]:
+                    trials = timeit.repeat(
+                        lambda: load(cls, fmt, path), number=1, repeat=args.repeat
+                    )
+                    times.append(1000 * min(trials))
+                print(
+                    "{:<8}{:<16}{:>16.1f}{:>14.1f}{:>9.2f}x".format(
+                        fmt, cls.__name__, times[0], times[1], times[0] / times[1]
+                    )
+                )
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+""" Memory benchmark of each map type, as measured by tracemalloc
+
+Reports, for each map type:
+- bytes per key: the growth in retained size per key of a flat map
+- bytes per level: the growth in retained size per level of a nested map,
+  with one key per level
+- for each data shape (see benchmarks.generators), the size retained by a
+  map of the data after garbage collection, and the peak allocation during
+  to_dict, to_yaml and copy
+
+Per-key and per-level figures are the difference between two sizes of map
+divided by the difference in keys or levels, so they exclude fixed costs.
+Values are shared among maps, so sizes reflect the containers themselves.
+Each operation runs once before it's measured, so one-time costs such as
+imports and caches are left out; for a type that memoizes its conversions,
+such as PersistentAttMap, the peaks are those of a memo hit. As for the timing suite, results can be
+saved as a baseline and compared with a later run; the comparison exits
+with status 1 if any measurement grew by more than the threshold.
+
+Run from the repository root with: python -m benchmarks.memory
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import tracemalloc
+from collections import OrderedDict
+
+from attmap import (
+    AttMap,
+    CompactAttMap,
+    EchoAttMap,
+    OrdAttMap,
+    PathExAttMap,
+    PersistentAttMap,
+    __version__,
+)
+
+from .generators import SHAPES
+from .suite import compare
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+MAP_TYPES = OrderedDict(
+    (t.__name__, t)
+    for t in [
+        AttMap,
+        OrdAttMap,
+        PathExAttMap,
+        EchoAttMap,
+        CompactAttMap,
+        PersistentAttMap,
+    ]
+)
+
+# Operations for which to measure peak allocation
+OPERATIONS = OrderedDict(
+    [
+        ("to_dict", lambda m: m.to_dict()),
+        ("to_yaml", lambda m: m.to_yaml()),
+        ("copy", lambda m: m.copy()),
+    ]
+)
+
+# Numbers of keys, and of levels, between which to measure growth; storing
+# a nested map is recursive, so the levels stay within the recursion limit.
+KEYS = (100, 1000)
+LEVELS = (10, 100)
+
+
+def retained(build):
+    """
+    Get the bytes still allocated for an object after garbage collection.
+
+    :param function build: function that creates the object
+    :return int: bytes allocated while creating the object and still held
+    """
+    build()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        obj = build()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del obj
+    return after - before
+
+
+def peak(fun):
+    """
+    Get the peak bytes allocated while a function runs.
+
+    :param function fun: function to run, taking no arguments
+    :return int: peak bytes allocated during the call, including its result
+    """
+    fun()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        fun()
+        highest = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return highest - before
+
+
+def flat_data(size):
+    """Create a flat mapping, with values shared by every key."""
+    return {"key{}".format(i): None for i in range(size)}
+
+
+def nested_data(levels):
+    """Create a mapping nested to the given depth, one key per level."""
+    data = {"leaf": None}
+    for _ in range(levels):
+        data = {"level": data}
+    return data
+
+
+def growth(cls, make_data, sizes):
+    """Get the growth in a map's retained size per unit of its data."""
+    small, large = make_data(sizes[0]), make_data(sizes[1])
+    diff = retained(lambda: cls(large)) - retained(lambda: cls(small))
+    return diff / float(sizes[1] - sizes[0])
+
+
+def run(types=None, shapes=None):
+    """
+    Measure the memory use of each map type.
+
+    :param Iterable[str] types: names of map types; all if null
+    :param Iterable[str] shapes: names of data shapes; all if null
+    :return OrderedDict[str, float]: bytes for each measurement, named as
+        type/measure or type/shape/measure
+    """
+    results = OrderedDict()
+    for type_name in types or MAP_TYPES:
+        cls = MAP_TYPES[type_name]
+        results[type_name + "/bytes_per_key"] = growth(cls, flat_data, KEYS)
+        results[type_name + "/bytes_per_level"] = growth(cls, nested_data, LEVELS)
+        for shape in shapes or SHAPES:
+            build, size = SHAPES[shape]
+            data = build(size)
+            name = "/".join([type_name, shape, ""])
+            results[name + "retained"] = retained(lambda: cls(data))
+            m = cls(data)
+            for op_name, op in OPERATIONS.items():
+                results[name + op_name + "_peak"] = peak(lambda: op(m))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--types", nargs="+", choices=list(MAP_TYPES))
+    parser.add_argument("--shapes", nargs="+", choices=list(SHAPES))
+    parser.add_argument("--save", help="Path to which to write results as JSON")
+    parser.add_argument("--compare", help="Path to saved baseline results")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Relative change to flag"
+    )
+    args = parser.parse_args()
+    results = run(args.types, args.shapes)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {
+                    "attmap": __version__,
+                    "python": platform.python_version(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+    if not args.compare:
+        print("{:<44}{:>14}".format("measure", "bytes"))
+        for name, size in results.items():
+            print("{:<44}{:>14.1f}".format(name, size))
+        return
+    with open(args.compare, "r") as f:
+        baseline = json.load(f)
+    print(
+        "Baseline: attmap {}, Python {}".format(baseline["attmap"], baseline["python"])
+    )
+    print(
+        "{:<44}{:>14}{:>14}{:>9}  {}".format(
+            "measure", "base", "now", "ratio", "status"
+        )
+    )
+    rows = compare(baseline["results"], results, args.threshold, ("larger", "smaller"))
+    for name, base, curr, ratio, status in rows:
+        print(
+            "{:<44}{:>14.1f}{:>14.1f}{:>9.2f}  {}".format(
+                name, base, curr, ratio, status
+            )
+        )
+    if any(r[-1] == "larger" for r in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
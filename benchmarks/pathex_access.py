@@ -0,0 +1,76 @@
+""" Micro-benchmark of PathExAttMap attribute resolution
+
+PathExAttMap used to override __getattribute__ to attempt path expansion of
+every attribute it resolved, including methods and internal attributes.
+This compares the current class against a replica of that override, for
+operations dominated by internal attribute lookups.
+
+Run from the repository root with: python -m benchmarks.pathex_access
+"""
+
+import argparse
+import timeit
+
+from attmap import PathExAttMap
+from attmap.pathex_attmap import _safely_expand
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+class LegacyPathExAttMap(PathExAttMap):
+    """PathExAttMap with expansion attempted on every attribute lookup"""
+
+    def __getattribute__(self, item, expand=True):
+        res = super(LegacyPathExAttMap, self).__getattribute__(item)
+        return _safely_expand(res) if expand else res
+
+    @property
+    def _lower_type_bound(self):
+        return LegacyPathExAttMap
+
+
+def build_data(width):
+    """Create mixed path and non-path data, with one level of nesting."""
+    data = {"k{}".format(i): "$HOME/path/{}".format(i) for i in range(width)}
+    data["nested"] = {"n{}".format(i): i for i in range(width)}
+    return data
+
+
+OPERATIONS = {
+    "__setitem__": lambda m: [m.__setitem__(k, v) for k, v in list(m.items())],
+    "items": lambda m: list(m.items()),
+    "to_dict": lambda m: m.to_dict(),
+    "attribute": lambda m: [getattr(m, k) for k in m],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--width", type=int, default=200, help="Keys per map")
+    parser.add_argument("--number", type=int, default=200, help="Loops per trial")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of trials")
+    args = parser.parse_args()
+    data = build_data(args.width)
+    print(
+        "{:<14}{:>14}{:>14}{:>10}".format(
+            "operation", "legacy (ms)", "current (ms)", "speedup"
+        )
+    )
+    for name, op in OPERATIONS.items():
+        times = []
+        for cls in [LegacyPathExAttMap, PathExAttMap]:
+            m = cls(data)
+            trials = timeit.repeat(
+                lambda: op(m), number=args.number, repeat=args.repeat
+            )
+            times.append(1000 * min(trials) / args.number)
+        print(
+            "{:<14}{:>14.3f}{:>14.3f}{:>9.2f}x".format(
+                name, times[0], times[1], times[0] / times[1]
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
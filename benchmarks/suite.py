@@ -0,0 +1,209 @@
+""" Benchmark suite of core operations, for every basic map type
+
+Times construction, add_entries, attribute and item access, to_dict,
+to_map, to_yaml, equality, diff, copy and repr for AttMap, OrdAttMap,
+PathExAttMap and EchoAttMap, on wide, deep and path-heavy synthetic data
+(see benchmarks.generators). Each case reports the best time per call over
+a few trials. Results can be saved as a baseline, and a later run can be
+compared with a saved baseline; the comparison flags each case that got
+slower or faster by more than a threshold, and the run exits with status 1
+if any case got slower.
+
+Run from the repository root with: python -m benchmarks.suite
+For example, save a baseline, then compare after a change or an upgrade:
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from collections import OrderedDict
+
+from attmap import (
+    AttMap,
+    EchoAttMap,
+    OrdAttMap,
+    PathExAttMap,
+    __version__,
+    diff,
+    disable_render_cache,
+)
+
+from .generators import SHAPES
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+MAP_TYPES = OrderedDict(
+    (t.__name__, t) for t in [AttMap, OrdAttMap, PathExAttMap, EchoAttMap]
+)
+
+# Each operation takes the map type, the raw data, a map of the data, and
+# another, equal map of the data.
+OPERATIONS = OrderedDict(
+    [
+        ("construct", lambda cls, data, m, other: cls(data)),
+        ("add_entries", lambda cls, data, m, other: m.add_entries(data)),
+        ("getattr", lambda cls, data, m, other: [getattr(m, k) for k in data]),
+        ("getitem", lambda cls, data, m, other: [m[k] for k in data]),
+        ("to_dict", lambda cls, data, m, other: m.to_dict()),
+        ("to_map", lambda cls, data, m, other: m.to_map()),
+        ("to_yaml", lambda cls, data, m, other: m.to_yaml()),
+        ("eq", lambda cls, data, m, other: m == other),
+        ("diff", lambda cls, data, m, other: diff(m, other)),
+        ("copy", lambda cls, data, m, other: m.copy()),
+        ("repr", lambda cls, data, m, other: repr(m)),
+    ]
+)
+
+
+def time_call(fun, repeat=3, min_time=0.05):
+    """
+    Get the best time per call of a function.
+
+    The number of calls per trial is doubled until a trial takes at least
+    the minimum time, so that timer resolution doesn't dominate.
+
+    :param function fun: function to time, taking no arguments
+    :param int repeat: number of trials
+    :param float min_time: minimum duration of a trial, in seconds
+    :return float: best time per call over the trials, in seconds
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fun()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fun()
+        best = min(best, time.perf_counter() - start)
+    return best / number
+
+
+def run(types=None, shapes=None, operations=None, repeat=3, min_time=0.05):
+    """
+    Time each combination of map type, data shape, and operation.
+
+    The render cache is disabled (see attmap.enable_render_cache), so each
+    conversion is timed in full, comparably with baselines that predate it.
+
+    :param Iterable[str] types: names of map types; all if null
+    :param Iterable[str] shapes: names of data shapes; all if null
+    :param Iterable[str] operations: names of operations; all if null
+    :param int repeat: number of trials per case
+    :param float min_time: minimum duration of a trial, in seconds
+    :return OrderedDict[str, float]: best time per call, in seconds, for
+        each case, named as type/shape/operation
+    """
+    disable_render_cache()
+    results = OrderedDict()
+    for type_name in types or MAP_TYPES:
+        cls = MAP_TYPES[type_name]
+        for shape in shapes or SHAPES:
+            build, size = SHAPES[shape]
+            data = build(size)
+            m, other = cls(data), cls(data)
+            for op_name in operations or OPERATIONS:
+                op = OPERATIONS[op_name]
+                results["/".join([type_name, shape, op_name])] = time_call(
+                    lambda: op(cls, data, m, other), repeat, min_time
+                )
+    return results
+
+
+def compare(baseline, current, threshold=0.1, labels=("slower", "faster")):
+    """
+    Compare measurements, such as timings, with a baseline.
+
+    :param Mapping[str, float] baseline: measurement for each case
+    :param Mapping[str, float] current: measurement for each case
+    :param float threshold: relative change that counts as a regression
+        or an improvement, e.g. 0.1 for 10%
+    :param (str, str) labels: status for a regression and an improvement
+    :return list[(str, float, float, float, str)]: for each case in both
+        collections, its name, baseline and current measurements, ratio of
+        current to baseline, and regression, improvement, or empty status
+    """
+    rows = []
+    for name, curr in current.items():
+        try:
+            base = baseline[name]
+        except KeyError:
+            continue
+        ratio = curr / base if base else (float("inf") if curr else 1.0)
+        if ratio > 1 + threshold:
+            status = labels[0]
+        elif ratio < 1 / (1 + threshold):
+            status = labels[1]
+        else:
+            status = ""
+        rows.append((name, base, curr, ratio, status))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--types", nargs="+", choices=list(MAP_TYPES))
+    parser.add_argument("--shapes", nargs="+", choices=list(SHAPES))
+    parser.add_argument("--operations", nargs="+", choices=list(OPERATIONS))
+    parser.add_argument("--repeat", type=int, default=3, help="Trials per case")
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="Minimum seconds per trial"
+    )
+    parser.add_argument("--save", help="Path to which to write results as JSON")
+    parser.add_argument("--compare", help="Path to saved baseline results")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Relative change to flag"
+    )
+    args = parser.parse_args()
+    results = run(args.types, args.shapes, args.operations, args.repeat, args.min_time)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {
+                    "attmap": __version__,
+                    "python": platform.python_version(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+    if not args.compare:
+        print("{:<40}{:>14}".format("case", "time (us)"))
+        for name, secs in results.items():
+            print("{:<40}{:>14.2f}".format(name, 1e6 * secs))
+        return
+    with open(args.compare, "r") as f:
+        baseline = json.load(f)
+    print(
+        "Baseline: attmap {}, Python {}".format(baseline["attmap"], baseline["python"])
+    )
+    print(
+        "{:<40}{:>14}{:>14}{:>9}  {}".format(
+            "case", "base (us)", "now (us)", "ratio", "status"
+        )
+    )
+    rows = compare(baseline["results"], results, args.threshold)
+    for name, base, curr, ratio, status in rows:
+        print(
+            "{:<40}{:>14.2f}{:>14.2f}{:>9.2f}  {}".format(
+                name, 1e6 * base, 1e6 * curr, ratio, status
+            )
+        )
+    if any(r[-1] == "slower" for r in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+""" Benchmark of a sample collection as maps versus as a table
+
+Builds the same sample records once as a list of PathExAttMap, one per
+record, and once as an AttMapTable, then reports the memory allocated per
+record (as measured by tracemalloc) and the time to get every record's
+expanded path.
+
+Run from the repository root with: python -m benchmarks.table_records
+"""
+
+import argparse
+import gc
+import timeit
+import tracemalloc
+
+from attmap import AttMapTable, PathExAttMap
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+def build_records(count):
+    """Create sample records with text, path and numeric values."""
+    return [
+        {
+            "sample_name": "sample{}".format(i),
+            "protocol": "RNA-seq",
+            "data_source": "$HOME/data/{}.fastq".format(i % 10),
+            "read_length": i,
+        }
+        for i in range(count)
+    ]
+
+
+def measure(build, records):
+    """Get bytes allocated, per record, to build the collection."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        coll = build(records)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return coll, (after - before) / float(len(records))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--count", type=int, default=100000, help="Records")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of trials")
+    args = parser.parse_args()
+    records = build_records(args.count)
+    maps, map_bytes = measure(lambda rs: [PathExAttMap(r) for r in rs], records)
+    table, table_bytes = measure(AttMapTable, records)
+    map_time = min(
+        timeit.repeat(
+            lambda: [m.data_source for m in maps], number=1, repeat=args.repeat
+        )
+    )
+    table_time = min(
+        timeit.repeat(
+            lambda: table.column("data_source", expand=True),
+            number=1,
+            repeat=args.repeat,
+        )
+    )
+    print("{:<16}{:>16}{:>16}".format("container", "bytes/record", "expand (ms)"))
+    for name, size, secs in [
+        ("PathExAttMap", map_bytes, map_time),
+        ("AttMapTable", table_bytes, table_time),
+    ]:
+        print("{:<16}{:>16.1f}{:>16.1f}".format(name, size, 1000 * secs))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,9 @@ ALL_ATTMAPS = [
     AttributeDictEcho,
     AttMap,
     AttMapEcho,
+    CompactAttMap,
+    ConcurrentAttMap,
+    EagerPathExAttMap,
     EchoAttMap,
     OrdAttMap,
     PathExAttMap,
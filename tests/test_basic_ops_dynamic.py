@@ -4,6 +4,8 @@ import pytest
 from hypothesis import given
 from pandas import Series
 
+from attmap import ConcurrentAttMap
+
 from .helpers import get_att_map, rand_non_null, random_str_key
 
 __author__ = "Vince Reuter"
@@ -216,3 +218,26 @@ class CheckNullTests:
         assert not m.is_null(k) and m.non_null(k)
         del m[k]
         assert not m.is_null(k) and not m.non_null(k)
+
+
+@pytest.mark.parametrize(
+    "mutate", [lambda m: m.__setitem__("new", 0), lambda m: m.__delitem__("a")]
+)
+def test_mutation_during_iteration_is_exceptional(attmap_type, mutate):
+    """Like a dict, a map can't change size while iterating over its keys."""
+    if attmap_type is ConcurrentAttMap:
+        pytest.skip("Iteration is over a snapshot, so a map can change meanwhile")
+    m = get_att_map(attmap_type, {"a": 1, "b": 2})
+    with pytest.raises(RuntimeError):
+        for _ in m:
+            mutate(m)
+
+
+def test_iteration_is_lazy(attmap_type, entries):
+    """Iteration yields keys from the live map rather than from a snapshot."""
+    if attmap_type is ConcurrentAttMap:
+        pytest.skip("Iteration is over a snapshot, so a map can change meanwhile")
+    m = get_att_map(attmap_type, entries)
+    it = iter(m)
+    assert not isinstance(it, list)
+    assert list(it) == list(entries)
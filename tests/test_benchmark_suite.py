@@ -0,0 +1,39 @@
+""" Tests for the timing and memory benchmarks and baseline comparison """
+
+import pytest
+
+from benchmarks import memory
+from benchmarks.generators import SHAPES
+from benchmarks.suite import OPERATIONS, compare, run
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+@pytest.mark.parametrize("shape", list(SHAPES))
+def test_run_times_each_case(shape):
+    """Each type, shape and operation gets a positive time."""
+    res = run(types=["PathExAttMap"], shapes=[shape], repeat=1, min_time=0)
+    assert ["PathExAttMap/{}/{}".format(shape, op) for op in OPERATIONS] == list(res)
+    assert all(t > 0 for t in res.values())
+
+
+def test_compare_flags_changes():
+    """Cases beyond the threshold are flagged; others and new ones aren't."""
+    base = {"a": 1.0, "b": 1.0, "c": 1.0}
+    curr = {"a": 1.5, "b": 0.5, "c": 1.05, "d": 1.0}
+    rows = compare(base, curr, threshold=0.1)
+    assert [("a", "slower"), ("b", "faster"), ("c", "")] == [
+        (r[0], r[-1]) for r in rows
+    ]
+
+
+def test_memory_measures_each_case():
+    """Memory use is reported per key, per level, and per shape and operation."""
+    res = memory.run(types=["OrdAttMap"], shapes=["wide"])
+    exp = ["OrdAttMap/bytes_per_key", "OrdAttMap/bytes_per_level"] + [
+        "OrdAttMap/wide/" + m
+        for m in ["retained"] + [op + "_peak" for op in memory.OPERATIONS]
+    ]
+    assert exp == list(res)
+    assert all(b > 0 for b in res.values())
@@ -0,0 +1,128 @@
+""" Tests for the memory-compact map """
+
+import copy
+import gc
+import pickle
+import sys
+import weakref
+
+import pytest
+
+from attmap import *
+from attmap.compact_attmap import _TABLES
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+DATA = {"a": 1, "b": {"c": [1, 2], "d": {"e": "text"}}, "f": None}
+
+
+def test_no_instance_dict():
+    """A compact map's data lives in slots, not an instance dict."""
+    m = CompactAttMap(DATA)
+    assert not hasattr(m, "__dict__")
+    assert not hasattr(m.b, "__dict__")
+    assert sys.getsizeof(m) < sys.getsizeof(AttMap(DATA).__dict__)
+
+
+def test_same_keys_share_table():
+    """Maps with the same keys in the same order share one key table."""
+    m1 = CompactAttMap([("x", 1), ("y", 2)])
+    m2 = CompactAttMap([("x", 3), ("y", 4)])
+    m3 = CompactAttMap([("y", 5), ("x", 6)])
+    assert m1._table is m2._table
+    assert m1._table is not m3._table
+
+
+@pytest.mark.parametrize("access", [lambda m, k: m[k], getattr])
+def test_access(access):
+    """Values are available by key and by attribute, and nesting converts."""
+    m = CompactAttMap(DATA)
+    assert 1 == access(m, "a")
+    assert type(access(m, "b")) is CompactAttMap
+    assert "text" == m.b.d.e
+    assert DATA == m.to_dict()
+
+
+def test_insertion_order():
+    """Keys keep insertion order, through updates and deletions."""
+    m = CompactAttMap([("z", 0), ("a", 1), ("m", 2)])
+    m.a = 10
+    m["b"] = 3
+    del m["z"]
+    assert ["a", "m", "b"] == list(m)
+    assert [10, 2, 3] == list(m.values())
+    del m.m
+    assert [("a", 10), ("b", 3)] == list(m.items())
+
+
+def test_delete_missing_key_is_noop():
+    """As for AttMap, deleting an absent key does nothing."""
+    m = CompactAttMap({"a": 1})
+    del m["b"]
+    assert {"a": 1} == m.to_dict()
+
+
+def test_deletion_keeps_tables_shared():
+    """A map that loses a key shares the table of maps built without it."""
+    m1 = CompactAttMap([("x", 1), ("y", 2), ("z", 3)])
+    del m1["y"]
+    assert m1._table is CompactAttMap([("x", 0), ("z", 0)])._table
+
+
+def test_size_change_during_iteration():
+    """As for dict, changing size during iteration raises RuntimeError."""
+    m = CompactAttMap({"a": 1, "b": 2})
+    with pytest.raises(RuntimeError):
+        for k in m:
+            m[k + "_new"] = 0
+
+
+def test_equality():
+    """Equality is by type and data, as for AttMap."""
+    assert CompactAttMap(DATA) == CompactAttMap(DATA)
+    assert CompactAttMap(DATA) != CompactAttMap({"a": 1})
+    assert CompactAttMap(DATA) != AttMap(DATA)
+
+
+@pytest.mark.parametrize(
+    "duplicate",
+    [
+        lambda m: m.copy(),
+        copy.copy,
+        copy.deepcopy,
+        lambda m: pickle.loads(pickle.dumps(m)),
+    ],
+)
+def test_duplicate(duplicate):
+    """Copies and pickle roundtrips are equal, independent maps."""
+    m = CompactAttMap(DATA)
+    dup = duplicate(m)
+    assert dup == m
+    assert dup is not m
+    dup["a"] = 2
+    assert 1 == m.a
+
+
+@pytest.mark.parametrize("pairs", [lambda ps: dict(ps), list, iter])
+def test_initial_keys_make_one_table(pairs):
+    """A map built from a mapping gets a single table, not one per prefix."""
+    keys = ["compact_test_key{}".format(i) for i in range(50)]
+    m = CompactAttMap(pairs([(k, 0) for k in keys]))
+    assert m._table.keys == tuple(keys)
+    assert tuple(keys[:1]) not in _TABLES and tuple(keys[:-1]) not in _TABLES
+
+
+@pytest.mark.parametrize(
+    "change", [lambda m: None, lambda m: m.__setitem__("z", 1), lambda m: m.pop("a")]
+)
+def test_unused_tables_are_dropped(change):
+    """A table lives only as long as some map uses it."""
+    m = CompactAttMap([("unused_test_key", 1), ("a", 2)])
+    change(m)
+    keys, ref = m._table.keys, weakref.ref(m._table)
+    del m
+    gc.collect()
+    assert ref() is None
+    assert keys not in _TABLES
@@ -0,0 +1,243 @@
+""" Tests for the map shared among threads """
+
+import pickle
+import sys
+import threading
+import time
+
+import pytest
+
+from attmap import *
+from attmap.concurrent_attmap import _ReadWriteLock
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+@pytest.fixture
+def switch_often():
+    """Make threads switch often, so that races would show."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_threads(*targets, timeout=30):
+    """Run each function in its own thread, and wait for all of them."""
+    threads = [threading.Thread(target=f, daemon=True) for f in targets]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout)
+        assert not t.is_alive(), "Threads deadlocked"
+
+
+def test_readers_share_lock():
+    """Readers hold the lock at the same time."""
+    lock = _ReadWriteLock()
+    both_reading = threading.Barrier(2, timeout=5)
+    shared = []
+
+    def read():
+        lock.acquire_read()
+        try:
+            both_reading.wait()
+            shared.append(True)
+        except threading.BrokenBarrierError:
+            pass
+        finally:
+            lock.release_read()
+
+    run_threads(read, read)
+    assert shared == [True, True]
+
+
+def test_writer_excludes_readers():
+    """A reader waits for the writer that holds the lock."""
+    lock = _ReadWriteLock()
+    events = []
+    lock.acquire_write()
+    reader = threading.Thread(
+        target=lambda: (lock.acquire_read(), events.append("read"))
+    )
+    reader.start()
+    reader.join(0.05)
+    events.append("written")
+    lock.release_write()
+    reader.join()
+    assert events == ["written", "read"]
+
+
+def test_lock_is_reentrant():
+    """A writer may read and write again; a reader can't become a writer."""
+    m = ConcurrentAttMap({"a": 1})
+    with m.writing():
+        m.a = m.a + 1
+        with m.writing():
+            del m["a"]
+    assert "a" not in m
+    with m.reading():
+        with pytest.raises(RuntimeError):
+            m["b"] = 1
+
+
+def test_locked_increments_are_not_lost(switch_often):
+    """Read-modify-write updates under writing() are serialized."""
+    m = ConcurrentAttMap({"stats": {"count": 0}})
+
+    def increment():
+        for _ in range(200):
+            with m.stats.writing():
+                m.stats.count += 1
+
+    run_threads(*[increment] * 4)
+    assert m.stats.count == 800
+
+
+def test_merge_is_atomic_for_readers(switch_often):
+    """Readers never see an add_entries merge partly done."""
+    m = ConcurrentAttMap({"x": {"a": 0, "b": 0}})
+    done = threading.Event()
+    torn = []
+
+    def write():
+        for i in range(2000):
+            m.add_entries({"x": {"a": i, "b": i}})
+        done.set()
+
+    def read():
+        while not done.is_set():
+            d = m.x.to_dict()
+            if d["a"] != d["b"]:
+                torn.append(d)
+
+    run_threads(write, read, read)
+    assert not torn
+    assert m.x.to_dict() == {"a": 1999, "b": 1999}
+
+
+def test_conversions_during_writes(switch_often):
+    """Conversions and comparisons work while other threads write."""
+    m = ConcurrentAttMap({"k{}".format(i): {"v": i} for i in range(20)})
+    done = threading.Event()
+    errors = []
+
+    def write():
+        for i in range(200):
+            key = "k{}".format(i % 20)
+            m[key] = {"v": i}
+            del m[key]
+        done.set()
+
+    def read():
+        try:
+            while not done.is_set():
+                m.to_yaml(), m.to_dict(), m.copy(), m == m.copy(), list(m.items())
+        except Exception as e:
+            errors.append(e)
+
+    run_threads(write, read, read)
+    assert not errors
+
+
+def test_nested_maps_are_concurrent():
+    """Nested mappings are stored as maps of the same type, with own locks."""
+    m = ConcurrentAttMap({"a": {"b": {"c": 1}}})
+    assert isinstance(m.a.b, ConcurrentAttMap)
+    assert m.a._lock is not m.a.b._lock
+
+
+def test_copy_and_pickle_get_own_locks():
+    """A copy or unpickled map is independent of the original."""
+    m = ConcurrentAttMap({"a": {"b": 1}})
+    for dup in [m.copy(), pickle.loads(pickle.dumps(m))]:
+        assert dup == m
+        assert dup._lock is not m._lock and dup.a._lock is not m.a._lock
+        dup.a.b = 2
+        assert m.a.b == 1
+
+
+def test_merge_while_nested_map_is_read():
+    """A merge into a map doesn't deadlock with a block reading through it."""
+    m = ConcurrentAttMap({"a": {"x": 1}})
+    in_block = threading.Event()
+    seen = []
+
+    def read():
+        with m.a.reading():
+            in_block.set()
+            time.sleep(0.1)
+            seen.append(m.a.x)
+
+    def merge():
+        in_block.wait(5)
+        m.add_entries({"a": {"x": 2}})
+
+    run_threads(read, merge, timeout=5)
+    assert [1] == seen
+    assert 2 == m.a.x
+
+
+def test_write_block_while_nested_map_is_read():
+    """A write block on a map doesn't deadlock with a read block under it."""
+    m = ConcurrentAttMap({"a": {"x": 1}})
+    in_block = threading.Event()
+    seen = []
+
+    def read():
+        with m.a.reading():
+            in_block.set()
+            time.sleep(0.1)
+            seen.append(m.a.x)
+
+    def write():
+        in_block.wait(5)
+        with m.writing():
+            m.a.x = 2
+
+    run_threads(read, write, timeout=5)
+    assert [1] == seen
+    assert 2 == m.a.x
+
+
+def test_block_holds_enclosing_maps():
+    """In a block on a nested map, the maps it's in can't be written."""
+    m = ConcurrentAttMap({"a": {"x": 1}, "b": 0})
+    sub = m.a
+    with sub.reading():
+        with pytest.raises(RuntimeError):
+            m.b = 1
+    del m["a"]
+    with sub.writing():
+        m.b = 1
+    assert 1 == m.b
+
+
+def test_blocks_on_sibling_maps():
+    """Blocks on sibling maps, each reading the other, don't deadlock."""
+    m = ConcurrentAttMap({"c": {"z": 0}, "d": {"y": 0}})
+    in_block = threading.Event()
+    seen = []
+
+    def read_c():
+        with m.c.reading():
+            in_block.set()
+            # Time for the other block to start, and the write to queue.
+            time.sleep(0.2)
+            seen.append(m.d["y"])
+
+    def write_d():
+        in_block.wait(5)
+        with m.d.writing():
+            time.sleep(0.2)
+            seen.append(m.c["z"])
+
+    def write_c():
+        in_block.wait(5)
+        time.sleep(0.1)
+        m.c["z"] = 1
+
+    run_threads(read_c, write_d, write_c, timeout=5)
+    assert 2 == len(seen)
+    assert 1 == m.c.z
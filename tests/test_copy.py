@@ -0,0 +1,139 @@
+""" Tests for deep and copy-on-write copying of maps """
+
+import pytest
+
+from attmap import *
+from tests.conftest import ALL_ATTMAPS
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+DATA = {"a": 1, "b": {"c": [1, 2], "d": {"e": "text"}}, "f": {"g": 0}}
+COW_MAPS = [OrdAttMap, PathExAttMap, EagerPathExAttMap, EchoAttMap, CompactAttMap]
+COPIES = {"copy": lambda m: m.copy(), "copy_on_write": lambda m: m.copy_on_write()}
+
+
+@pytest.fixture(scope="function", params=ALL_ATTMAPS)
+def m(request):
+    """Provide a test case with a populated map."""
+    return request.param(DATA)
+
+
+@pytest.fixture(scope="function", params=COPIES.keys())
+def dup(request):
+    """Provide a test case with a way of copying a map."""
+    return COPIES[request.param]
+
+
+def test_copy_is_equal(m, dup):
+    """A copy has the original's type and data."""
+    c = dup(m)
+    assert c is not m
+    assert type(c) is type(m)
+    assert c == m
+    assert DATA == c.to_dict()
+
+
+def test_copy_is_deep(m):
+    """By default, leaves are copied too."""
+    c = m.copy()
+    assert m.b.c == c.b.c
+    assert m.b.c is not c.b.c
+    c.b.c.append(3)
+    assert [1, 2] == m.b.c
+
+
+def test_copy_on_write_shares_leaves(m):
+    """As in a dict copy, non-map values are shared by a copy-on-write."""
+    assert m.b.c is m.copy_on_write().b.c
+
+
+def test_fetched_maps_stay_attached(m, dup):
+    """A nested map fetched before a copy belongs to the original alone."""
+    sub = m.b
+    deeper = sub.d
+    c = dup(m)
+    sub.x = 2
+    deeper.e = "new"
+    assert "x" not in c.b
+    assert "text" == c.b.d.e
+    m.b.y = 5
+    assert 5 == sub.y
+    assert "new" == m.b.d.e
+
+
+@pytest.mark.parametrize("maptype", COW_MAPS)
+def test_map_stored_twice_is_detached(maptype):
+    """A map stored in two places is detached from copies of either."""
+    shared = maptype({"k": 1})
+    m = maptype({"a": {}, "b": {}})
+    m.a.x = shared
+    m.b.y = shared
+    c = m.copy_on_write()
+    shared.k = 2
+    assert 1 == c.a.x.k
+    assert 1 == c.b.y.k
+
+
+@pytest.mark.parametrize("maptype", COW_MAPS)
+@pytest.mark.parametrize(
+    "render",
+    [repr, lambda m: m.to_yaml(), lambda m: m.to_dict(), lambda m: m.to_map()],
+)
+def test_rendering_keeps_maps_shared(maptype, render):
+    """Rendering or converting a copy-on-write doesn't copy nested maps."""
+    m = maptype(DATA)
+    c = m.copy_on_write()
+    assert render(m) == render(c)
+    assert c._raw("b") is m._raw("b")
+    assert c._raw("f") is m._raw("f")
+
+
+@pytest.mark.parametrize("copy_first", [False, True])
+def test_nested_change_is_private(m, dup, copy_first):
+    """Changing a nested map through either side doesn't affect the other."""
+    c = dup(m)
+    changed, other = (c, m) if copy_first else (m, c)
+    changed.b.d.e = "new"
+    changed.b["x"] = 2
+    del changed.f["g"]
+    assert "text" == other.b.d.e
+    assert "x" not in other.b
+    assert 0 == other.f.g
+    assert "new" == changed.b.d.e
+
+
+def test_copy_of_copy(m, dup):
+    """Copies of copies are independent of each other and the original."""
+    c1 = dup(m)
+    c2 = dup(c1)
+    c2.b.d.e = 2
+    c1.b.d.e = 1
+    assert ["text", 1, 2] == [x.b.d.e for x in [m, c1, c2]]
+
+
+def test_replacement_after_copy_is_kept(m, dup):
+    """A nested map stored after copying is stored as such."""
+    c = dup(m)
+    sub = type(m)({"new": 1})
+    c.b = sub
+    assert c.b is sub
+
+
+@pytest.mark.parametrize("maptype", [OrdAttMap, PathExAttMap, EagerPathExAttMap])
+def test_popped_map_is_private(maptype, dup):
+    """A nested map popped from a copy may be changed freely."""
+    m = maptype(DATA)
+    popped = dup(m).pop("b")
+    popped.d.e = "new"
+    assert "text" == m.b.d.e
+
+
+@pytest.mark.parametrize("maptype", [PathExAttMap, EagerPathExAttMap, EchoAttMap])
+def test_copy_keeps_raw_values(maptype, dup):
+    """Copying doesn't replace stored text with its expansion."""
+    m = maptype({"a": "$HOME/x", "b": {"c": "$HOME"}})
+    c = dup(m)
+    assert m.to_dict() == c.to_dict()
+    assert m.to_dict(expand=True) == c.to_dict(expand=True)
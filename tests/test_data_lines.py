@@ -0,0 +1,69 @@
+""" Tests for generation of text representation lines """
+
+import itertools
+
+import pytest
+
+from attmap import AttMap, get_data_lines, iter_data_lines
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+def _render(obj, prefix=""):
+    return str(obj)
+
+
+@pytest.mark.parametrize(
+    ["data", "exp"],
+    [
+        ({}, []),
+        ({"a": 1, "b": None}, ["a: 1", "b: null"]),
+        ({"a": {}}, ["a: {}"]),
+        (
+            {"a": {"b": {"c": 1}, "d": 2}, "e": 3},
+            ["a:", "  b:", "    c: 1", "  d: 2", "e: 3"],
+        ),
+    ],
+)
+def test_lines(data, exp):
+    """Each entry and each section header gets its own, indented line."""
+    assert exp == list(iter_data_lines(data, _render))
+    assert exp == get_data_lines(data, _render)
+
+
+def test_space_per_level():
+    """Indentation per level of nesting is configurable."""
+    data = {"a": {"b": {"c": 1}}}
+    assert ["a:", "    b:", "        c: 1"] == get_data_lines(data, _render, 4)
+
+
+def test_lines_are_lazy():
+    """Rendering stops once the consumer stops taking lines."""
+    rendered = []
+
+    def render(obj, prefix=""):
+        rendered.append(obj)
+        return str(obj)
+
+    data = {"k{}".format(i): i for i in range(1000)}
+    assert 3 == len(list(itertools.islice(iter_data_lines(data, render), 3)))
+    assert len(rendered) < 10
+
+
+@pytest.mark.parametrize(["width", "depth"], [(5000, 1), (1, 3000)])
+def test_large_data(width, depth):
+    """Neither the number of keys nor the depth of nesting is limited."""
+    data = {"k{}".format(i): i for i in range(width)}
+    for _ in range(depth - 1):
+        data = {"sub": data}
+    lines = list(iter_data_lines(data, _render))
+    assert width + depth - 1 == len(lines)
+    assert lines[-1].endswith("k{}: {}".format(width - 1, width - 1))
+    assert (depth - 1) * 2 == len(lines[-1]) - len(lines[-1].lstrip())
+
+
+def test_repr_of_wide_map():
+    """Text representation of a map with many keys is available."""
+    m = AttMap({"k{}".format(i): i for i in range(5000)})
+    assert 5001 == len(repr(m).split("\n"))
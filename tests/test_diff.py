@@ -0,0 +1,99 @@
+""" Tests for the structural difference between maps """
+
+import numpy as np
+import pytest
+
+from attmap import *
+from tests.conftest import ALL_ATTMAPS
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+OLD = {"a": 1, "b": {"c": [1, 2], "d": {"e": "x"}}, "f": "$HOME"}
+NEW = {"a": 1, "b": {"c": [1, 3], "d": {"g": None}}, "h": {"i": 2}}
+
+
+@pytest.mark.parametrize("maptype", ALL_ATTMAPS)
+def test_diff_reports_paths(maptype):
+    """Added, removed and changed values are reported by path."""
+    d = diff(maptype(OLD), maptype(NEW))
+    assert set(d.removed) == {("b", "d", "e"), ("f",)}
+    assert d.removed[("f",)] == "$HOME"
+    assert set(d.added) == {("b", "d", "g"), ("h",)}
+    assert d.added[("h",)].to_dict() == {"i": 2}
+    assert d.changed == {("b", "c"): ([1, 2], [1, 3])}
+
+
+@pytest.mark.parametrize("maptype", ALL_ATTMAPS + [PersistentAttMap])
+def test_equal_maps_have_empty_diff(maptype):
+    """Maps with the same content differ nowhere."""
+    assert not any(diff(maptype(OLD), maptype(OLD)))
+
+
+@pytest.mark.parametrize("maptype", ALL_ATTMAPS)
+def test_apply_diff_patches_map(maptype):
+    """Applying a diff brings the first map to the second, in place."""
+    m = maptype(OLD)
+    target = maptype(NEW)
+    assert apply_diff(m, diff(m, target)) is m
+    assert m == target
+    m["h"]["i"] = 3
+    assert target["h"]["i"] == 2
+
+
+@pytest.mark.parametrize("maptype", [OrdAttMap, PathExAttMap, CompactAttMap])
+def test_apply_diff_to_copy_leaves_original(maptype):
+    """A map shared with a copy is copied before it's patched."""
+    m = maptype(OLD)
+    dup = m.copy_on_write()
+    apply_diff(dup, diff(m, maptype(NEW)))
+    assert m == maptype(OLD)
+    assert dup == maptype(NEW)
+
+
+def test_diff_passes_over_shared_subtree():
+    """A subtree both maps share is passed over without a walk."""
+
+    class Exploding(object):
+        def __eq__(self, other):
+            raise AssertionError("Compared a value")
+
+    m = OrdAttMap({"a": {"b": Exploding()}, "c": 1})
+    dup = m.copy_on_write()
+    dup["c"] = 2
+    assert diff(m, dup) == MapDiff({}, {}, {("c",): (1, 2)})
+
+
+def test_diff_uses_registered_comparison():
+    """Values are compared as for map equality."""
+    m1 = AttMap({"arr": np.array([1, 2]), "x": 1})
+    m2 = AttMap({"arr": np.array([1, 2]), "x": 1})
+    assert not any(diff(m1, m2))
+    m2["arr"] = np.array([1, 3])
+    assert list(diff(m1, m2).changed) == [("arr",)]
+
+
+def test_diff_of_map_and_dict():
+    """A plain mapping on either side is compared by content."""
+    d = diff(AttMap(OLD), NEW)
+    assert set(d.added) == {("b", "d", "g"), ("h",)}
+    assert not any(diff(OLD, AttMap(OLD)))
+
+
+def test_diff_of_deep_maps():
+    """Deep nesting doesn't hit the recursion limit."""
+    old, new = {}, {}
+    curr_old, curr_new = old, new
+    for _ in range(5000):
+        curr_old = curr_old.setdefault("k", {})
+        curr_new = curr_new.setdefault("k", {})
+    curr_new["leaf"] = 1
+    d = diff(old, new)
+    assert list(d.added) == [("k",) * 5000 + ("leaf",)]
+
+
+def test_apply_diff_through_value_fails():
+    """A path through a value that isn't a map can't be patched."""
+    with pytest.raises(TypeError):
+        apply_diff(AttMap({"a": 1}), MapDiff({("a", "b"): 1}, {}, {}))
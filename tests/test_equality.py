@@ -7,7 +7,14 @@ import pytest
 from pandas import DataFrame as DF
 from pandas import Series
 
-from attmap import AttMap, AttMapEcho, OrdAttMap, PathExAttMap
+from attmap import (
+    AttMap,
+    AttMapEcho,
+    CompactAttMap,
+    OrdAttMap,
+    PathExAttMap,
+    register_comparison,
+)
 
 from .conftest import ALL_ATTMAPS
 from .helpers import get_att_map
@@ -102,3 +109,51 @@ def test_equality_fails_when_keysets_are_non_identical(maptype, data, delkey):
     del m1[delkey]
     assert m1 != m2
     assert m2 != m1
+
+
+@pytest.mark.parametrize("maptype", ALL_ATTMAPS)
+def test_paths_compare_as_stored(maptype):
+    """Maps with the same text to expand are equal."""
+    data = {"path": "$HOME/x", "sub": {"path": "~/y"}}
+    assert get_att_map(maptype, data) == get_att_map(maptype, data)
+
+
+@pytest.mark.parametrize("maptype", ALL_ATTMAPS)
+def test_shared_subtree_compared_by_identity(maptype):
+    """A value shared by both maps is equal without being compared."""
+
+    class NeverEqual(object):
+        def __eq__(self, other):
+            return False
+
+    v = NeverEqual()
+    assert get_att_map(maptype, {"a": v}) == get_att_map(maptype, {"a": v})
+    assert get_att_map(maptype, {"a": v}) != get_att_map(maptype, {"a": NeverEqual()})
+
+
+@pytest.mark.parametrize("maptype", [OrdAttMap, PathExAttMap, CompactAttMap])
+def test_comparison_leaves_copy_shared(maptype):
+    """Comparing a map with its copy doesn't make either side copy."""
+    m = maptype({"a": {"b": 1}})
+    dup = m.copy_on_write()
+    assert m == dup
+    assert m._get_for_eq("a") is dup._get_for_eq("a")
+
+
+def test_registered_comparison():
+    """A comparison registered for a type decides for its instances."""
+
+    class Approx(float):
+        pass
+
+    register_comparison(Approx, lambda a, b: abs(a - b) < 0.01)
+    assert AttMap({"x": Approx(1.0)}) == AttMap({"x": Approx(1.001)})
+    assert AttMap({"x": Approx(1.0)}) != AttMap({"x": Approx(1.1)})
+    assert AttMap({"x": 1.0}) != AttMap({"x": 1.001})
+
+
+def test_lazy_map_equals_eager():
+    """A lazily converted map equals an eagerly converted one."""
+    data = {"a": {"b": {"c": 1}}}
+    assert OrdAttMap(data, lazy=True) == OrdAttMap(data)
+    assert OrdAttMap(data) == OrdAttMap(data, lazy=True)
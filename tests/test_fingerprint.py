@@ -0,0 +1,131 @@
+""" Tests for cached structural fingerprints of maps """
+
+import numpy as np
+import pytest
+
+from attmap import *
+from attmap._fingerprint import fingerprint
+from attmap._tracking import cached
+from tests.conftest import ALL_ATTMAPS
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+DATA = {"a": 1, "b": {"c": [1, {"d": 2}], "e": "$HOME/x"}, "f": None}
+MUTABLE_TYPES = ALL_ATTMAPS + [CompactAttMap]
+
+
+@pytest.mark.parametrize("maptype", MUTABLE_TYPES + [PersistentAttMap])
+def test_equal_maps_have_same_fingerprint(maptype):
+    """Maps with equal content have the same fingerprint."""
+    assert maptype(DATA).fingerprint() == maptype(DATA).fingerprint()
+
+
+def test_fingerprint_reflects_type_and_order():
+    """Maps that are unequal by type or key order differ in fingerprint."""
+    assert AttMap(DATA).fingerprint() != OrdAttMap(DATA).fingerprint()
+    assert (
+        OrdAttMap([("a", 1), ("b", 2)]).fingerprint()
+        != OrdAttMap([("b", 2), ("a", 1)]).fingerprint()
+    )
+    assert (
+        AttMap([("a", 1), ("b", 2)]).fingerprint()
+        == AttMap([("b", 2), ("a", 1)]).fingerprint()
+    )
+
+
+@pytest.mark.parametrize("maptype", MUTABLE_TYPES)
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda m: m["b"].__setitem__("e", "y"),
+        lambda m: setattr(m.b, "e", "y"),
+        lambda m: m["b"].__delitem__("e"),
+        lambda m: m.add_entries({"b": {"g": 1}}),
+        lambda m: m.__setitem__("a", 2),
+    ],
+)
+def test_nested_change_reaches_root(maptype, change):
+    """A change at any depth changes the fingerprint of each enclosing map."""
+    m = maptype(DATA)
+    before = m.fingerprint()
+    change(m)
+    assert before != m.fingerprint()
+    assert maptype(m.to_dict()).fingerprint() == m.fingerprint()
+
+
+@pytest.mark.parametrize("maptype", MUTABLE_TYPES)
+def test_unchanged_maps_stay_cached(maptype):
+    """A change elsewhere leaves a sibling's cached fingerprint alone."""
+    m = maptype({"x": {"a": 1}, "y": {"b": 2}})
+    m.fingerprint()
+    sibling = m["y"]
+    cached_before = cached(sibling, "fingerprint")
+    m["x"]["a"] = 3
+    assert cached(m, "fingerprint") is None
+    assert cached_before is cached(sibling, "fingerprint")
+
+
+@pytest.mark.parametrize("maptype", [OrdAttMap, PathExAttMap, CompactAttMap])
+def test_change_to_copy_reaches_copy(maptype):
+    """After a copy-on-write fetch, a nested change reaches the right root."""
+    m = maptype({"x": {"a": 1}})
+    dup = m.copy()
+    fp, dup_fp = m.fingerprint(), dup.fingerprint()
+    dup["x"]["a"] = 2
+    assert fp == m.fingerprint()
+    assert dup_fp != dup.fingerprint()
+
+
+def test_lazy_map_fingerprint_matches_eager():
+    """Lazily converted maps fingerprint as converted."""
+    data = {"a": {"b": {"c": 1}}}
+    assert OrdAttMap(data, lazy=True).fingerprint() == OrdAttMap(data).fingerprint()
+
+
+def test_identity_values_are_inexact():
+    """Values compared by registered comparison contribute identity."""
+    m1 = AttMap({"arr": np.array([1, 2])})
+    m2 = AttMap({"arr": np.array([1, 2])})
+    assert not fingerprint(m1)[1]
+    assert m1.fingerprint() != m2.fingerprint()
+    assert m1 == m2
+
+
+def test_value_changed_in_place_is_not_rejected():
+    """A list changed in place can't make equal maps compare unequal."""
+    m1, m2 = AttMap({"a": [1]}), AttMap({"a": [1, 2]})
+    m1.fingerprint()
+    m2.fingerprint()
+    m1.a.append(2)
+    assert m1 == m2
+
+
+def test_unequal_fingerprints_reject_without_walk():
+    """Maps with cached, exact, different fingerprints are unequal at once."""
+
+    class Exploding(object):
+        def __hash__(self):
+            return 0
+
+        def __eq__(self, other):
+            raise AssertionError("Compared a value")
+
+    m1, m2 = AttMap({"a": Exploding(), "b": 1}), AttMap({"a": Exploding(), "b": 2})
+    m1.fingerprint()
+    m2.fingerprint()
+    assert m1 != m2
+
+
+def test_excluded_keys_are_left_out():
+    """Keys excluded from comparison don't affect the fingerprint."""
+
+    class Sub(OrdAttMap):
+        def _excl_from_eq(self, k):
+            return k == "skip"
+
+    assert (
+        Sub([("a", 1), ("skip", 1)]).fingerprint()
+        == Sub([("a", 1), ("skip", 2)]).fingerprint()
+    )
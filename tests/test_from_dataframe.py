@@ -0,0 +1,71 @@
+""" Tests for building maps from the rows of a table """
+
+import os
+
+import pandas as pd
+import pytest
+
+from attmap import *
+from tests.conftest import ALL_ATTMAPS
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+@pytest.fixture(scope="function")
+def df():
+    """Provide a test case with a sample table."""
+    return pd.DataFrame(
+        {
+            "sample_name": ["a", "b", "c"],
+            "path": ["$HOME/a", "$HOME/b", "$HOME/a"],
+            "n": [1, 2, 3],
+            "x": [0.5, 1.0, 1.5],
+        },
+        index=["r1", "r2", "r3"],
+    )
+
+
+@pytest.mark.parametrize("maptype", ALL_ATTMAPS + [PersistentAttMap])
+def test_records_match_rows(df, maptype):
+    """Each record has the data and key order of its row."""
+    maps = maptype.from_dataframe(df)
+    assert 3 == len(maps)
+    for (_, row), m in zip(df.iterrows(), maps):
+        assert type(m) is maptype
+        assert list(df.columns) == list(m.keys())
+        assert row.to_dict() == m.to_dict()
+
+
+def test_values_are_native(df):
+    """Numeric values come out as Python scalars."""
+    m = AttMap.from_dataframe(df)[0]
+    assert type(m.n) is int
+    assert type(m.x) is float
+
+
+@pytest.mark.parametrize("expand", [True, ["path"]])
+def test_expand_columns(df, expand):
+    """Text in the columns to expand is stored expanded."""
+    maps = PathExAttMap.from_dataframe(df, expand=expand)
+    exp = os.path.expandvars("$HOME/a")
+    assert exp == maps[0].to_dict()["path"] == maps[2].to_dict()["path"]
+    assert "a" == maps[0].sample_name
+
+
+def test_no_expansion_by_default(df):
+    """Text is stored as is unless expansion is requested."""
+    assert "$HOME/a" == PathExAttMap.from_dataframe(df)[0].to_dict()["path"]
+
+
+def test_mapping_cells_are_converted():
+    """A mapping in a cell is stored as the map type."""
+    maps = OrdAttMap.from_dataframe(pd.DataFrame({"a": [{"x": 1}, 2]}))
+    assert type(maps[0].a) is OrdAttMap
+    assert 1 == maps[0].a.x
+    assert 2 == maps[1].a
+
+
+def test_empty_table():
+    """A table without rows gives no records."""
+    assert [] == AttMap.from_dataframe(pd.DataFrame({"a": []}))
@@ -0,0 +1,181 @@
+""" Tests for immutable, hashable maps """
+
+import copy
+import pickle
+
+import pytest
+
+from attmap import *
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+FROZEN_TYPES = {
+    AttMap: FrozenAttMap,
+    OrdAttMap: FrozenOrdAttMap,
+    PathExAttMap: FrozenPathExAttMap,
+    EchoAttMap: FrozenEchoAttMap,
+    EagerPathExAttMap: FrozenPathExAttMap,
+}
+DATA = {"a": 1, "b": {"c": [1, 2], "d": {"e": "text"}}, "f": None}
+
+
+@pytest.fixture(scope="function", params=list(FROZEN_TYPES.keys()))
+def maptype(request):
+    """Provide a test case with a mutable map type."""
+    return request.param
+
+
+@pytest.fixture(scope="function")
+def frozen(maptype):
+    """Provide a test case with a frozen map."""
+    return maptype(DATA).freeze()
+
+
+def test_freeze_type(maptype, frozen):
+    """A map freezes to its type's counterpart, at every level of nesting."""
+    exp = FROZEN_TYPES[maptype]
+    assert type(frozen) is exp
+    assert type(frozen.b) is exp
+    assert type(frozen.b.d) is exp
+
+
+def test_freeze_preserves_data(maptype, frozen):
+    """A frozen map has the same data and text as its source."""
+    m = maptype(DATA)
+    assert DATA == frozen.to_dict()
+    assert m.to_yaml() == frozen.to_yaml()
+    assert repr(m).replace(maptype.__name__, type(frozen).__name__) == repr(frozen)
+
+
+def test_frozen_is_idempotent(frozen):
+    """Freezing or copying a frozen map gives the same map."""
+    assert frozen.freeze() is frozen
+    assert frozen.copy() is frozen
+    assert freeze(frozen) is frozen
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda m: m.__setitem__("a", 2),
+        lambda m: m.__setitem__("new", 2),
+        lambda m: setattr(m, "a", 2),
+        lambda m: m.__delitem__("a"),
+        lambda m: delattr(m, "a"),
+        lambda m: m.pop("a"),
+        lambda m: m.popitem(),
+        lambda m: m.clear(),
+        lambda m: m.update({"a": 2}),
+        lambda m: m.setdefault("new", 2),
+        lambda m: m.add_entries({"a": 2}),
+        lambda m: m.b.__setitem__("c", 2),
+        lambda m: m.b.d.add_entries({"e": 2}),
+    ],
+)
+def test_frozen_rejects_mutation(frozen, mutate):
+    """Any attempt to change a frozen map's data fails, at any level."""
+    with pytest.raises(TypeError):
+        mutate(frozen)
+    assert DATA == frozen.to_dict()
+
+
+def test_frozen_is_hashable(maptype, frozen):
+    """Equal frozen maps have equal hashes, and the hash is cached."""
+    other = maptype(DATA).freeze()
+    assert frozen is not other
+    assert frozen == other
+    assert hash(frozen) == hash(other)
+    assert {frozen: 1}[other] == 1
+    assert "hash" in frozen._memo
+
+
+def test_frozen_hash_reflects_data(maptype):
+    """Frozen maps with different data hash differently."""
+    assert hash(maptype({"a": [1, 2]}).freeze()) != hash(
+        maptype({"a": [1, 3]}).freeze()
+    )
+
+
+def test_ordered_frozen_hash_reflects_order():
+    """Ordered maps with keys in different order are unequal and hash differently."""
+    m1 = OrdAttMap([("a", 1), ("b", 2)]).freeze()
+    m2 = OrdAttMap([("b", 2), ("a", 1)]).freeze()
+    assert m1 != m2
+    assert hash(m1) != hash(m2)
+    assert hash(AttMap(m1).freeze()) == hash(AttMap(m2).freeze())
+
+
+@pytest.mark.parametrize(
+    "convert", [lambda m: m.to_yaml(), lambda m: m.to_yaml(False), repr]
+)
+def test_frozen_conversions_are_memoized(frozen, convert):
+    """Conversions are computed once."""
+    assert convert(frozen) is convert(frozen)
+
+
+@pytest.mark.parametrize("convert", ["to_dict", "to_map"])
+def test_frozen_conversions_are_copied(frozen, convert):
+    """Each caller gets its own copy of a memoized dict, to change freely."""
+    d = getattr(frozen, convert)()
+    assert convert in frozen._memo
+    assert type(d["b"]["c"]) is list
+    d["zz"] = 1
+    d["b"]["c"].append(3)
+    d["b"]["d"]["e"] = "changed"
+    assert DATA == getattr(frozen, convert)()
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda v: v.append(3),
+        lambda v: v.__setitem__(0, 3),
+        lambda v: v.sort(),
+        lambda v: v[2].__setitem__("x", 3),
+        lambda v: v[2]["y"].append(3),
+        lambda v: v[2].update({"x": 3}),
+    ],
+)
+def test_frozen_values_reject_mutation(maptype, mutate):
+    """Stored lists and mappings can't change in place, so hashes hold."""
+    data = {"a": {"b": [2, 1, {"x": 1, "y": [1]}]}, "s": {1, 2}}
+    f, h = maptype(data).freeze(), maptype(data).freeze()
+    with pytest.raises(TypeError):
+        mutate(f.a.b)
+    assert f == h
+    assert maptype(data).to_dict() == f.to_dict()
+    assert hash(f) == hash(h)
+    assert h in {f}
+    assert f.to_yaml() == h.to_yaml()
+    assert isinstance(f.s, frozenset)
+
+
+def test_frozen_expanded_conversions_are_not_memoized():
+    """Path expansion depends on the environment, so isn't memoized."""
+    m = PathExAttMap({"a": "$HOME"}).freeze()
+    assert m.to_dict(expand=True) is not m.to_dict(expand=True)
+    assert m.to_dict(expand=True) != m.to_dict()
+
+
+def test_frozen_yaml_to_stream(frozen, tmpdir):
+    """Memoized YAML text can still be written to a stream."""
+    fp = tmpdir.join("frozen.yaml").strpath
+    with open(fp, "w") as f:
+        assert frozen.to_yaml(stream=f) is None
+    with open(fp, "r") as f:
+        assert frozen.to_yaml() == f.read()
+
+
+@pytest.mark.parametrize(
+    "dup", [copy.copy, copy.deepcopy, lambda m: pickle.loads(pickle.dumps(m))]
+)
+def test_frozen_copy_and_pickle(frozen, dup):
+    """Frozen maps survive copying and pickling."""
+    res = dup(frozen)
+    assert type(res) is type(frozen)
+    assert res == frozen
+    assert hash(res) == hash(frozen)
+    with pytest.raises(TypeError):
+        res["a"] = 2
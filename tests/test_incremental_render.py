@@ -0,0 +1,143 @@
+""" Tests for reuse of rendered subtrees across conversions of a changing map """
+
+import pytest
+
+from attmap import *
+from attmap._tracking import _DERIVED, caching_renders, derived
+from tests.conftest import ALL_ATTMAPS
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+# Maps that are tracked for change, so cache what's rendered
+TRACKED_ATTMAPS = [t for t in ALL_ATTMAPS if t is not ConcurrentAttMap]
+
+DATA = {"a": 1, "b": {"c": "x", "d": {"e": None}}, "f": {"g": (1, 2)}}
+CHANGES = [
+    lambda m: m["b"]["d"].__setitem__("e", 2),
+    lambda m: setattr(m.b, "c", "y"),
+    lambda m: m["b"]["d"].__delitem__("e"),
+    lambda m: m.add_entries({"b": {"d": {"h": 3}}}),
+    lambda m: m["f"].pop("g"),
+    lambda m: m.__setitem__("a", {"new": 1}),
+]
+
+
+@pytest.fixture(autouse=True)
+def render_cache():
+    """Cache rendered fragments for each test case, and tell if they were."""
+    was_caching = caching_renders()
+    enable_render_cache()
+    yield was_caching
+    disable_render_cache()
+
+
+@pytest.mark.parametrize("maptype", ALL_ATTMAPS)
+@pytest.mark.parametrize("change", CHANGES)
+def test_conversions_reflect_nested_change(maptype, change):
+    """After a change at any depth, conversions match those of a new map."""
+    m, exp = maptype(DATA), maptype(DATA)
+    m.to_yaml(), m.to_dict(), m.to_map(), repr(m)
+    change(m)
+    change(exp)
+    assert exp.to_yaml() == m.to_yaml()
+    assert exp.to_dict() == m.to_dict()
+    assert exp.to_map() == m.to_map()
+    assert repr(exp) == repr(m)
+
+
+@pytest.mark.parametrize("maptype", ALL_ATTMAPS)
+def test_changing_converted_dict_leaves_map(maptype):
+    """Each conversion gives new containers, so cached entries stay intact."""
+    m = maptype(DATA)
+    d = m.to_dict()
+    d["b"]["d"]["e"] = "changed"
+    del d["f"]["g"]
+    assert m.to_dict() == maptype(DATA).to_dict()
+
+
+@pytest.mark.parametrize("maptype", TRACKED_ATTMAPS)
+def test_unchanged_subtree_stays_cached(maptype):
+    """A change leaves what's cached for maps off its path alone."""
+    m = maptype(DATA)
+    m.to_yaml()
+    sibling, changed = m["f"], m["b"]["d"]
+    assert _DERIVED.get(id(sibling)) and _DERIVED.get(id(changed))
+    changed["e"] = 1
+    assert _DERIVED.get(id(sibling))
+    assert not _DERIVED.get(id(changed))
+
+
+@pytest.mark.parametrize("maptype", ALL_ATTMAPS)
+def test_value_changed_in_place_is_rendered(maptype):
+    """A value that can change in place is rendered anew each time."""
+    m = maptype({"a": {"b": [1, 2]}})
+    m.to_yaml()
+    m["a"]["b"].append(3)
+    assert m.to_yaml() == maptype({"a": {"b": [1, 2, 3]}}).to_yaml()
+
+
+@pytest.mark.parametrize("maptype", [OrdAttMap, PathExAttMap, CompactAttMap])
+def test_change_to_copy_is_rendered_for_copy_only(maptype):
+    """After a copy-on-write fetch, only the changed side renders anew."""
+    m = maptype(DATA)
+    dup = m.copy()
+    text = m.to_yaml()
+    dup["b"]["d"]["e"] = "z"
+    exp = maptype(DATA)
+    exp["b"]["d"]["e"] = "z"
+    assert text == m.to_yaml()
+    assert dup.to_yaml() == exp.to_yaml() != text
+
+
+def test_lazy_map_renders_converted():
+    """A lazily converted map renders the same before and after changes."""
+    m = OrdAttMap(DATA, lazy=True)
+    assert m.to_yaml() == OrdAttMap(DATA).to_yaml()
+    m.b.d.e = 5
+    exp = OrdAttMap(DATA)
+    exp.b.d.e = 5
+    assert m.to_yaml() == exp.to_yaml()
+
+
+@pytest.mark.parametrize("maptype", TRACKED_ATTMAPS)
+def test_rendering_caches_nothing_by_default(maptype, render_cache):
+    """Unless enabled, rendering leaves nothing cached, or tracked."""
+    assert not render_cache
+    disable_render_cache()
+    m = maptype(DATA)
+    m.to_yaml(), m.to_dict(), m.to_map(), repr(m), list(m.iter_yaml())
+    assert not _DERIVED
+
+
+@pytest.mark.parametrize("maptype", TRACKED_ATTMAPS)
+def test_disabling_discards_cached_renders(maptype):
+    """Disabling the cache discards every rendered fragment, but no more."""
+    m = maptype(DATA)
+    m.to_yaml(), m.to_dict()
+    assert _DERIVED.get(id(m["b"]))
+    disable_render_cache()
+    assert not _DERIVED
+    fp = m.fingerprint()
+    enable_render_cache()
+    m.to_yaml()
+    disable_render_cache()
+    assert _DERIVED and not any(
+        isinstance(name, tuple) for values in _DERIVED.values() for name in values
+    )
+    m.b.d.e = 3
+    assert m.fingerprint() != fp
+
+
+def test_discarding_may_free_maps():
+    """A map that only a cached fragment holds may go when it's discarded."""
+    holder = OrdAttMap({"a": 1})
+    for i in range(3):
+        held = OrdAttMap({"b": i})
+        derived(held, ("yaml", i), ["b: {}".format(i)])
+        derived(holder, ("simplified", i), ({}, [("a", held)]))
+    del held
+    disable_render_cache()
+    assert not _DERIVED
+    assert 1 == holder.a
@@ -0,0 +1,111 @@
+""" Tests for counting and timing of hot operations """
+
+import pytest
+
+import attmap
+from attmap import *
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+@pytest.fixture(scope="function", autouse=True)
+def clean_stats():
+    """Ensure that each test starts and ends with stats off and zeroed."""
+    disable_stats()
+    reset_stats()
+    yield
+    disable_stats()
+    reset_stats()
+
+
+def test_disabled_by_default():
+    """Nothing is counted, and nothing is replaced, until stats are enabled."""
+    original = AttMap._final_for_store
+    AttMap({"a": {"b": 1}})
+    assert all(0 == c["calls"] for c in stats().values())
+    assert original is AttMap._final_for_store
+
+
+def test_disabling_restores_originals():
+    """Disabling stats puts back the original functions."""
+    original = PathExAttMap.__getattr__
+    enable_stats()
+    assert original is not PathExAttMap.__getattr__
+    assert CompactAttMap._final_for_store is AttMap._final_for_store
+    disable_stats()
+    assert original is PathExAttMap.__getattr__
+
+
+def test_counts():
+    """Each instrumented operation is counted."""
+    m = PathExAttMap({"a": "$HOME/x", "b": {"c": 1}})
+    with track_stats() as s:
+        m.a
+        with pytest.raises(AttributeError):
+            m.missing
+        m.to_dict()
+        AttMap().add_entries({"x": {"y": 1}})
+    assert 2 == s["getattr"]["calls"]
+    assert 1 == s["getattr"]["misses"]
+    assert 1 == s["simplify_keyvalue"]["calls"]
+    assert 3 == s["simplify_keyvalue"]["nodes"]
+    assert 1 == s["metamorph_maplike"]["calls"]
+    assert s["add_entries"]["calls"] >= 1
+    assert s["safely_expand"]["calls"] >= 1
+    assert all(c["seconds"] >= 0 for c in s.values())
+
+
+def test_echoed_key_is_a_miss():
+    """An echoed missing key counts as a miss."""
+    m = EchoAttMap({"a": 1})
+    with track_stats() as s:
+        assert "b" == m.b
+        assert 1 == m.a
+    assert {"calls": 2, "misses": 1} == {
+        k: s["getattr"][k] for k in ["calls", "misses"]
+    }
+
+
+def test_expansions_are_counted_once_cached():
+    """Cached expansions don't count as calls to expandpath."""
+    m = PathExAttMap({"a": "$HOME/uncached_for_stats"})
+    expansion_cache.cache_clear()
+    with track_stats() as s:
+        m.a
+        m.a
+    assert 2 == s["safely_expand"]["calls"]
+    assert 1 == s["expandpath"]["calls"]
+
+
+def test_scope_excludes_outside_counts():
+    """A tracked block's counts exclude those from before it."""
+    enable_stats()
+    AttMap({"a": 1})
+    with track_stats() as s:
+        pass
+    assert 0 == s["add_entries"]["calls"]
+    assert stats()["add_entries"]["calls"] > 0
+
+
+def test_tracking_leaves_enabled_stats_enabled():
+    """Stats enabled before a tracked block stay enabled after it."""
+    enable_stats()
+    with track_stats():
+        pass
+    AttMap({"a": 1})
+    assert stats()["add_entries"]["calls"] > 0
+
+
+def test_reset():
+    """Resetting zeroes the counts."""
+    with track_stats():
+        AttMap({"a": 1})
+    assert stats()["add_entries"]["calls"] > 0
+    reset_stats()
+    assert 0 == stats()["add_entries"]["calls"]
+
+
+def test_package_level_snapshot():
+    """The snapshot is available from the package."""
+    assert stats() == attmap.stats()
@@ -0,0 +1,115 @@
+""" Tests for lazy conversion of nested mappings """
+
+import os
+from collections import OrderedDict
+
+import pytest
+
+from attmap import *
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+ORDERED_MAPS = [OrdAttMap, PathExAttMap, EchoAttMap, EagerPathExAttMap]
+DATA = {"a": 1, "b": {"c": [1, 2], "d": {"e": "text"}}, "f": {}}
+
+
+@pytest.fixture(scope="function", params=ORDERED_MAPS)
+def maptype(request):
+    """Provide a test case with an ordered map type."""
+    return request.param
+
+
+def _stored(m, k):
+    """Get a value as stored, without conversion or expansion."""
+    return OrderedDict.__getitem__(m, k)
+
+
+def test_nested_mapping_is_stored_unconverted(maptype):
+    """A nested mapping is kept as given until it's fetched."""
+    m = maptype(DATA, lazy=True)
+    assert _stored(m, "b") is DATA["b"]
+
+
+def test_fetch_converts_and_caches(maptype):
+    """A nested mapping is converted, lazily, on first fetch, and kept."""
+    m = maptype(DATA, lazy=True)
+    b = m.b
+    assert isinstance(b, maptype)
+    assert b._lazy
+    assert _stored(b, "d") is DATA["b"]["d"]
+    assert m["b"] is b
+    assert "text" == m.b.d.e
+
+
+def test_conversion_skips_unconverted_mappings(maptype):
+    """A dict conversion copies an unconverted mapping, without converting it."""
+    m = maptype(DATA, lazy=True)
+    assert DATA == m.to_dict()
+    assert _stored(m, "b") is DATA["b"]
+    m.b
+    assert DATA == m.to_dict()
+
+
+@pytest.mark.parametrize("convert", [lambda m: m.to_dict(), lambda m: m.to_map()])
+def test_conversion_of_unconverted_mapping_is_a_copy(maptype, convert):
+    """Changing a conversion changes neither the map nor the source data."""
+    src = {"a": {"b": {"c": 1}}}
+    m = maptype(src, lazy=True)
+    d = convert(m)
+    d["a"]["b"]["c"] = 99
+    assert 1 == src["a"]["b"]["c"] == m.a.b.c
+
+
+def test_map_conversion_of_unconverted_mapping_is_ordered(maptype):
+    """Unconverted mappings become the map's basic type, as converted ones do."""
+    m = maptype(DATA, lazy=True)
+    res = m.to_map()
+    assert type(res["b"]) is OrderedDict
+    assert type(res["b"]["d"]) is OrderedDict
+    assert maptype(DATA).to_map() == res
+
+
+def test_conversion_excludes_classes_from_unconverted_mapping():
+    """Classes excluded from a dict conversion are left out at any depth."""
+
+    class Excluding(OrdAttMap):
+        def _excl_classes_from_todict(self):
+            return (set,)
+
+    data = {"a": {"b": {1}, "c": {"d": {2}, "e": 0}}}
+    assert Excluding(data).to_dict() == Excluding(data, lazy=True).to_dict()
+    assert {"a": {"c": {"e": 0}}} == Excluding(data, lazy=True).to_dict()
+
+
+def test_lazy_matches_eager(maptype):
+    """Lazy and eager maps have the same data, text, and equality."""
+    lazy, eager = maptype(DATA, lazy=True), maptype(DATA)
+    assert eager.to_yaml() == lazy.to_yaml()
+    assert eager.get_yaml_lines() == lazy.get_yaml_lines()
+    assert eager == lazy
+
+
+def test_merge_into_unconverted_mapping(maptype):
+    """Entries merge into a nested mapping that hasn't been converted."""
+    m = maptype(DATA, lazy=True)
+    m.add_entries({"b": {"d": {"x": 0}}})
+    assert {"e": "text", "x": 0} == m.b.d.to_dict()
+    assert {"e": "text"} == DATA["b"]["d"]
+
+
+def test_stored_mapping_is_lazy(maptype):
+    """A mapping stored after construction is converted when fetched, too."""
+    m = maptype(lazy=True)
+    m.x = {"y": {"z": 1}}
+    assert type(_stored(m, "x")) is dict
+    assert 1 == m.x.y.z
+
+
+@pytest.mark.parametrize("maptype", [PathExAttMap, EagerPathExAttMap])
+def test_nested_paths_expand(maptype):
+    """Values in a lazily converted mapping are expanded as usual."""
+    m = maptype({"a": {"b": "$HOME/x"}}, lazy=True)
+    assert os.path.expandvars("$HOME/x") == m.a.b
+    assert {"a": {"b": "$HOME/x"}} == m.to_dict()
@@ -0,0 +1,97 @@
+""" Tests for building maps directly from JSON and YAML text """
+
+import io
+import json
+
+import pytest
+import yaml
+
+from attmap import *
+from tests.conftest import ALL_ATTMAPS
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+DATA = {
+    "a": 1,
+    "b": {"c": [1, {"d": [{"e": 2}]}], "f": {"g": "$HOME/x"}},
+    "h": None,
+    "i": {},
+}
+LOADERS = {
+    "from_json": (json.dumps, json.loads),
+    "from_yaml": (yaml.safe_dump, yaml.safe_load),
+}
+
+
+@pytest.fixture(scope="function", params=LOADERS.keys())
+def loader(request):
+    """Provide a test case with the name of a loader."""
+    return request.param
+
+
+@pytest.mark.parametrize(
+    "maptype",
+    ALL_ATTMAPS + [CompactAttMap, PersistentAttMap, FrozenAttMap, FrozenOrdAttMap],
+)
+def test_load_matches_wrapping(maptype, loader):
+    """A loaded map matches one wrapped around the parsed data."""
+    dump, parse = LOADERS[loader]
+    text = dump(DATA)
+    m = getattr(maptype, loader)(io.StringIO(text))
+    exp = maptype(parse(text))
+    assert type(m) is maptype
+    assert type(m.b.f) is type(exp.b.f)
+    assert exp.to_dict() == m.to_dict() == DATA
+    assert exp.to_yaml() == m.to_yaml()
+
+
+def test_mappings_in_lists_are_plain(loader):
+    """As when data are stored, mappings within lists aren't converted."""
+    dump, _ = LOADERS[loader]
+    m = getattr(AttMap, loader)(io.StringIO(dump(DATA)))
+    assert type(m.b.c[1]) is dict
+    assert type(m.b.c[1]["d"][0]) is dict
+
+
+def test_load_from_path(tmpdir, loader):
+    """A loader accepts a path to a file."""
+    dump, _ = LOADERS[loader]
+    fp = tmpdir.join("data.txt").strpath
+    with open(fp, "w") as f:
+        f.write(dump(DATA))
+    assert DATA == getattr(PathExAttMap, loader)(fp).to_dict()
+
+
+@pytest.mark.parametrize("text", ["[1, 2]", "1"])
+def test_non_mapping_is_rejected(loader, text):
+    """Data that aren't a mapping can't make a map."""
+    with pytest.raises(TypeError):
+        getattr(AttMap, loader)(io.StringIO(text))
+
+
+def test_empty_yaml():
+    """YAML text without a document gives an empty map."""
+    m = OrdAttMap.from_yaml(io.StringIO(""))
+    assert type(m) is OrdAttMap
+    assert 0 == len(m)
+
+
+@pytest.mark.parametrize("maptype", ALL_ATTMAPS + [CompactAttMap])
+def test_yaml_aliases_give_independent_maps(maptype):
+    """Each alias of an anchored mapping is a map of its own."""
+    text = "a: &x {b: 1, c: {d: 2}}\ne: *x\nf:\n  <<: *x\n  g: 3\n"
+    m = maptype.from_yaml(io.StringIO(text))
+    assert maptype(yaml.safe_load(text)) == m
+    assert m.a is not m.e and m.a.c is not m.e.c
+    m.a.b = 9
+    m.a.c.d = 9
+    assert {"b": 1, "c": {"d": 2}} == m.e.to_dict()
+    assert {"b": 1, "c": {"d": 2}, "g": 3} == m.f.to_dict()
+
+
+def test_json_duplicate_keys():
+    """As with a dict, the last of duplicate keys wins."""
+    m = AttMap.from_json(io.StringIO('{"a": {"x": 1}, "a": {"y": 2}}'))
+    assert {"a": {"y": 2}} == m.to_dict()
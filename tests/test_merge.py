@@ -0,0 +1,117 @@
+""" Tests for deep merging of entries into a map """
+
+import pytest
+
+from attmap import *
+from tests.conftest import ALL_ATTMAPS
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+BASE = {"a": 1, "b": {"c": [1], "d": {"e": "x", "f": 0}}, "g": [0]}
+UPDATE = {"a": 2, "b": {"c": [2], "d": {"e": "y", "h": 1}}, "g": {"i": 3}}
+
+
+@pytest.fixture(scope="function", params=ALL_ATTMAPS)
+def m(request):
+    """Provide a test case with a populated map."""
+    return request.param(BASE)
+
+
+@pytest.mark.parametrize(
+    ["strategy", "exp"],
+    [
+        (
+            "override",
+            {"a": 2, "b": {"c": [2], "d": {"e": "y", "f": 0, "h": 1}}, "g": {"i": 3}},
+        ),
+        (
+            "keep_existing",
+            {"a": 1, "b": {"c": [1], "d": {"e": "x", "f": 0, "h": 1}}, "g": [0]},
+        ),
+        (
+            "list_append",
+            {
+                "a": 2,
+                "b": {"c": [1, 2], "d": {"e": "y", "f": 0, "h": 1}},
+                "g": {"i": 3},
+            },
+        ),
+    ],
+)
+def test_strategy(m, strategy, exp):
+    """Nested maps merge; the strategy resolves other pairs of values."""
+    assert m.add_entries(UPDATE, strategy=strategy) is m
+    assert exp == m.to_dict()
+
+
+def test_default_strategy_is_override(m):
+    """Without a strategy, incoming values replace existing ones."""
+    m.add_entries(UPDATE)
+    assert 2 == m.a
+    assert "y" == m.b.d.e
+
+
+def test_nested_maps_are_merged_in_place(m):
+    """An existing nested map is updated, not replaced."""
+    nested = m.b.d
+    m.add_entries(UPDATE)
+    assert m.b.d is nested
+    assert 1 == nested.h
+
+
+def test_list_append_leaves_existing_list_alone(m):
+    """Appending makes a new list rather than extending the stored one."""
+    c = m.b.c
+    m.add_entries(UPDATE, strategy="list_append")
+    assert [1] == c
+    assert [1, 2] == m.b.c
+
+
+def test_new_nested_map_is_converted(m):
+    """A map for a new key is stored as the map's nested type."""
+    m.add_entries({"new": {"x": {"y": 1}}})
+    assert isinstance(m.new.x, AttMapLike)
+    assert 1 == m.new.x.y
+
+
+def test_unknown_strategy(m):
+    """An unknown strategy is rejected."""
+    with pytest.raises(ValueError):
+        m.add_entries(UPDATE, strategy="replace")
+
+
+def test_deep_merge():
+    """Merging isn't limited by the recursion limit."""
+    depth = 5000
+    m = AttMap()
+    curr = m
+    for _ in range(depth):
+        curr["n"] = AttMap()
+        curr = curr["n"]
+    nested = leaf = {}
+    for _ in range(depth):
+        leaf["n"] = {}
+        leaf = leaf["n"]
+    leaf["x"] = 1
+    m.add_entries(nested)
+    for _ in range(depth):
+        m = m["n"]
+    assert 1 == m.x
+
+
+@pytest.mark.parametrize("maptype", [PathExAttMap, EagerPathExAttMap])
+def test_merge_doesnt_expand_stored_values(maptype):
+    """Existing text is kept as stored, not replaced by its expansion."""
+    m = maptype({"a": "$HOME", "b": {"c": "$HOME"}})
+    m.add_entries({"a": 1, "b": {"d": 2}}, strategy="keep_existing")
+    assert {"a": "$HOME", "b": {"c": "$HOME", "d": 2}} == m.to_dict()
+
+
+@pytest.mark.parametrize("maptype", ALL_ATTMAPS)
+def test_repeated_keys_in_new_map_are_merged(maptype):
+    """Pairs with a repeated key are merged in turn, even into an empty map."""
+    m = maptype().add_entries([("a", {"b": 1}), ("c", 0), ("a", {"d": 2})])
+    assert ["a", "c"] == list(m.keys())
+    assert {"b": 1, "d": 2} == m.a.to_dict()
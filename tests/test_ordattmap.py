@@ -2,6 +2,11 @@
 
 import sys
 from collections import OrderedDict
+
+if sys.version_info < (3, 3):
+    from collections import ItemsView, KeysView, ValuesView
+else:
+    from collections.abc import ItemsView, KeysView, ValuesView
 from itertools import combinations
 
 import pytest
@@ -88,6 +93,12 @@ def test_ordattmap_size(kvs):
     assert exp == len(OrdAttMap(kvs))
 
 
+@given(kvs=kv_lists_strategy())
+def test_ordattmap_reversed(kvs):
+    """Verify reverse iteration order."""
+    assert [k for k, _ in reversed(kvs)] == list(reversed(OrdAttMap(kvs)))
+
+
 @given(kvs=kv_lists_strategy())
 def test_ordattmap_contains(kvs):
     """Verify key containment check."""
@@ -256,3 +267,50 @@ class BasicDataTests:
         ls = obstext.split("\n")
         assert oam.__class__.__name__ == ls[0]
         assert expected == ls[lineno].rstrip("\n")
+
+
+@pytest.mark.parametrize("maptype", [OrdAttMap, PathExAttMap, AttMapEcho])
+@pytest.mark.parametrize(
+    ["get_view", "viewtype"],
+    [
+        (lambda m: m.keys(), KeysView),
+        (lambda m: m.values(), ValuesView),
+        (lambda m: m.items(), ItemsView),
+    ],
+)
+def test_ordattmap_views_are_live(maptype, get_view, viewtype):
+    """Keys, values, and items are views that reflect later changes."""
+    m = maptype([("a", 1), ("b", 2)])
+    view = get_view(m)
+    assert isinstance(view, viewtype)
+    assert 2 == len(view)
+    m["c"] = 3
+    assert 3 == len(view)
+    del m["a"]
+    assert list(view) == list(get_view(maptype([("b", 2), ("c", 3)])))
+
+
+@pytest.mark.parametrize("maptype", [OrdAttMap, PathExAttMap, AttMapEcho])
+def test_ordattmap_view_membership_and_set_ops(maptype):
+    """Key and item views support membership tests and set operations."""
+    m = maptype([("a", 1), ("b", 2)])
+    assert "a" in m.keys()
+    assert "z" not in m.keys()
+    assert ("b", 2) in m.items()
+    assert ("b", 3) not in m.items()
+    assert 2 in m.values()
+    assert m.keys() & {"b", "c"} == {"b"}
+    assert m.keys() | ["c"] == {"a", "b", "c"}
+    assert m.keys() - maptype([("a", 0)]).keys() == {"b"}
+    assert list(reversed(m.items())) == [("b", 2), ("a", 1)]
+
+
+@pytest.mark.parametrize("maptype", [OrdAttMap, PathExAttMap, AttMapEcho])
+def test_ordattmap_clear_is_unsupported(maptype):
+    """Clearance raises, and leaves the map and its fingerprint unchanged."""
+    m = maptype([("a", 1), ("b", {"c": 2})])
+    fp = m.fingerprint()
+    with pytest.raises(NotImplementedError):
+        m.clear()
+    assert m == maptype([("a", 1), ("b", {"c": 2})])
+    assert fp == m.fingerprint()
@@ -42,6 +42,7 @@ ECHO_TEST_FUNS = [isclass, get_base_check(PathExAttMap)]
             [("AttMapEcho", f) for f in ECHO_TEST_FUNS],
             [("EchoAttMap", f) for f in ECHO_TEST_FUNS],
             [("get_data_lines", isfunction)],
+            [("iter_data_lines", isfunction)],
         ]
     ),
 )
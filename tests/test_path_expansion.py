@@ -6,6 +6,7 @@ import os
 import random
 import string
 
+import mock
 import pytest
 from ubiquerg import TmpEnv, expandpath
 
@@ -197,3 +198,181 @@ def test_multiple_syntax_path_expansion(
         assert env_var_val == os.getenv(varname)
         assert path != expandpath(path)
         assert expandpath(path) == fetch(m, key)
+
+
+@pytest.mark.parametrize(
+    "get_view", [lambda m: m.items(True), lambda m: m.values(True)]
+)
+def test_view_expansion_is_lazy(get_view):
+    """Expanding views expand each value only once it's consumed."""
+    m = PathExAttMap([("a", "$HOME/a"), ("b", "$HOME/b"), ("c", "$HOME/c")])
+    expansion_cache.cache_clear()
+    with mock.patch("attmap.pathex_attmap.expandpath", side_effect=expandpath) as ex:
+        view = get_view(m)
+        assert 0 == ex.call_count
+        next(iter(view))
+        assert 1 == ex.call_count
+        assert 3 == len(list(view))
+        assert 3 == ex.call_count
+
+
+def test_view_expansion_respects_flag():
+    """Expanded and raw views of the same map differ only for path values."""
+    with TmpEnv(ATTMAP_TEST_DIR="expanded"):
+        m = PathExAttMap({"p": "$ATTMAP_TEST_DIR", "n": 1})
+        assert [("p", "$ATTMAP_TEST_DIR"), ("n", 1)] == list(m.items())
+        assert [("p", "expanded"), ("n", 1)] == list(m.items(expand=True))
+        assert ("p", "expanded") in m.items(expand=True)
+        assert ["expanded", 1] == list(m.values(expand=True))
+
+
+@pytest.fixture(scope="function")
+def cache():
+    """Provide a test case with a fresh expansion cache."""
+    return ExpansionCache(maxsize=3)
+
+
+def test_expansion_cache_hits_and_misses(cache):
+    """Repeat expansion of the same text is served from the cache."""
+    with TmpEnv(ATTMAP_TEST_VAR="abc"):
+        for _ in range(3):
+            assert "abc/x" == cache.expand("$ATTMAP_TEST_VAR/x")
+    assert (2, 1, 3, 1) == tuple(cache.cache_info())
+    cache.cache_clear()
+    assert (0, 0, 3, 0) == tuple(cache.cache_info())
+
+
+def test_expansion_cache_skips_plain_text(cache):
+    """Text that can't expand is returned as-is, without caching."""
+    with mock.patch("attmap.pathex_attmap.expandpath") as ex:
+        assert "a/b~/c" == cache.expand("a/b~/c")
+        assert 0 == ex.call_count
+    assert (0, 0, 3, 0) == tuple(cache.cache_info())
+
+
+@pytest.mark.parametrize("var", ["ATTMAP_TEST_VAR", "{ATTMAP_TEST_VAR}"])
+def test_expansion_cache_follows_environment(cache, var):
+    """A change to a variable in the text invalidates its cached expansion."""
+    text = os.path.join("$" + var, "x")
+    with TmpEnv(ATTMAP_TEST_VAR="abc"):
+        assert os.path.join("abc", "x") == cache.expand(text)
+    with TmpEnv(ATTMAP_TEST_VAR="def"):
+        assert os.path.join("def", "x") == cache.expand(text)
+        assert os.path.join("def", "x") == cache.expand(text)
+    assert text == cache.expand(text)
+    assert (1, 3) == cache.cache_info()[:2]
+
+
+def test_expansion_cache_reads_names_as_expandvars_does(cache):
+    """A name ends at the first non-ASCII character, as in expansion."""
+    text = "$ATTMAP_TEST_VAR\u00e9/x"
+    with TmpEnv(ATTMAP_TEST_VAR="one"):
+        assert "one\u00e9/x" == cache.expand(text)
+    with TmpEnv(ATTMAP_TEST_VAR="two"):
+        assert "two\u00e9/x" == cache.expand(text)
+
+
+def test_expansion_cache_follows_home(cache, tmpdir):
+    """A change of home directory invalidates cached expansion of ~."""
+    assert expandpath("~/x") == cache.expand("~/x")
+    with mock.patch.dict(os.environ, {"HOME": tmpdir.strpath}):
+        assert os.path.join(tmpdir.strpath, "x") == cache.expand("~/x")
+
+
+def test_expansion_cache_is_bounded(cache):
+    """The least recently used expansion is evicted beyond the size bound."""
+    with TmpEnv(ATTMAP_TEST_VAR="abc"):
+        for text in ["$ATTMAP_TEST_VAR/" + c for c in "abca"]:
+            cache.expand(text)
+        assert 3 == cache.cache_info().currsize
+        cache.expand("$ATTMAP_TEST_VAR/d")
+        assert 3 == cache.cache_info().currsize
+        cache.expand("$ATTMAP_TEST_VAR/b")
+    assert (1, 5) == cache.cache_info()[:2]
+
+
+def test_expansion_cache_can_be_disabled():
+    """With no room, nothing's cached."""
+    cache = ExpansionCache(maxsize=0)
+    assert expandpath("$HOME") == cache.expand("$HOME")
+    assert expandpath("$HOME") == cache.expand("$HOME")
+    assert (0, 2, 0, 0) == tuple(cache.cache_info())
+
+
+def test_PathExAttMap_uses_expansion_cache():
+    """Repeat access to a path value is served from the shared cache."""
+    m = PathExAttMap({"p": "$HOME/attmap_cache_test"})
+    expansion_cache.cache_clear()
+    for _ in range(3):
+        assert expandpath("$HOME/attmap_cache_test") == m.p
+    assert (2, 1) == expansion_cache.cache_info()[:2]
+
+
+def test_eager_expansion_happens_once_at_storage():
+    """An eager map expands text when stored, not when fetched."""
+    with mock.patch("attmap.pathex_attmap.expansion_cache") as cache:
+        cache.expand.side_effect = lambda x: x.upper()
+        m = EagerPathExAttMap({"a": "$abc", "b": 1, "c": {"d": "$def"}})
+        assert 2 == cache.expand.call_count
+        for _ in range(3):
+            assert "$ABC" == m.a == m["a"] == m.get("a")
+            assert "$DEF" == m.c.d
+            assert 1 == m.b
+        assert 2 == cache.expand.call_count
+
+
+def test_eager_expansion_keeps_raw_values(tmpdir):
+    """Raw text is still available from an eager map."""
+    data = {"a": os.path.join("$ATTMAP_TEST_DIR", "x"), "b": {"c": "$ATTMAP_TEST_DIR"}}
+    with TmpEnv(ATTMAP_TEST_DIR=tmpdir.strpath):
+        m = EagerPathExAttMap(data)
+    exp = os.path.join(tmpdir.strpath, "x")
+    assert exp == m.a
+    assert exp == m.__getitem__("a", expand=True)
+    assert data["a"] == m.__getitem__("a", expand=False)
+    assert data == m.to_dict()
+    assert data == m.to_dict(expand=False)
+    assert {"a": exp, "b": {"c": tmpdir.strpath}} == m.to_dict(expand=True)
+    assert "a: " + data["a"] + "\n" == EagerPathExAttMap({"a": data["a"]}).to_yaml()
+
+
+@pytest.mark.parametrize(
+    "remove",
+    [
+        lambda m: m.__delitem__("a"),
+        lambda m: m.pop("a"),
+        lambda m: m.__setitem__("a", 1),
+    ],
+)
+def test_eager_expansion_follows_removal_and_replacement(remove):
+    """A removed or replaced value's expansion is discarded."""
+    m = EagerPathExAttMap({"a": "$HOME"})
+    remove(m)
+    assert "a" not in m or 1 == m.a
+    m["a"] = "plain"
+    assert "plain" == m.a
+
+
+@pytest.mark.parametrize("dup", [copy.deepcopy, lambda m: m.copy()])
+def test_eager_expansion_is_copied(dup):
+    """Copies of an eager map serve the same expanded values."""
+    m = EagerPathExAttMap({"a": "$HOME", "b": {"c": "$HOME"}})
+    c = dup(m)
+    assert type(c) is EagerPathExAttMap
+    assert m.a == c.a == expandpath("$HOME")
+    assert m.b.c == c.b.c
+    assert c.to_dict() == m.to_dict()
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_eager_state_isnt_a_key(lazy):
+    """A map's own state can't be fetched or removed as a key."""
+    m = EagerPathExAttMap({"a": "$HOME"}, lazy=lazy)
+    for name in ["_expansions", "_lazy"]:
+        with pytest.raises(KeyError):
+            m[name]
+        with pytest.raises(KeyError):
+            m.pop(name)
+        assert m.pop(name, None) is None
+    m["b"] = "$HOME"
+    assert m.a == m.b == expandpath("$HOME")
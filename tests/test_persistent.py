@@ -0,0 +1,159 @@
+""" Tests for the persistent, structurally shared map """
+
+import pickle
+import random
+
+import pytest
+
+from attmap import *
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+DATA = {"a": {"b": 1, "c": [1, 2]}, "d": {"e": {"f": "text"}}, "g": None}
+
+
+@pytest.fixture(scope="function")
+def m():
+    """Provide a test case with a populated persistent map."""
+    return PersistentAttMap(DATA)
+
+
+def test_read_api(m):
+    """A persistent map reads like any other attmap."""
+    assert DATA == m.to_dict()
+    assert type(m.d.e) is PersistentAttMap
+    assert "text" == m.d.e.f == m["d"]["e"]["f"]
+    assert PathExAttMap(DATA).to_yaml() == m.to_yaml()
+
+
+@pytest.mark.parametrize("path", ["a.b", ["a", "b"], ("a", "b")])
+def test_set_gives_new_version(m, path):
+    """Setting a value gives a new map, leaving the original alone."""
+    new = m.set(path, 2)
+    assert 1 == m.a.b
+    assert 2 == new.a.b
+    assert DATA == m.to_dict()
+
+
+def test_set_shares_untouched_structure(m):
+    """Only maps on the path to the set value are new."""
+    new = m.set("a.b", 2)
+    assert new.d is m.d
+    assert new.a.c is m.a.c
+    assert new.a is not m.a
+
+
+def test_set_creates_maps_along_path(m):
+    """Maps are created for missing keys along the path."""
+    new = m.set("x.y.z", {"w": 0})
+    assert 0 == new.x.y.z.w
+    assert type(new.x.y.z) is PersistentAttMap
+    assert "x" not in m
+
+
+def test_set_through_non_map_is_prohibited(m):
+    """A path can't descend through a value that isn't a map."""
+    with pytest.raises(TypeError):
+        m.set("a.b.c", 0)
+
+
+def test_delete(m):
+    """Deletion gives a new version without the value."""
+    new = m.delete("d.e")
+    assert {} == new.d.to_dict()
+    assert "text" == m.d.e.f
+    assert m.delete("d.missing") is m
+    assert m.delete("missing.key") is m
+
+
+def test_order_is_insertion_order():
+    """Keys iterate in insertion order; replacement keeps a key's place."""
+    m = PersistentAttMap([("z", 0), ("a", 1)]).set("m", 2).set("z", 3)
+    assert ["z", "a", "m"] == list(m)
+    assert ["a", "m", "z"] == list(m.delete("z").set("z", 4))
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda m: m.__setitem__("a", 1),
+        lambda m: m.__delitem__("a"),
+        lambda m: setattr(m, "a", 1),
+        lambda m: m.update({"a": 1}),
+    ],
+)
+def test_immutable(m, mutate):
+    """A persistent map can't be changed in place."""
+    with pytest.raises(TypeError):
+        mutate(m)
+
+
+def test_hash_and_equality(m):
+    """Versions with the same data are equal and hash equally."""
+    new = m.set("a.b", 2).set("a.b", 1)
+    assert new == m
+    assert hash(new) == hash(m)
+    assert m.set("a.b", 2) != m
+
+
+def test_pickle_roundtrip(m):
+    """A persistent map survives pickling."""
+    assert m == pickle.loads(pickle.dumps(m))
+
+
+def test_matches_dict_through_random_updates():
+    """Random sets and deletions give the same data as a dict."""
+    rng = random.Random(0)
+    m, d = PersistentAttMap(), {}
+    for i in range(5000):
+        k = rng.randrange(500)
+        if rng.random() < 0.3:
+            d.pop(k, None)
+            m = m.delete([k])
+        else:
+            d[k] = i
+            m = m.set([k], i)
+    assert len(d) == len(m)
+    assert list(d.items()) == list(m.items())
+
+
+class _Colliding(object):
+    """Key type whose instances all have the same hash"""
+
+    def __init__(self, v):
+        self.v = v
+
+    def __eq__(self, other):
+        return isinstance(other, _Colliding) and self.v == other.v
+
+    def __hash__(self):
+        return 0
+
+
+def test_colliding_keys():
+    """Keys with the same hash are kept distinct."""
+    keys = [_Colliding(i) for i in range(4)]
+    m = PersistentAttMap([(k, k.v) for k in keys])
+    assert [0, 1, 2, 3] == [m[k] for k in keys]
+    m = m.delete([keys[1]]).delete([keys[2]])
+    assert [keys[0], keys[3]] == list(m)
+    assert 3 == m[keys[3]]
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [lambda v: v.append(3), lambda v: v.__setitem__(0, 3), lambda v: v.clear()],
+)
+def test_stored_values_are_frozen(m, mutate):
+    """A stored list can't change in place, so versions and hashes hold."""
+    h, v2 = hash(m), m.set("g", [0])
+    with pytest.raises(TypeError):
+        mutate(m.a.c)
+    with pytest.raises(TypeError):
+        mutate(v2.g)
+    assert [1, 2] == m.a.c == v2.a.c
+    assert h == hash(m) == hash(PersistentAttMap(DATA))
+    assert {"x": 1} == m.set("h", {"x": 1}).h.to_dict()
+    assert isinstance(PersistentAttMap({"s": {1}}).s, frozenset)
@@ -0,0 +1,157 @@
+""" Tests for columnar storage of records """
+
+import os
+
+import pandas as pd
+import pytest
+import yaml
+
+from attmap import *
+
+__author__ = "Vince Reuter"
+__email__ = "vreuter@virginia.edu"
+
+
+RECORDS = [
+    {"sample_name": "a", "path": "$HOME/a", "n": 1},
+    {"sample_name": "b", "path": "$HOME/b", "n": 2},
+    {"sample_name": "c", "path": "$HOME/a", "n": 3},
+]
+
+
+@pytest.fixture(scope="function")
+def table():
+    """Provide a test case with a small table of records."""
+    return AttMapTable(RECORDS)
+
+
+def test_rows_match_records(table):
+    """Each row has the data and key order of its record."""
+    assert 3 == len(table)
+    for rec, row in zip(RECORDS, table):
+        assert isinstance(row, AttMapLike)
+        assert list(rec) == list(row.keys())
+        assert rec == row.to_dict()
+        assert rec["sample_name"] == row.sample_name
+
+
+def test_row_expands_like_pathex(table):
+    """A row fetches values as a PathExAttMap with the same data would."""
+    row, m = table[0], PathExAttMap(RECORDS[0])
+    assert m.path == row.path == os.path.expandvars("$HOME/a")
+    assert m["n"] == row["n"]
+    assert m.to_dict() == row.to_dict()
+    assert m.to_dict(expand=True) == row.to_dict(expand=True)
+    assert m.to_yaml() == row.to_yaml()
+    assert m.to_map() == row.to_map()
+
+
+def test_missing_keys_are_null():
+    """A key absent from a record is null for that record."""
+    t = AttMapTable([{"a": 1}, {"b": 2}])
+    assert ["a", "b"] == t.keys()
+    assert [{"a": 1, "b": None}, {"a": None, "b": 2}] == t.to_dicts()
+
+
+def test_mapping_values_are_maps():
+    """As when a map stores it, a nested mapping is stored as a map."""
+    row = AttMapTable([{"a": {"b": "$HOME"}}])[0]
+    assert type(row.a) is PathExAttMap
+    assert {"a": {"b": os.path.expandvars("$HOME")}} == row.to_dict(expand=True)
+
+
+def test_setting_writes_through(table):
+    """Setting a row's value updates the table, adding a column if needed."""
+    table[1].n = 10
+    table[2]["new"] = "x"
+    assert [1, 10, 3] == table.column("n")
+    assert [None, None, "x"] == table.column("new")
+    assert "new" in table[0]
+
+
+def test_row_key_removal_is_prohibited(table):
+    """A key can't be removed from a single row."""
+    with pytest.raises(TypeError):
+        del table[0]["n"]
+
+
+@pytest.mark.parametrize("i", [3, -4])
+def test_index_out_of_range(table, i):
+    """A position outside the table has no row."""
+    with pytest.raises(IndexError):
+        table[i]
+
+
+def test_negative_index(table):
+    """A negative position counts from the end."""
+    assert "c" == table[-1].sample_name
+
+
+def test_filter_by_columns(table):
+    """Filtering by named columns passes their values to the predicate."""
+    t = table.filter(lambda p, n: p == "$HOME/a" and n > 1, "path", "n")
+    assert [RECORDS[2]] == t.to_dicts()
+
+
+def test_filter_by_rows(table):
+    """Without named columns, the predicate gets each row."""
+    t = table.filter(lambda r: r.n < 3)
+    assert RECORDS[:2] == t.to_dicts()
+
+
+def test_project(table):
+    """Projection keeps only the given columns, in the given order."""
+    t = table.project("n", "sample_name")
+    assert ["n", "sample_name"] == t.keys()
+    assert [1, 2, 3] == t.column("n")
+    table[0].n = 5
+    assert 1 == t[0].n
+
+
+def test_expand(table):
+    """Column-wide expansion stores the expanded text."""
+    exp = table.expand("path")
+    assert [os.path.expandvars(p) for p in table.column("path")] == exp.column("path")
+    assert table.column("path", expand=True) == exp.column("path")
+    assert "$HOME/a" == table[0].to_dict()["path"]
+
+
+def test_from_columns_requires_equal_lengths():
+    """Columns of different lengths can't make a table."""
+    with pytest.raises(ValueError):
+        AttMapTable.from_columns({"a": [1, 2], "b": [1]})
+
+
+def test_from_dataframe():
+    """A data frame's columns become the table's columns."""
+    df = pd.DataFrame(RECORDS, index=["x", "y", "z"])
+    t = AttMapTable.from_dataframe(df)
+    assert RECORDS == t.to_dicts()
+    assert type(t[0].n) is int
+
+
+def test_to_yaml_round_trip(table):
+    """A row's YAML text parses back to its data."""
+    assert RECORDS[1] == yaml.safe_load(table[1].to_yaml())
+
+
+def test_rows_compare_stored_values():
+    """As for PathExAttMaps, rows compare and diff text as stored."""
+    home = os.path.expandvars("$HOME")
+    raw, expanded = AttMapTable([{"p": "$HOME"}, {"p": home}])
+    assert (PathExAttMap({"p": "$HOME"}) == PathExAttMap({"p": home})) is False
+    assert raw != expanded
+    assert raw == AttMapTable([{"p": "$HOME"}])[0]
+    assert not any(diff(raw, PathExAttMap({"p": "$HOME"})))
+    assert {("p",): (home, "$HOME")} == diff(
+        expanded, PathExAttMap({"p": "$HOME"})
+    ).changed
+
+
+def test_any_mapping_value_is_a_map():
+    """A mapping of any type is stored as a map, as a map would store it."""
+    row = AttMapTable([{"a": OrdAttMap({"b": 1})}])[0]
+    assert type(row.a) is PathExAttMap
+    row.c = AttMap({"d": 2})
+    assert type(row.c) is PathExAttMap
+    assert {"a": {"b": 1}, "c": {"d": 2}} == row.to_dict()
@@ -3,7 +3,10 @@
 import numpy as np
 import pytest
 from pandas import Series
+from ubiquerg import expandpath
 
+from attmap import EagerPathExAttMap, EchoAttMap, PathExAttMap
+from tests.conftest import ALL_ATTMAPS
 from tests.helpers import get_att_map
 
 __author__ = "Vince Reuter"
@@ -29,3 +32,55 @@ def test_to_dict_type(attmap_type, entries):
     assert type(d) is dict
     assert d == entries
     assert entries == d
+
+
+@pytest.mark.parametrize("maptype", ALL_ATTMAPS)
+@pytest.mark.parametrize("size", [5000])
+def test_to_dict_wide(maptype, size):
+    """Conversion of a map with many keys doesn't hit the recursion limit."""
+    entries = {"k{}".format(i): i for i in range(size)}
+    m = get_att_map(maptype, entries)
+    assert m.to_dict() == entries
+    assert dict(m.to_map()) == entries
+
+
+@pytest.mark.parametrize("maptype", ALL_ATTMAPS)
+@pytest.mark.parametrize("depth", [3000])
+def test_to_dict_deep(maptype, depth):
+    """Conversion of a deeply nested map doesn't hit the recursion limit."""
+    m = maptype({"leaf": 0})
+    for _ in range(depth):
+        parent = maptype()
+        parent["sub"] = m
+        m = parent
+    for res, exp_type in [(m.to_dict(), dict), (m.to_map(), m._new_empty_basic_map)]:
+        levels = 0
+        while "sub" in res:
+            assert type(res) is type(exp_type())
+            res = res["sub"]
+            levels += 1
+        assert levels == depth
+        assert res == {"leaf": 0}
+
+
+@pytest.mark.parametrize("maptype", [PathExAttMap, EagerPathExAttMap, EchoAttMap])
+@pytest.mark.parametrize("lazy", [False, True])
+@pytest.mark.parametrize("depth", [3000])
+def test_expanded_to_dict_deep(maptype, lazy, depth):
+    """Expanded conversion of a deeply nested map expands text at each level."""
+    exp = expandpath("$HOME")
+    m = maptype({"leaf": "$HOME"})
+    for _ in range(depth):
+        parent = maptype(lazy=lazy)
+        parent["sub"] = m
+        parent["p"] = "$HOME"
+        m = parent
+    res = m.to_dict(expand=True)
+    levels = 0
+    while "sub" in res:
+        assert type(res) is dict
+        assert exp == res["p"]
+        res = res["sub"]
+        levels += 1
+    assert levels == depth
+    assert {"leaf": exp} == res
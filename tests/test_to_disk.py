@@ -71,7 +71,15 @@ def test_yaml(maptype, get_obs, parse_obs):
     """Tests for attmap repr as YAML lines or full text chunk."""
     eq = lambda a, b: a == b
     seteq = lambda a, b: len(a) == len(b) and set(a) == set(b)
-    checks = {OrdAttMap: eq, PathExAttMap: eq, AttMapEcho: eq, AttMap: seteq}
+    checks = {
+        OrdAttMap: eq,
+        PathExAttMap: eq,
+        EagerPathExAttMap: eq,
+        AttMapEcho: eq,
+        CompactAttMap: eq,
+        ConcurrentAttMap: eq,
+        AttMap: seteq,
+    }
     m = make_data(ENTRIES, maptype)
     check_lines(m, EXPLINES, get_obs, parse_obs, check=checks[maptype])
 
@@ -179,3 +187,45 @@ def make_data(entries, datatype):
     res = go(entries, datatype())
     assert len(res) > 0, "Empty result"
     return res
+
+
+class _Omitted(object):
+    """Dummy value type to omit from a map's conversion to dict"""
+
+    pass
+
+
+YAML_DATA = [
+    {"a": 1},
+    {"a": None, "b": "'quoted'", "c": [1, 2], "d": [], "e": "x\ny"},
+    {"a": {}, "b": {"c": {}, "d": {"e": {}}}, "f": {"g": None}},
+    {"a": {"b": {"c": [1, {"d": 2}]}, "e": 3}, 1: {2: 3}},
+    {"omit": _Omitted(), "a": {"omit": _Omitted()}, "b": {"c": _Omitted(), "d": 1}},
+]
+
+
+@pytest.mark.parametrize("data", YAML_DATA)
+@pytest.mark.parametrize("trailing_newline", [False, True])
+def test_yaml_streaming_matches_lines(maptype, data, trailing_newline, tmpdir):
+    """Streamed and chunked YAML is the same as the text built from lines."""
+    exclude = lambda self: _Omitted
+    m = type(
+        "Sub" + maptype.__name__, (maptype,), {"_excl_classes_from_todict": exclude}
+    )
+    m = m(data)
+    exp = "\n".join(m.get_yaml_lines()) + ("\n" if trailing_newline else "")
+    assert exp == m.to_yaml(trailing_newline)
+    assert exp == "".join(m.iter_yaml(trailing_newline))
+    fp = tmpdir.join("streamed.yaml").strpath
+    with open(fp, "w") as f:
+        assert m.to_yaml(trailing_newline, stream=f) is None
+    with open(fp, "r") as f:
+        assert exp == f.read()
+
+
+def test_yaml_streaming_is_incremental(maptype):
+    """Chunks are produced one entry at a time."""
+    m = maptype({"k{}".format(i): i for i in range(100)})
+    chunks = m.iter_yaml()
+    assert "k0: 0" == next(chunks)
+    assert 99 == len([c for c in chunks if c.strip()])
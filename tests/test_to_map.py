@@ -12,7 +12,7 @@ else:
 
 import pytest
 
-from attmap import AttMap
+from attmap import AttMapLike
 from tests.helpers import get_att_map
 
 __author__ = "Vince Reuter"
@@ -51,7 +51,7 @@ def am(attmap_type, entries):
 def test_type_conversion_completeness(am, attmap_type, exp_num_raw):
     """Each nested mapping should be converted."""
     assert type(am) is attmap_type
-    num_subtypes = _tally_types(am, AttMap)
+    num_subtypes = _tally_types(am, AttMapLike)
     assert exp_num_raw == num_subtypes
     res = am.to_map()
     print("Object under test: {}".format(res))